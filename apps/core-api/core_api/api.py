@@ -1,62 +1,125 @@
 """API endpoints for Terminal-V Core API"""
+import asyncio
+import dataclasses
+import json
 import os
+import uuid
 import aiohttp
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional, List
+import numpy as np
+import redis.asyncio as redis
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from typing import Awaitable, Callable, Dict, Hashable, Literal, Optional, List
 from datetime import datetime
 
+from nexus_engine.alerts import alerts_registry_key
+from nexus_engine.correlation import correlation_key, decode_matrix
+from nexus_engine.portfolio import PORTFOLIO_HEADER, PORTFOLIO_RECORD, decode_portfolio, portfolio_keys, positions_registry_key, record_offset
+from nexus_engine.registry import RedisRegistry
+from nexus_engine.services.multi_chain import MultiChainScanner, resolve_chains
+from nexus_engine.transport import HttpTransport
+from nexus_engine.services.market_provider import YFinanceProvider
+from nexus_engine.services.market_stream import MarketStreamService
+from core_api.cache import CachePolicy, ResponseCache
+from core_api.middleware import StaticCORSMiddleware
+from core_api.responses import PreparedBody
+from core_api.snapshots import VersionedSnapshots
+from core_api.streaming import StreamHub, parse_filter
+
 app = FastAPI(
     title="Terminal-V Core API",
     description="Core API service for Terminal-V financial platform",
     version="0.1.0"
 )
 
-# Enable CORS with explicit headers for all origins
-# This allows the frontend (terminal.valkyrris.com) to access the API
+# Enable CORS for all origins (the frontend, terminal.valkyrris.com, sends no
+# credentials). Headers are precomputed and preflights answered in the middleware.
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins (can be restricted to specific domains in production)
-    allow_credentials=True,
+    StaticCORSMiddleware,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "HEAD"],
-    allow_headers=["*"],
-    expose_headers=["*"],
+    allow_headers="*",
+    expose_headers="*",
     max_age=3600,
 )
 
-# Session for HTTP requests
-_session: Optional[aiohttp.ClientSession] = None
+# One pooled HTTP connector for every upstream call in this worker
+http_transport = HttpTransport()
+
+# Per-endpoint cache policies (seconds). Upstream data changes far slower than
+# clients poll, so identical requests within the TTL share one upstream fetch.
+CACHE_POLICIES = {
+    "aggregated": CachePolicy(ttl=0.5, stale_ttl=5.0),
+    "market": CachePolicy(ttl=2.0, stale_ttl=30.0),
+    "news": CachePolicy(ttl=60.0, stale_ttl=600.0),
+    "blockchain": CachePolicy(ttl=6.0, stale_ttl=60.0),
+}
+
+response_cache = ResponseCache(policies=CACHE_POLICIES)
+
+# Content versions of /api/aggregated for ETags, ?since= patches and ?fields= views
+aggregated_versions = VersionedSnapshots(history=32)
+
+# yfinance runs in a bounded thread pool so it never blocks the event loop
+market_provider = YFinanceProvider(max_workers=4, deadline=8.0)
+
+# CoinGecko/yfinance batching shared with the nexus engine
+market_service = MarketStreamService(market_provider=market_provider, transport=http_transport)
+
+# Batched JSON-RPC against each network's public endpoints (BLOCKCHAIN_RPC_URL
+# overrides the first network's endpoint)
+_chains = resolve_chains(os.getenv("BLOCKCHAIN_NETWORKS", "ethereum").split(","))
+_chains[0] = dataclasses.replace(
+    _chains[0],
+    rpc_url=os.getenv("BLOCKCHAIN_RPC_URL") or _chains[0].rpc_url,
+    rpc_key=os.getenv("BLOCKCHAIN_RPC_KEY") or _chains[0].rpc_key,
+)
+blockchain_service = MultiChainScanner(_chains, transport=http_transport)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REDIS_CHANNEL = os.getenv("REDIS_CHANNEL", "terminal-v:data")
+
+# Symbols the broadcaster prices (same setting and default as the broadcaster);
+# alerts and positions on any other symbol would never be evaluated
+MARKET_SYMBOLS = frozenset(s.strip() for s in os.getenv("MARKET_SYMBOLS", "BTCUSD,SPX,EURUSD").split(","))
+
+# One Redis subscription per worker, shared by all push clients
+stream_hub = StreamHub(
+    redis_url=REDIS_URL,
+    redis_channel=REDIS_CHANNEL,
+    use_stream=os.getenv("REDIS_TRANSPORT", "pubsub") in ("stream", "both"),
+)
+
+# Plain key reads (correlation matrix, portfolios) over one pooled client per worker
+redis_client = redis.from_url(REDIS_URL, decode_responses=False)
+
+# Alert registrations, applied by the broadcaster on its next tick
+alert_registry = RedisRegistry(redis_client, alerts_registry_key(REDIS_CHANNEL))
+# Users' positions, revalued by the broadcaster from its next tick
+positions_registry = RedisRegistry(redis_client, positions_registry_key(REDIS_CHANNEL))
 
 
 async def get_session() -> aiohttp.ClientSession:
-    """Get or create HTTP session"""
-    global _session
-    if _session is None or _session.closed:
-        _session = aiohttp.ClientSession()
-    return _session
+    """Get the shared HTTP session"""
+    return await http_transport.session()
 
 
 @app.on_event("shutdown")
 async def shutdown():
-    """Close HTTP session on shutdown"""
-    global _session
-    if _session and not _session.closed:
-        await _session.close()
-
-
-@app.options("/{full_path:path}")
-async def options_handler(full_path: str):
-    """Handle OPTIONS requests for CORS preflight"""
-    from fastapi import Response
-    return Response(
-        status_code=200,
-        headers={
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS, HEAD",
-            "Access-Control-Allow-Headers": "*",
-            "Access-Control-Max-Age": "3600",
-        }
-    )
+    """Close HTTP session and stream subscription on shutdown"""
+    await stream_hub.stop()
+    await redis_client.close()
+    await market_service.close()
+    await blockchain_service.close()
+    market_provider.shutdown()
+    await http_transport.close()
+
+
+async def _cached(namespace: str, key: Hashable, fetcher: Callable[[], Awaitable[dict]]) -> PreparedBody:
+    """Return a cached payload, rendered to JSON bytes once when it is fetched"""
+    async def fetch_prepared() -> PreparedBody:
+        return PreparedBody(await fetcher())
+    return await response_cache.get_or_fetch(namespace, key, fetch_prepared)
 
 
 @app.get("/health")
@@ -65,85 +128,160 @@ async def health_check():
     return {"status": "healthy", "service": "core-api"}
 
 
-@app.get("/api/market/{symbol}")
-async def get_market_data(symbol: str):
+@app.get("/api/stats")
+async def get_stats():
+    """Internal performance counters"""
+    return {
+        "cache": response_cache.stats(),
+        "versions": aggregated_versions.stats(),
+        "stream": stream_hub.stats(),
+        "market_provider": market_provider.stats(),
+        "rpc_pool": blockchain_service.stats(),
+        "http": http_transport.stats(),
+    }
+
+
+@app.websocket("/ws/aggregated")
+async def ws_aggregated(websocket: WebSocket, sections: Optional[str] = None, symbols: Optional[str] = None):
     """
-    Get market data for a symbol using CoinGecko and yfinance
+    Push every broadcaster frame to the client as it arrives
     
-    Args:
-        symbol: Trading symbol (e.g., BTCUSD, BTC, SPY, EURUSD)
+    Filters can be given as query parameters (comma-separated) and changed later
+    by sending {"sections": [...], "symbols": [...]} as a JSON text message.
     """
-    session = await get_session()
-    
-    # Try CoinGecko for cryptocurrencies
-    coin_id_map = {
-        'BTCUSD': 'bitcoin',
-        'BTC': 'bitcoin',
-        'ETHUSD': 'ethereum',
-        'ETH': 'ethereum',
-    }
-    
-    coin_id = coin_id_map.get(symbol.upper())
-    if coin_id:
+    await websocket.accept()
+    subscriber = stream_hub.subscribe(parse_filter(sections), parse_filter(symbols))
+
+    async def receive_filters() -> None:
+        while True:
+            message = await websocket.receive_text()
+            try:
+                update = json.loads(message)
+            except ValueError:
+                continue
+            if isinstance(update, dict):
+                subscriber.set_filters(update.get("sections") or (), update.get("symbols") or ())
+
+    receiver = asyncio.create_task(receive_filters())
+    try:
+        while not receiver.done():
+            frame_task = asyncio.create_task(subscriber.next_frame())
+            done, _ = await asyncio.wait({frame_task, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if frame_task not in done:
+                frame_task.cancel()
+                break
+            await websocket.send_text(frame_task.result())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        stream_hub.unsubscribe(subscriber)
+
+
+@app.get("/sse/aggregated")
+async def sse_aggregated(request: Request, sections: Optional[str] = None, symbols: Optional[str] = None):
+    """Push every broadcaster frame to the client as Server-Sent Events"""
+    subscriber = stream_hub.subscribe(parse_filter(sections), parse_filter(symbols))
+
+    async def events():
         try:
-            url = "https://api.coingecko.com/api/v3/simple/price"
-            params = {
-                "ids": coin_id,
-                "vs_currencies": "usd",
-                "include_24hr_change": "true",
-                "include_24hr_vol": "true"
-            }
-            async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=5)) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if coin_id in data:
-                        coin_data = data[coin_id]
-                        return {
-                            "symbol": symbol,
-                            "price": coin_data.get("usd", 0.0),
-                            "volume": coin_data.get("usd_24h_vol", 0.0),
-                            "change_24h": coin_data.get("usd_24h_change", 0.0),
-                            "timestamp": datetime.utcnow().isoformat()
-                        }
-        except Exception as e:
-            print(f"CoinGecko error: {e}")
+            while not await request.is_disconnected():
+                try:
+                    frame = await asyncio.wait_for(subscriber.next_frame(), timeout=15.0)
+                except asyncio.TimeoutError:
+                    # Keep idle proxies from closing the connection
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {frame}\n\n"
+        finally:
+            stream_hub.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Upper bound on symbols per batched quote request
+MAX_BATCH_SYMBOLS = 250
+
+
+@app.get("/api/market")
+async def get_market_batch(request: Request, symbols: str):
+    """
+    Get market data for many symbols with one upstream request per provider
     
-    # Fallback: Try yfinance (requires server-side call)
-    try:
-        import yfinance as yf
-        
-        # Convert symbol format
-        ticker_symbol = symbol.replace('/', '')
-        if 'BTC' in symbol.upper():
-            ticker_symbol = 'BTC-USD'
-        elif 'EUR' in symbol.upper():
-            ticker_symbol = 'EURUSD=X'
-        
-        ticker = yf.Ticker(ticker_symbol)
-        hist = ticker.history(period='1d', interval='1m')
-        
-        if not hist.empty:
-            current_price = float(hist['Close'].iloc[-1])
-            prev_close = float(hist['Close'].iloc[0])
-            change_24h = ((current_price - prev_close) / prev_close) * 100
-            volume = float(hist['Volume'].iloc[-1]) if 'Volume' in hist.columns else 0.0
-            
-            return {
+    Args:
+        symbols: Comma-separated trading symbols (e.g., BTCUSD,ETHUSD,SPY)
+    """
+    requested = list(dict.fromkeys(s.strip().upper() for s in symbols.split(",") if s.strip()))
+    if not requested:
+        raise HTTPException(status_code=400, detail="No symbols given")
+    if len(requested) > MAX_BATCH_SYMBOLS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SYMBOLS} symbols per request")
+    key = tuple(sorted(requested))
+    prepared = await _cached("market", key, lambda: _fetch_market_batch(requested))
+    return prepared.respond(request)
+
+
+async def _fetch_market_batch(symbols: List[str]) -> dict:
+    """Fetch quotes for a symbol set from upstream providers"""
+    quotes = await market_service.fetch_quotes(symbols, include_tradingview=False)
+    timestamp = datetime.utcnow().isoformat()
+    return {
+        "quotes": {
+            symbol: {
                 "symbol": symbol,
-                "price": current_price,
-                "volume": volume,
-                "change_24h": change_24h,
-                "timestamp": datetime.utcnow().isoformat()
+                "price": quote["price"],
+                "volume": quote["volume"],
+                "change_24h": quote["change_24h"],
+                "timestamp": timestamp
             }
-    except Exception as e:
-        print(f"yfinance error: {e}")
+            for symbol, quote in quotes.items()
+        },
+        "missing": [symbol for symbol in symbols if symbol not in quotes],
+        "timestamp": timestamp
+    }
+
+
+@app.get("/api/market/{symbol}")
+async def get_market_data(request: Request, symbol: str):
+    """
+    Get market data for a symbol using CoinGecko and yfinance
+    
+    Args:
+        symbol: Trading symbol (e.g., BTCUSD, BTC, SPY, EURUSD)
+    """
+    prepared = await _cached("market", symbol.upper(), lambda: _fetch_market_data(symbol))
+    return prepared.respond(request)
+
+
+async def _fetch_market_data(symbol: str) -> dict:
+    """Fetch market data for a symbol from upstream providers"""
+    quotes = await market_service.fetch_quotes([symbol], include_tradingview=False)
+    quote = quotes.get(symbol)
+    if quote:
+        return {
+            "symbol": symbol,
+            "price": quote["price"],
+            "volume": quote["volume"],
+            "change_24h": quote["change_24h"],
+            "timestamp": datetime.utcnow().isoformat()
+        }
     
     raise HTTPException(status_code=404, detail=f"Could not fetch data for symbol: {symbol}")
 
 
 @app.get("/api/news/sentiment")
-async def get_news_sentiment():
+async def get_news_sentiment(request: Request):
     """Get news sentiment from Reddit and NewsAPI"""
+    prepared = await _cached("news", None, _fetch_news_sentiment)
+    return prepared.respond(request)
+
+
+async def _fetch_news_sentiment() -> dict:
+    """Fetch headlines from upstream and score their sentiment"""
     session = await get_session()
     headlines = []
     
@@ -159,7 +297,7 @@ async def get_news_sentiment():
                 "pageSize": 10,
                 "apiKey": newsapi_key
             }
-            async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            async with session.get(url, params=params, timeout=http_transport.timeout(url, 10)) as response:
                 if response.status == 200:
                     data = await response.json()
                     if data.get('status') == 'ok' and 'articles' in data:
@@ -174,7 +312,7 @@ async def get_news_sentiment():
             for subreddit in subreddits:
                 url = f"https://www.reddit.com/r/{subreddit}/hot.json"
                 headers = {"User-Agent": "Terminal-V/1.0"}
-                async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=5)) as response:
+                async with session.get(url, headers=headers, timeout=http_transport.timeout(url, 5)) as response:
                     if response.status == 200:
                         data = await response.json()
                         if 'data' in data and 'children' in data['data']:
@@ -228,92 +366,307 @@ async def get_news_sentiment():
     }
 
 
-@app.get("/api/blockchain/ethereum")
-async def get_blockchain_data():
-    """Get Ethereum blockchain data from public RPC endpoints"""
-    session = await get_session()
+@app.get("/api/blockchain/{network}")
+async def get_blockchain_data(request: Request, network: str):
+    """Get blockchain data of one configured network (BLOCKCHAIN_NETWORKS) from its RPC endpoints"""
+    network = network.lower()
+    if blockchain_service.scanner(network) is None:
+        raise HTTPException(status_code=404, detail=f"Network not configured: {network}")
+    prepared = await _cached("blockchain", network, lambda: _fetch_blockchain_data(network))
+    return prepared.respond(request)
+
+
+async def _fetch_blockchain_data(network: Optional[str] = None) -> dict:
+    """Fetch the latest block and gas price of one network in one batched RPC round trip"""
+    data = await blockchain_service.fetch_latest(network=network, use_fallback=False)
+    if data is None:
+        raise HTTPException(status_code=503, detail="All RPC endpoints failed")
+    return data.model_dump(mode="json")
+
+
+@app.get("/api/correlation")
+async def get_correlation(request: Request, format: str = "binary"):
+    """
+    Rolling correlation and volatility matrix of the broadcaster's symbols
+    
+    Args:
+        format: "binary" (default) returns the broadcaster's payload as is:
+            header, symbols, float32 annualized volatility and the float32
+            upper triangle of the correlation matrix (see
+            nexus_engine.correlation.decode_matrix). "json" returns the same
+            data decoded, with the full matrix and null for undefined values.
+    """
+    if format not in ("binary", "json"):
+        raise HTTPException(status_code=400, detail=f"Unknown format: {format}")
+    try:
+        payload = await redis_client.get(correlation_key(REDIS_CHANNEL))
+    except Exception as e:
+        print(f"Correlation Redis error: {e}")
+        raise HTTPException(status_code=503, detail="Redis unavailable")
+    if payload is None:
+        raise HTTPException(status_code=404, detail="No correlation matrix published yet")
+    if format == "binary":
+        return Response(content=payload, media_type="application/octet-stream", headers={"Cache-Control": "no-cache"})
+    try:
+        matrix = decode_matrix(payload)
+    except ValueError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    
+    def as_list(values: np.ndarray) -> list:
+        # NaN (no variation yet) is not valid JSON
+        return np.where(np.isnan(values), None, values.astype(np.float64)).tolist()
+    
+    return {
+        "symbols": matrix["symbols"],
+        "window": matrix["window"],
+        "samples": matrix["samples"],
+        "timestamp": datetime.utcfromtimestamp(matrix["timestamp_ms"] / 1000).isoformat(),
+        "volatility": as_list(matrix["volatility"]),
+        "correlation": as_list(matrix["correlation"]),
+    }
+
+
+@app.get("/api/portfolio/{user_id}")
+async def get_portfolio(user_id: str):
+    """
+    Live P&L of one user's portfolio, as last revalued by the broadcaster
+    
+    Reads only this user's record: the record index from the index hash,
+    then the header and the record itself with GETRANGE.
+    """
+    records_key, index_key = portfolio_keys(REDIS_CHANNEL)
+    try:
+        index = await redis_client.hget(index_key, user_id)
+        if index is None:
+            raise HTTPException(status_code=404, detail=f"No portfolio for user: {user_id}")
+        offset = record_offset(int(index))
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.getrange(records_key, 0, PORTFOLIO_HEADER.size - 1)
+        pipe.getrange(records_key, offset, offset + PORTFOLIO_RECORD.size - 1)
+        header, record = await pipe.execute()
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Portfolio Redis error: {e}")
+        raise HTTPException(status_code=503, detail="Redis unavailable")
+    try:
+        portfolio = decode_portfolio(header, record)
+    except ValueError:
+        # The index can be one write ahead of the records
+        raise HTTPException(status_code=404, detail=f"No portfolio for user: {user_id}")
+    return {
+        "user_id": user_id,
+        "market_value": portfolio["market_value"],
+        "cost_basis": portfolio["cost_basis"],
+        "unrealized_pnl": portfolio["unrealized_pnl"],
+        "pnl_percent": portfolio["pnl_percent"],
+        "timestamp": datetime.utcfromtimestamp(portfolio["timestamp_ms"] / 1000).isoformat(),
+    }
+
+
+def _require_tracked(symbols: List[str]) -> None:
+    """Reject symbols the broadcaster does not price (400)"""
+    untracked = sorted(set(symbols) - MARKET_SYMBOLS)
+    if untracked:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Untracked symbols: {', '.join(untracked)} (tracked: {', '.join(sorted(MARKET_SYMBOLS))})",
+        )
+
+
+class Position(BaseModel):
+    """One holding: signed quantity and average entry price"""
+    quantity: float
+    average_price: float
+
+
+class PositionsRequest(BaseModel):
+    """Every position of one user, by symbol"""
+    positions: Dict[str, Position]
+
+
+@app.put("/api/portfolio/{user_id}/positions")
+async def set_positions(user_id: str, request: PositionsRequest):
+    """
+    Replace a user's positions
+    
+    The positions are stored in Redis and the broadcaster revalues the
+    portfolio from its next tick; its P&L is then served by
+    /api/portfolio/{user_id}. Symbols left out are closed. Symbols outside
+    MARKET_SYMBOLS are rejected (400): they are never priced, so their cost
+    basis would count against the portfolio at a market value of zero.
+    
+    Args:
+        request: symbol -> {quantity, average_price}
+    """
+    positions = {symbol.upper(): [p.quantity, p.average_price] for symbol, p in request.positions.items()}
+    _require_tracked(list(positions))
+    try:
+        await positions_registry.put(user_id, {"positions": positions})
+    except Exception as e:
+        print(f"Positions Redis error: {e}")
+        raise HTTPException(status_code=503, detail="Redis unavailable")
+    return {"user_id": user_id, "positions": {s: {"quantity": q, "average_price": a} for s, (q, a) in positions.items()}}
+
+
+@app.get("/api/portfolio/{user_id}/positions")
+async def get_positions(user_id: str):
+    """Positions last set for a user"""
+    try:
+        record = await positions_registry.get(user_id)
+    except Exception as e:
+        print(f"Positions Redis error: {e}")
+        raise HTTPException(status_code=503, detail="Redis unavailable")
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"No positions for user: {user_id}")
+    return {"user_id": user_id, "positions": {s: {"quantity": q, "average_price": a} for s, (q, a) in record["positions"].items()}}
+
+
+@app.delete("/api/portfolio/{user_id}/positions", status_code=204)
+async def delete_positions(user_id: str):
+    """Close every position of a user"""
+    try:
+        deleted = await positions_registry.delete(user_id)
+    except Exception as e:
+        print(f"Positions Redis error: {e}")
+        raise HTTPException(status_code=503, detail="Redis unavailable")
+    if not deleted:
+        raise HTTPException(status_code=404, detail=f"No positions for user: {user_id}")
+    return Response(status_code=204)
+
+
+class AlertRequest(BaseModel):
+    """Price-crossing ("price") or percent-move ("percent") alert of one user"""
+    user_id: str
+    symbol: str
+    kind: Literal["price", "percent"] = "price"
+    level: Optional[float] = None
+    direction: Optional[Literal["above", "below"]] = None
+    percent: Optional[float] = None
+    reference: Optional[float] = None
+
+
+@app.post("/api/alerts", status_code=201)
+async def create_alert(alert: AlertRequest):
+    """
+    Register a one-shot price alert
     
-    # Public Ethereum RPC endpoints
-    rpc_endpoints = [
-        "https://eth.llamarpc.com",
-        "https://rpc.ankr.com/eth",
-        "https://ethereum.publicnode.com",
-    ]
+    The alert is stored in Redis and picked up by the broadcaster on its
+    next tick; when it fires, the event (with this alert_key) is published
+    on "<channel>:alerts" and the registration is removed. A missing
+    direction (price alerts) or reference (percent alerts) is taken from
+    the current market price; 503 is returned when no provider has one.
+    Only the broadcaster's MARKET_SYMBOLS are accepted.
     
-    for endpoint in rpc_endpoints:
+    Args:
+        alert: user_id, symbol, kind, then level (and direction) for price
+            alerts or percent (and reference) for percent alerts
+    """
+    record = alert.model_dump()
+    record["symbol"] = alert.symbol.upper()
+    _require_tracked([record["symbol"]])
+    if alert.kind == "price" and alert.level is None:
+        raise HTTPException(status_code=400, detail="Price alerts need a level")
+    if alert.kind == "percent" and not alert.percent:
+        raise HTTPException(status_code=400, detail="Percent alerts need a non-zero percent")
+    if (alert.kind == "price" and alert.direction is None) or (alert.kind == "percent" and alert.reference is None):
         try:
-            # Get block number
-            payload = {
-                "jsonrpc": "2.0",
-                "method": "eth_blockNumber",
-                "params": [],
-                "id": 1
-            }
-            async with session.post(endpoint, json=payload, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if 'result' in data:
-                        block_number = int(data['result'], 16)
-                        
-                        # Get block data
-                        block_hex = hex(block_number)
-                        block_payload = {
-                            "jsonrpc": "2.0",
-                            "method": "eth_getBlockByNumber",
-                            "params": [block_hex, False],
-                            "id": 1
-                        }
-                        async with session.post(endpoint, json=block_payload, timeout=aiohttp.ClientTimeout(total=10)) as block_response:
-                            if block_response.status == 200:
-                                block_data = await block_response.json()
-                                transaction_count = 0
-                                if 'result' in block_data and block_data['result']:
-                                    transaction_count = len(block_data['result'].get('transactions', []))
-                                
-                                # Get gas price
-                                gas_payload = {
-                                    "jsonrpc": "2.0",
-                                    "method": "eth_gasPrice",
-                                    "params": [],
-                                    "id": 1
-                                }
-                                async with session.post(endpoint, json=gas_payload, timeout=aiohttp.ClientTimeout(total=10)) as gas_response:
-                                    if gas_response.status == 200:
-                                        gas_data = await gas_response.json()
-                                        gas_price = None
-                                        if 'result' in gas_data:
-                                            gas_price_wei = int(gas_data['result'], 16)
-                                            gas_price = gas_price_wei / 1e9  # Convert to Gwei
-                                        
-                                        return {
-                                            "network": "ethereum",
-                                            "block_height": block_number,
-                                            "transaction_count": transaction_count,
-                                            "gas_price": gas_price,
-                                            "hash_rate": None,
-                                            "timestamp": datetime.utcnow().isoformat()
-                                        }
+            market = await _cached("market", record["symbol"], lambda: _fetch_market_data(record["symbol"]))
+            price = float(market.data["price"])
+        except HTTPException:
+            price = 0.0
         except Exception as e:
-            print(f"RPC endpoint {endpoint} error: {e}")
-            continue
-    
-    raise HTTPException(status_code=503, detail="All RPC endpoints failed")
+            print(f"Alert market price error: {e}")
+            price = 0.0
+        if price <= 0:
+            # Never resolve an alert against a missing or placeholder price
+            raise HTTPException(status_code=503, detail=f"No market price for {record['symbol']}")
+        if alert.kind == "price":
+            record["direction"] = "above" if alert.level > price else "below"
+        else:
+            record["reference"] = price
+    alert_key = uuid.uuid4().hex
+    try:
+        await alert_registry.put(alert_key, record)
+    except Exception as e:
+        print(f"Alerts Redis error: {e}")
+        raise HTTPException(status_code=503, detail="Redis unavailable")
+    return {"alert_key": alert_key, **record}
+
+
+@app.get("/api/alerts/{alert_key}")
+async def get_alert(alert_key: str):
+    """Registered alert that has not fired or been deleted yet"""
+    try:
+        record = await alert_registry.get(alert_key)
+    except Exception as e:
+        print(f"Alerts Redis error: {e}")
+        raise HTTPException(status_code=503, detail="Redis unavailable")
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"No live alert: {alert_key}")
+    return {"alert_key": alert_key, **record}
+
+
+@app.delete("/api/alerts/{alert_key}", status_code=204)
+async def delete_alert(alert_key: str):
+    """Cancel a registered alert"""
+    try:
+        deleted = await alert_registry.delete(alert_key)
+    except Exception as e:
+        print(f"Alerts Redis error: {e}")
+        raise HTTPException(status_code=503, detail="Redis unavailable")
+    if not deleted:
+        raise HTTPException(status_code=404, detail=f"No live alert: {alert_key}")
+    return Response(status_code=204)
 
 
 @app.get("/api/aggregated")
-async def get_aggregated_data(symbol: str = "BTCUSD"):
+async def get_aggregated_data(
+    request: Request,
+    symbol: str = "BTCUSD",
+    fields: Optional[str] = None,
+    since: Optional[str] = None,
+):
     """
     Get aggregated data from all sources
     
+    The snapshot is rendered to JSON (and gzip/brotli on first request for
+    each) once per cache refresh; requests only pick the matching bytes.
+    Responses carry a content-hash ETag and honour If-None-Match (304).
+    
     Args:
         symbol: Market symbol to fetch (default: BTCUSD)
+        fields: Comma-separated sections or dotted fields to return
+            (e.g. "market_stream" or "market_stream.price,blockchain")
+        since: Version the client already has (the X-Snapshot-Version header,
+            or the ETag of the same fields view); returns
+            {"version", "base", "patch"} with a JSON merge patch, or
+            {"version", "base": null, "data"} if the version is unknown,
+            or 304 if nothing changed. Pass an empty value to start.
     """
-    import asyncio
-    
+    key = symbol.upper()
+    prepared = await _cached("aggregated", key, lambda: _build_aggregated_data(symbol))
+    snapshot = aggregated_versions.update(key, prepared)
+    projection = parse_filter(fields)
+    if since is None:
+        response = snapshot.view(projection).respond(request)
+    else:
+        body = aggregated_versions.since(key, snapshot, since, projection)
+        if body is None:
+            response = Response(status_code=304, headers={"ETag": f'"{snapshot.version}"'})
+        else:
+            response = body.respond(request)
+    # The full-payload version, valid as ?since= whatever the projection
+    response.headers["X-Snapshot-Version"] = snapshot.version
+    return response
+
+
+async def _build_aggregated_data(symbol: str) -> dict:
+    """Combine the (individually cached) source endpoints into one payload"""
     # Fetch all data concurrently
-    market_task = get_market_data(symbol)
-    news_task = get_news_sentiment()
-    blockchain_task = get_blockchain_data()
+    market_task = _cached("market", symbol.upper(), lambda: _fetch_market_data(symbol))
+    news_task = _cached("news", None, _fetch_news_sentiment)
+    blockchain_task = _cached("blockchain", blockchain_service.primary, _fetch_blockchain_data)
     
     try:
         market_data, news_data, blockchain_data = await asyncio.gather(
@@ -326,10 +679,16 @@ async def get_aggregated_data(symbol: str = "BTCUSD"):
         # Handle errors
         if isinstance(market_data, Exception):
             market_data = {"symbol": symbol, "price": 0.0, "volume": 0.0, "change_24h": 0.0, "timestamp": datetime.utcnow().isoformat()}
+        else:
+            market_data = market_data.data
         if isinstance(news_data, Exception):
             news_data = {"sentiment_score": 0.0, "sentiment_label": "neutral", "article_count": 0, "keywords": [], "timestamp": datetime.utcnow().isoformat()}
+        else:
+            news_data = news_data.data
         if isinstance(blockchain_data, Exception):
-            blockchain_data = {"network": "ethereum", "block_height": 0, "transaction_count": 0, "gas_price": None, "hash_rate": None, "timestamp": datetime.utcnow().isoformat()}
+            blockchain_data = {"network": blockchain_service.primary, "block_height": 0, "transaction_count": 0, "gas_price": None, "hash_rate": None, "timestamp": datetime.utcnow().isoformat()}
+        else:
+            blockchain_data = blockchain_data.data
         
         # Mock data for macro_econ and user_activity (can be implemented later)
         macro_econ = {
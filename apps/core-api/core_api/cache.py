@@ -0,0 +1,152 @@
+"""In-process response cache with request coalescing and stale-while-revalidate"""
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set
+
+
+@dataclass
+class CachePolicy:
+    """Freshness policy for one endpoint"""
+    ttl: float          # Seconds an entry is served as fresh
+    stale_ttl: float    # Extra seconds an expired entry may be served while refreshing
+    jitter: float = 0.1  # Fraction of ttl randomly added/removed to spread expiries
+
+
+@dataclass
+class _Entry:
+    value: Any
+    fresh_until: float
+    stale_until: float
+
+
+class ResponseCache:
+    """
+    Cache for upstream-backed endpoint results
+
+    - Fresh entries are returned immediately.
+    - Expired-but-stale entries are returned immediately while a single
+      background task refreshes them.
+    - Misses are coalesced: concurrent callers for the same key share one
+      upstream fetch (single-flight).
+    - Exceptions are never cached; they propagate to every waiter of the
+      failed fetch.
+    """
+
+    def __init__(self, policies: Optional[Dict[str, CachePolicy]] = None, max_entries: int = 1024):
+        """
+        Initialize Response Cache
+
+        Args:
+            policies: Per-namespace cache policies (e.g. {"market": CachePolicy(1.0, 10.0)})
+            max_entries: Maximum number of cached keys before oldest entries are evicted
+        """
+        self.policies = policies or {}
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0, "refreshes": 0, "errors": 0}
+
+    def _store(self, key: Hashable, value: Any, policy: CachePolicy) -> None:
+        ttl = policy.ttl
+        if policy.jitter:
+            ttl *= 1.0 + random.uniform(-policy.jitter, policy.jitter)
+        now = time.monotonic()
+        entry = _Entry(value=value, fresh_until=now + ttl, stale_until=now + ttl + policy.stale_ttl)
+        self._entries.pop(key, None)
+        self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            # Dicts keep insertion order, so the first key is the least recently stored
+            self._entries.pop(next(iter(self._entries)))
+
+    def _start_fetch(self, key: Hashable, fetcher: Callable[[], Awaitable[Any]], policy: CachePolicy) -> asyncio.Future:
+        """Start (or join) the single in-flight fetch for a key"""
+        future = self._inflight.get(key)
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[key] = future
+
+        async def run() -> None:
+            try:
+                value = await fetcher()
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                self._stats["errors"] += 1
+                if not future.done():
+                    future.set_exception(e)
+                    # Mark retrieved so background refresh failures don't log warnings
+                    future.exception()
+            else:
+                self._store(key, value, policy)
+                if not future.done():
+                    future.set_result(value)
+            finally:
+                self._inflight.pop(key, None)
+
+        task = loop.create_task(run())
+        # Keep a strong reference until the task finishes
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return future
+
+    async def get_or_fetch(
+        self,
+        namespace: str,
+        key: Hashable,
+        fetcher: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Return a cached value or fetch it from upstream
+
+        Args:
+            namespace: Policy name (e.g. "market", "news")
+            key: Cache key, unique within the namespace
+            fetcher: Zero-argument coroutine factory performing the upstream fetch
+
+        Returns:
+            Any: Cached or freshly fetched value
+        """
+        policy = self.policies.get(namespace)
+        if policy is None:
+            return await fetcher()
+
+        full_key = (namespace, key)
+        now = time.monotonic()
+        entry = self._entries.get(full_key)
+
+        if entry is not None:
+            if now < entry.fresh_until:
+                self._stats["hits"] += 1
+                return entry.value
+            if now < entry.stale_until:
+                self._stats["stale_hits"] += 1
+                if full_key not in self._inflight:
+                    self._stats["refreshes"] += 1
+                    self._start_fetch(full_key, fetcher, policy)
+                return entry.value
+
+        if full_key in self._inflight:
+            self._stats["coalesced"] += 1
+        else:
+            self._stats["misses"] += 1
+        # Shield so a cancelled client request doesn't cancel the shared fetch
+        return await asyncio.shield(self._start_fetch(full_key, fetcher, policy))
+
+    def invalidate(self, namespace: Optional[str] = None) -> None:
+        """Drop cached entries (all, or only those in one namespace)"""
+        if namespace is None:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if k[0] == namespace]:
+            del self._entries[key]
+
+    def stats(self) -> dict:
+        """Return cache counters"""
+        return {**self._stats, "entries": len(self._entries), "inflight": len(self._inflight)}
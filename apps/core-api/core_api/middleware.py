@@ -0,0 +1,64 @@
+"""ASGI middleware for Terminal-V Core API"""
+from typing import Iterable, List, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class StaticCORSMiddleware:
+    """
+    CORS for a public, credential-less API with headers computed once
+
+    Every origin is allowed, so there is nothing to check per request: simple
+    responses get a fixed header list appended and every OPTIONS request is
+    answered as a preflight without reaching the router.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allow_methods: Iterable[str] = ("GET", "POST", "PUT", "DELETE", "OPTIONS", "HEAD"),
+        allow_headers: str = "*",
+        expose_headers: str = "*",
+        max_age: int = 3600,
+    ):
+        """
+        Initialize Static CORS Middleware
+
+        Args:
+            app: Wrapped ASGI application
+            allow_methods: Methods allowed in preflight responses
+            allow_headers: Access-Control-Allow-Headers value
+            expose_headers: Access-Control-Expose-Headers value
+            max_age: Seconds browsers may cache a preflight result
+        """
+        self.app = app
+        self.simple_headers: List[Tuple[bytes, bytes]] = [
+            (b"access-control-allow-origin", b"*"),
+            (b"access-control-expose-headers", expose_headers.encode()),
+        ]
+        self.preflight_headers: List[Tuple[bytes, bytes]] = [
+            (b"access-control-allow-origin", b"*"),
+            (b"access-control-allow-methods", ", ".join(allow_methods).encode()),
+            (b"access-control-allow-headers", allow_headers.encode()),
+            (b"access-control-max-age", str(max_age).encode()),
+            (b"content-length", b"0"),
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS":
+            await send({"type": "http.response.start", "status": 200, "headers": self.preflight_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        simple_headers = self.simple_headers
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *simple_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
@@ -0,0 +1,160 @@
+"""Pre-serialized, pre-compressed JSON responses for cached endpoints"""
+import gzip
+import hashlib
+import json
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:  # optional dependency: brotli variants are simply not offered
+    brotli = None
+
+
+# Bodies smaller than this are always sent uncompressed
+MIN_COMPRESS_SIZE = 256
+
+# Server preference when the client accepts several encodings equally
+_PREFERENCE = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against an entity tag
+
+    Compressed variants carry the base tag plus an encoding suffix
+    (``"<tag>-gzip"``), so any variant of the same payload matches.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"').split("-", 1)[0] == etag:
+            return True
+    return False
+
+
+@lru_cache(maxsize=256)
+def negotiate_encoding(accept_encoding: Optional[str]) -> str:
+    """
+    Pick the response encoding for an Accept-Encoding header
+
+    Clients send only a handful of distinct header values, so results are
+    memoized per header string.
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value (None if absent)
+
+    Returns:
+        str: "br", "gzip" or "identity"
+    """
+    if not accept_encoding:
+        return "identity"
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            weights[name] = q
+    wildcard = weights.get("*", 0.0)
+    best, best_q = "identity", 0.0
+    for encoding in _PREFERENCE:
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class PreparedResponse(Response):
+    """Response whose body and raw headers were computed ahead of time"""
+
+    def __init__(self, body: bytes, raw_headers: List[Tuple[bytes, bytes]], status_code: int = 200):
+        self.status_code = status_code
+        self.background = None
+        self.body = body
+        self.raw_headers = list(raw_headers)
+
+
+class PreparedBody:
+    """
+    One cached payload kept as ready-to-send bytes
+
+    The JSON body is rendered once when the payload enters the cache, and each
+    compressed variant is built at most once, on first request. Serving a
+    request is then a dictionary lookup plus handing the bytes to the server.
+    """
+
+    __slots__ = ("data", "identity", "etag", "_variants")
+
+    def __init__(self, data: Any):
+        """
+        Initialize Prepared Body
+
+        Args:
+            data: JSON-compatible payload (kept for callers that combine payloads)
+        """
+        self.data = data
+        # Same rendering as FastAPI's JSONResponse
+        self.identity = json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+        # Content hash: identical payloads get the same tag on every worker
+        self.etag = hashlib.blake2b(self.identity, digest_size=8).hexdigest()
+        self._variants: Dict[str, Tuple[bytes, List[Tuple[bytes, bytes]]]] = {}
+
+    def _build(self, encoding: str) -> Tuple[bytes, List[Tuple[bytes, bytes]]]:
+        if encoding == "br":
+            body = brotli.compress(self.identity, quality=5)
+        elif encoding == "gzip":
+            body = gzip.compress(self.identity, compresslevel=6, mtime=0)
+        else:
+            body = self.identity
+        etag = self.etag if encoding == "identity" else f"{self.etag}-{encoding}"
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"vary", b"Accept-Encoding"),
+            (b"etag", f'"{etag}"'.encode()),
+            # Let browsers keep the body but revalidate (If-None-Match) every time
+            (b"cache-control", b"no-cache"),
+        ]
+        if encoding != "identity":
+            headers.append((b"content-encoding", encoding.encode()))
+        return body, headers
+
+    def response(self, accept_encoding: Optional[str] = None, if_none_match: Optional[str] = None) -> PreparedResponse:
+        """
+        Return the variant matching an Accept-Encoding header
+
+        Args:
+            accept_encoding: Request Accept-Encoding header
+            if_none_match: Request If-None-Match header; a match yields 304
+
+        Returns:
+            PreparedResponse: 200 with the encoded body, or 304 Not Modified
+        """
+        encoding = negotiate_encoding(accept_encoding)
+        if len(self.identity) < MIN_COMPRESS_SIZE:
+            encoding = "identity"
+        variant = self._variants.get(encoding)
+        if variant is None:
+            variant = self._variants[encoding] = self._build(encoding)
+        if etag_matches(if_none_match, self.etag):
+            return PreparedResponse(b"", [h for h in variant[1] if h[0] in (b"etag", b"vary", b"cache-control")], status_code=304)
+        return PreparedResponse(*variant)
+
+    def respond(self, request: Request) -> PreparedResponse:
+        """Return the response for a request (content negotiation and conditional GET)"""
+        headers = request.headers
+        return self.response(headers.get("accept-encoding"), headers.get("if-none-match"))
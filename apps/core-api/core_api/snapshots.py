@@ -0,0 +1,184 @@
+"""Versioned snapshots with field projection and incremental (since-version) responses"""
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Hashable, Optional, Tuple
+
+from nexus_engine.delta import merge_patch, strip_paths
+
+from core_api.responses import PreparedBody
+from core_api.streaming import ENVELOPE_KEYS
+
+
+# Fields that change on every rebuild without carrying new information
+VOLATILE_PATHS: Tuple[Tuple[str, ...], ...] = (
+    ("aggregated_at",),
+    ("*", "timestamp"),
+)
+
+
+def project(data: dict, fields: FrozenSet[str]) -> dict:
+    """
+    Keep only the requested fields
+
+    Args:
+        data: Full payload
+        fields: Top-level keys ("market_stream") or dotted sub-fields
+            ("market_stream.price"); envelope keys are always kept
+
+    Returns:
+        dict: Projected payload (``data`` itself if ``fields`` is empty)
+    """
+    if not fields:
+        return data
+    out = {key: data[key] for key in ENVELOPE_KEYS if key in data}
+    for field in sorted(fields):
+        section, _, sub = field.partition(".")
+        if section not in data:
+            continue
+        value = data[section]
+        if not sub:
+            out[section] = value
+        elif isinstance(value, dict) and sub in value:
+            target = out.setdefault(section, {})
+            if isinstance(target, dict) and target is not value:
+                target[sub] = value[sub]
+    return out
+
+
+class SnapshotVersion:
+    """
+    One distinct version of a payload
+
+    The version id is the content hash of the rendered payload (its ETag), so
+    it is stable across workers and restarts. Projections and patches against
+    older versions are rendered once and reused by every client asking for
+    the same view.
+    """
+
+    __slots__ = ("version", "body", "_views", "_patches")
+
+    def __init__(self, body: PreparedBody):
+        self.version = body.etag
+        self.body = body
+        self._views: Dict[FrozenSet[str], PreparedBody] = {}
+        self._patches: Dict[Tuple[str, FrozenSet[str]], PreparedBody] = {}
+
+    @property
+    def data(self) -> dict:
+        return self.body.data
+
+    def view(self, fields: FrozenSet[str]) -> PreparedBody:
+        """Prepared body for a field projection"""
+        if not fields:
+            return self.body
+        body = self._views.get(fields)
+        if body is None:
+            body = self._views[fields] = PreparedBody(project(self.data, fields))
+        return body
+
+
+class VersionedSnapshots:
+    """
+    Recent versions of each cached payload, deduplicated by meaningful content
+
+    A payload that differs from the current version only in volatile fields
+    (aggregated_at, per-section timestamps) does not create a new version, so
+    its ETag stays the same and polling clients get 304s.
+    """
+
+    def __init__(self, history: int = 32):
+        """
+        Initialize Versioned Snapshots
+
+        Args:
+            history: Versions kept per key for since-version patches
+        """
+        self.history = history
+        self._versions: Dict[Hashable, "OrderedDict[str, SnapshotVersion]"] = {}
+        self._current: Dict[Hashable, SnapshotVersion] = {}
+        # Last payload registered per key, which may be a deduplicated one
+        self._bodies: Dict[Hashable, PreparedBody] = {}
+        self._stats = {"versions": 0, "deduplicated": 0, "patches": 0, "full_resyncs": 0}
+
+    def update(self, key: Hashable, body: PreparedBody) -> SnapshotVersion:
+        """
+        Register the latest payload for ``key`` and return its version
+
+        Cheap when ``body`` is the payload already registered (the common case:
+        the response cache hands out the same object until it refreshes).
+        """
+        current = self._current.get(key)
+        if current is not None:
+            if self._bodies.get(key) is body:
+                return current
+            self._bodies[key] = body
+            if not strip_paths(merge_patch(current.data, body.data), VOLATILE_PATHS):
+                # Only timestamps moved: keep serving the existing version
+                self._stats["deduplicated"] += 1
+                return current
+        self._bodies[key] = body
+        versions = self._versions.setdefault(key, OrderedDict())
+        snapshot = versions.get(body.etag)
+        if snapshot is None:
+            snapshot = versions[body.etag] = SnapshotVersion(body)
+            self._stats["versions"] += 1
+            while len(versions) > self.history:
+                versions.popitem(last=False)
+        else:
+            versions.move_to_end(body.etag)
+        self._current[key] = snapshot
+        return snapshot
+
+    def resolve(self, key: Hashable, base: Optional[str], fields: FrozenSet[str] = frozenset()) -> Optional[SnapshotVersion]:
+        """
+        Known version a client-supplied version or ETag refers to
+
+        Accepts the full-payload version (the ``X-Snapshot-Version`` header and
+        the ``version`` of incremental responses) as well as the ETag of a
+        ``fields`` projection, quoted or not, with or without its
+        content-encoding suffix.
+        """
+        if not base:
+            return None
+        base = base.strip().removeprefix("W/").strip('"').partition("-")[0]
+        versions = self._versions.get(key, {})
+        snapshot = versions.get(base)
+        if snapshot is None and fields:
+            # A projected ETag can only have been served if its view was rendered
+            for candidate in reversed(versions.values()):
+                view = candidate._views.get(fields)
+                if view is not None and view.etag == base:
+                    return candidate
+        return snapshot
+
+    def since(self, key: Hashable, current: SnapshotVersion, base: Optional[str], fields: FrozenSet[str] = frozenset()) -> Optional[PreparedBody]:
+        """
+        Incremental response from ``base`` to ``current``
+
+        ``base`` is resolved with resolve(), so clients may send back either
+        the version or the ETag they received. Returns ``{"version", "base", "patch"}`` with a JSON merge patch when
+        ``base`` is a known older version, ``{"version", "base": null, "data"}``
+        with the full (projected) payload when it is unknown, and None when
+        ``base`` already is the current version (answer 304).
+        """
+        previous = self.resolve(key, base, fields)
+        if previous is current:
+            return None
+        cache_key = (previous.version if previous is not None else "", fields)
+        body = current._patches.get(cache_key)
+        if body is not None:
+            return body
+        if previous is None:
+            self._stats["full_resyncs"] += 1
+            payload = {"version": current.version, "base": None, "data": current.view(fields).data}
+        else:
+            self._stats["patches"] += 1
+            patch = merge_patch(previous.view(fields).data, current.view(fields).data)
+            payload = {"version": current.version, "base": previous.version, "patch": patch}
+        body = current._patches[cache_key] = PreparedBody(payload)
+        if len(current._patches) > self.history * 4:
+            current._patches.pop(next(iter(current._patches)))
+        return body
+
+    def stats(self) -> dict:
+        """Return version counters"""
+        return {**self._stats, "keys": len(self._current)}
@@ -0,0 +1,238 @@
+"""Server-push fan-out of broadcaster frames to WebSocket and SSE clients"""
+import asyncio
+import json
+from typing import Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+import redis.asyncio as redis
+from nexus_engine.codec import CodecError, decode_frame, frame_info
+from nexus_engine.delta import DeltaDecoder
+from nexus_engine.frame_stream import FrameStreamReader
+
+
+# Keys that are always sent regardless of the section filter
+ENVELOPE_KEYS = ("aggregated_at", "version")
+
+# Sections holding one entry per market symbol, narrowed by the symbol filter
+SYMBOL_KEYED_SECTIONS = ("indicators",)
+
+
+def parse_filter(value: Optional[str]) -> FrozenSet[str]:
+    """Parse a comma-separated filter parameter into a set (empty = no filter)"""
+    if not value:
+        return frozenset()
+    return frozenset(part.strip() for part in value.split(",") if part.strip())
+
+
+class Subscriber:
+    """
+    One connected client
+
+    Holds only the most recent frame (conflation): a slow client that misses
+    frames simply receives the newest one when it is ready again, so no
+    per-client queue ever builds up.
+    """
+
+    def __init__(self, sections: Iterable[str] = (), symbols: Iterable[str] = ()):
+        self._frame: Optional[str] = None
+        self._event = asyncio.Event()
+        self.dropped = 0
+        self.set_filters(sections, symbols)
+
+    def set_filters(self, sections: Iterable[str] = (), symbols: Iterable[str] = ()) -> None:
+        """Update section and symbol filters for this connection"""
+        self.sections = frozenset(sections)
+        self.symbols = frozenset(s.upper() for s in symbols)
+
+    @property
+    def filter_key(self) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        return self.sections, self.symbols
+
+    def offer(self, frame: str) -> None:
+        """Replace the pending frame with a newer one"""
+        if self._event.is_set():
+            self.dropped += 1
+        self._frame = frame
+        self._event.set()
+
+    async def next_frame(self) -> str:
+        """Wait for and return the newest frame"""
+        await self._event.wait()
+        self._event.clear()
+        return self._frame
+
+
+class StreamHub:
+    """
+    Per-worker Redis subscription fanned out to all connected clients
+
+    A single Redis reader is started lazily on the first subscriber and every
+    incoming frame is parsed once, projected once per distinct filter and
+    offered to each subscriber. The reader either subscribes to the pub/sub
+    channel or, with ``use_stream``, tails the broadcaster's Redis Stream:
+    it first replays from the latest snapshot so state is available
+    immediately and no frames are lost across reconnects.
+    """
+
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379/0",
+        redis_channel: str = "terminal-v:data",
+        use_stream: bool = False,
+    ):
+        """
+        Initialize Stream Hub
+
+        Args:
+            redis_url: Redis connection URL
+            redis_channel: Redis channel the broadcaster publishes to
+            use_stream: Read the "<channel>:stream" Redis Stream instead of pub/sub
+        """
+        self.redis_url = redis_url
+        self.redis_channel = redis_channel
+        self.use_stream = use_stream
+        self._subscribers: Set[Subscriber] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._client: Optional[redis.Redis] = None
+        # Delay before the next reconnect, reset once a connection delivers
+        self._backoff = 0.5
+        self.latest: Optional[dict] = None
+        # Rebuilds full frames when the broadcaster publishes deltas
+        self._decoder = DeltaDecoder()
+        self._stats = {"frames": 0, "decode_errors": 0, "reconnects": 0}
+
+    def subscribe(self, sections: Iterable[str] = (), symbols: Iterable[str] = ()) -> Subscriber:
+        """Register a client and start the Redis listener if needed"""
+        subscriber = Subscriber(sections, symbols)
+        self._subscribers.add(subscriber)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._listen())
+        if self.latest is not None:
+            # Give new clients something to render immediately
+            subscriber.offer(self._project(self.latest, subscriber.sections, subscriber.symbols))
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Remove a client"""
+        self._subscribers.discard(subscriber)
+
+    async def stop(self) -> None:
+        """Stop the Redis listener"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client:
+            await self._client.close()
+            self._client = None
+
+    async def _listen(self) -> None:
+        """Read frames from Redis, reconnecting with backoff on errors"""
+        self._backoff = 0.5
+        while True:
+            try:
+                self._client = redis.from_url(self.redis_url, decode_responses=False)
+                if self.use_stream:
+                    await self._read_stream(self._client)
+                    continue
+                pubsub = self._client.pubsub()
+                await pubsub.subscribe(self.redis_channel)
+                self._backoff = 0.5
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    self._dispatch(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Stream hub Redis error: {e}")
+                self._stats["reconnects"] += 1
+                if self._client:
+                    await self._client.close()
+                    self._client = None
+                await asyncio.sleep(self._backoff)
+                self._backoff = min(self._backoff * 2, 10.0)
+
+    async def _read_stream(self, client: redis.Redis) -> None:
+        """Replay from the latest snapshot, then tail the stream"""
+        reader = FrameStreamReader(client, channel=self.redis_channel)
+        last_id = "$"
+        for entry_id, payload in await reader.catch_up():
+            self._dispatch(payload)
+            last_id = entry_id
+        self._backoff = 0.5
+        while True:
+            for entry_id, payload in await reader.read(last_id, block_ms=5000):
+                self._dispatch(payload)
+                last_id = entry_id
+
+    def _dispatch(self, raw: bytes) -> None:
+        """Parse one frame (JSON or binary encoding) and offer it to every subscriber"""
+        try:
+            if frame_info(raw) is not None:
+                # Binary frames are re-encoded as JSON for clients below
+                message = decode_frame(raw)
+                raw = None
+            else:
+                message = json.loads(raw)
+        except (CodecError, ValueError):
+            self._stats["decode_errors"] += 1
+            return
+        if isinstance(message, dict) and "type" in message:
+            # Keyframe/delta envelope: clients always receive full frames
+            data = self._decoder.decode(message)
+            if data is None:
+                return
+            raw = None
+        else:
+            data = message
+        self.latest = data
+        self._stats["frames"] += 1
+
+        # Serialize once per distinct filter, not once per client
+        rendered: Dict[Tuple[FrozenSet[str], FrozenSet[str]], str] = {}
+        for subscriber in self._subscribers:
+            key = subscriber.filter_key
+            frame = rendered.get(key)
+            if frame is None:
+                if not key[0] and not key[1] and raw is not None:
+                    frame = raw.decode() if isinstance(raw, bytes) else raw
+                else:
+                    frame = self._project(data, *key)
+                rendered[key] = frame
+            subscriber.offer(frame)
+
+    @staticmethod
+    def _project(data: dict, sections: FrozenSet[str], symbols: FrozenSet[str]) -> str:
+        """
+        Apply section and symbol filters to a frame
+
+        The symbol filter covers every market-symbol section: market_stream
+        is dropped unless its symbol is wanted, and the per-symbol sections
+        (SYMBOL_KEYED_SECTIONS) keep only the wanted symbols. Chain sections
+        are per network, not per symbol, and only follow the section filter.
+        """
+        if sections:
+            out = {k: v for k, v in data.items() if k in sections or k in ENVELOPE_KEYS}
+        else:
+            out = dict(data)
+        if symbols:
+            market = out.get("market_stream")
+            if isinstance(market, dict) and str(market.get("symbol", "")).upper() not in symbols:
+                out.pop("market_stream")
+            for name in SYMBOL_KEYED_SECTIONS:
+                values = out.get(name)
+                if isinstance(values, dict):
+                    out[name] = {symbol: v for symbol, v in values.items() if symbol.upper() in symbols}
+        return json.dumps(out, default=str)
+
+    def stats(self) -> dict:
+        """Return hub counters"""
+        return {
+            **self._stats,
+            **{f"delta_{k}": v for k, v in self._decoder.stats.items()},
+            "subscribers": len(self._subscribers),
+            "dropped": sum(s.dropped for s in self._subscribers),
+        }
@@ -0,0 +1,75 @@
+"""Alert and position endpoints against an in-memory Redis"""
+import pytest
+from fastapi.testclient import TestClient
+
+import core_api.api as api
+from nexus_engine.memory_redis import InMemoryRedis
+
+
+@pytest.fixture
+def client(monkeypatch):
+    redis_client = InMemoryRedis()
+    monkeypatch.setattr(api.alert_registry, "client", redis_client)
+    monkeypatch.setattr(api.positions_registry, "client", redis_client)
+    quotes = {"BTCUSD": {"symbol": "BTCUSD", "price": 100.0, "volume": 1.0, "change_24h": 0.0}}
+
+    async def fetch_quotes(symbols, include_tradingview=True):
+        return {symbol: quotes[symbol] for symbol in symbols if symbol in quotes}
+
+    monkeypatch.setattr(api.market_service, "fetch_quotes", fetch_quotes)
+    monkeypatch.setattr(api, "MARKET_SYMBOLS", frozenset({"BTCUSD", "SPX"}))
+    return TestClient(api.app)
+
+
+def test_alert_lifecycle(client):
+    response = client.post("/api/alerts", json={"user_id": "u1", "symbol": "btcusd", "level": 120})
+    assert response.status_code == 201
+    created = response.json()
+    # The direction was resolved from the market price
+    assert (created["symbol"], created["direction"]) == ("BTCUSD", "above")
+    key = created["alert_key"]
+    assert client.get(f"/api/alerts/{key}").json() == created
+    assert client.delete(f"/api/alerts/{key}").status_code == 204
+    assert client.get(f"/api/alerts/{key}").status_code == 404
+    assert client.delete(f"/api/alerts/{key}").status_code == 404
+
+
+def test_percent_alert_takes_reference_from_market(client):
+    response = client.post("/api/alerts", json={"user_id": "u1", "symbol": "BTCUSD", "kind": "percent", "percent": -5})
+    assert response.status_code == 201
+    assert response.json()["reference"] == 100.0
+
+
+@pytest.mark.parametrize("body, status", [
+    ({"user_id": "u1", "symbol": "DOGE", "level": 1, "direction": "above"}, 400),
+    ({"user_id": "u1", "symbol": "BTCUSD"}, 400),
+    ({"user_id": "u1", "symbol": "BTCUSD", "kind": "percent", "percent": 0}, 400),
+    # Tracked, but no provider has a price to resolve the direction from
+    ({"user_id": "u1", "symbol": "SPX", "level": 10}, 503),
+])
+def test_alert_rejections(client, body, status):
+    assert client.post("/api/alerts", json=body).status_code == status
+
+
+def test_alert_with_direction_needs_no_price(client):
+    response = client.post("/api/alerts", json={"user_id": "u1", "symbol": "SPX", "level": 10, "direction": "below"})
+    assert response.status_code == 201
+
+
+def test_positions_lifecycle(client):
+    body = {"positions": {"btcusd": {"quantity": 2, "average_price": 41000}, "SPX": {"quantity": -1, "average_price": 5000}}}
+    response = client.put("/api/portfolio/u1/positions", json=body)
+    assert response.status_code == 200
+    expected = {"BTCUSD": {"quantity": 2.0, "average_price": 41000.0}, "SPX": {"quantity": -1.0, "average_price": 5000.0}}
+    assert response.json()["positions"] == expected
+    assert client.get("/api/portfolio/u1/positions").json() == {"user_id": "u1", "positions": expected}
+    assert client.delete("/api/portfolio/u1/positions").status_code == 204
+    assert client.get("/api/portfolio/u1/positions").status_code == 404
+
+
+def test_positions_reject_untracked_symbols(client):
+    body = {"positions": {"BTCUSD": {"quantity": 1, "average_price": 1}, "DOGE": {"quantity": 1000, "average_price": 0.1}}}
+    response = client.put("/api/portfolio/u1/positions", json=body)
+    assert response.status_code == 400
+    assert "DOGE" in response.json()["detail"]
+    assert client.get("/api/portfolio/u1/positions").status_code == 404
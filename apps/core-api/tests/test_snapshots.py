@@ -0,0 +1,67 @@
+"""VersionedSnapshots: content versions, deduplication and since-version patches"""
+import copy
+
+from core_api.responses import PreparedBody
+from core_api.snapshots import VersionedSnapshots, project
+from nexus_engine.delta import apply_merge_patch
+
+
+def payload(price: float, ts: str) -> dict:
+    return {
+        "aggregated_at": ts,
+        "market_stream": {"symbol": "BTCUSD", "price": price, "timestamp": ts},
+        "blockchain": {"network": "ethereum", "block_height": 1, "timestamp": ts},
+    }
+
+
+def test_timestamp_only_changes_keep_the_version():
+    snapshots = VersionedSnapshots()
+    first = snapshots.update("k", PreparedBody(payload(1.0, "t1")))
+    body = PreparedBody(payload(1.0, "t2"))
+    assert snapshots.update("k", body) is first
+    assert snapshots.stats()["deduplicated"] == 1
+    # The deduplicated body is remembered: handing it out again is not diffed again
+    assert snapshots.update("k", body) is first
+    assert snapshots.stats()["deduplicated"] == 1
+    second = snapshots.update("k", PreparedBody(payload(2.0, "t3")))
+    assert second is not first and second.version != first.version
+    assert snapshots.stats()["versions"] == 2
+
+
+def test_since_returns_patch_full_or_nothing():
+    snapshots = VersionedSnapshots()
+    old = snapshots.update("k", PreparedBody(payload(1.0, "t1")))
+    new = snapshots.update("k", PreparedBody(payload(2.0, "t2")))
+    patch = snapshots.since("k", new, old.version).data
+    assert (patch["version"], patch["base"]) == (new.version, old.version)
+    assert apply_merge_patch(copy.deepcopy(old.data), patch["patch"]) == new.data
+    # A quoted, encoding-suffixed ETag resolves to the same version
+    assert snapshots.since("k", new, f'W/"{old.version}-gzip"').data == patch
+    assert snapshots.since("k", new, new.version) is None
+    full = snapshots.since("k", new, "unknown").data
+    assert (full["base"], full["data"]) == (None, new.data)
+
+
+def test_projected_etag_resolves():
+    snapshots = VersionedSnapshots()
+    fields = frozenset({"market_stream.price"})
+    old = snapshots.update("k", PreparedBody(payload(1.0, "t1")))
+    etag = old.view(fields).etag
+    new = snapshots.update("k", PreparedBody(payload(2.0, "t2")))
+    assert snapshots.resolve("k", etag, fields) is old
+    assert snapshots.since("k", new, etag, fields).data["patch"] == {"aggregated_at": "t2", "market_stream": {"price": 2.0}}
+
+
+def test_history_is_bounded():
+    snapshots = VersionedSnapshots(history=2)
+    first = snapshots.update("k", PreparedBody(payload(1.0, "t")))
+    for price in (2.0, 3.0):
+        current = snapshots.update("k", PreparedBody(payload(price, "t")))
+    assert snapshots.resolve("k", first.version) is None
+    assert snapshots.resolve("k", current.version) is current
+
+
+def test_project():
+    data = payload(1.0, "t")
+    assert project(data, frozenset()) is data
+    assert project(data, frozenset({"market_stream.price", "missing"})) == {"aggregated_at": "t", "market_stream": {"price": 1.0}}
@@ -0,0 +1,85 @@
+"""StreamHub frame projection and subscriber conflation"""
+import asyncio
+import json
+
+import core_api.streaming as streaming
+from core_api.streaming import StreamHub, Subscriber, parse_filter
+
+FRAME = {
+    "aggregated_at": "t",
+    "market_stream": {"symbol": "BTCUSD", "price": 1.0},
+    "indicators": {"BTCUSD": {"sma": 1.0}, "SPX": {"sma": 2.0}},
+    "blockchain": {"network": "ethereum"},
+}
+
+
+def test_parse_filter():
+    assert parse_filter(None) == frozenset()
+    assert parse_filter(" market_stream, ,blockchain") == frozenset({"market_stream", "blockchain"})
+
+
+def test_project_by_sections():
+    out = json.loads(StreamHub._project(FRAME, frozenset({"blockchain"}), frozenset()))
+    assert out == {"aggregated_at": "t", "blockchain": {"network": "ethereum"}}
+
+
+def test_project_by_symbols():
+    out = json.loads(StreamHub._project(FRAME, frozenset(), frozenset({"SPX"})))
+    assert "market_stream" not in out
+    assert out["indicators"] == {"SPX": {"sma": 2.0}}
+    assert out["blockchain"] == FRAME["blockchain"]
+    out = json.loads(StreamHub._project(FRAME, frozenset(), frozenset({"BTCUSD"})))
+    assert out["market_stream"] == FRAME["market_stream"]
+    assert list(out["indicators"]) == ["BTCUSD"]
+
+
+def test_subscriber_keeps_only_the_newest_frame():
+    async def scenario():
+        subscriber = Subscriber(symbols=["btcusd"])
+        assert subscriber.symbols == frozenset({"BTCUSD"})
+        subscriber.offer("a")
+        subscriber.offer("b")
+        assert await subscriber.next_frame() == "b"
+        assert subscriber.dropped == 1
+    asyncio.run(scenario())
+
+
+
+def test_stream_backoff_resets_after_catch_up(monkeypatch):
+    attempts, delays = [], []
+
+    class Client:
+        async def close(self):
+            pass
+
+    class Reader:
+        def __init__(self, client, channel):
+            pass
+
+        async def catch_up(self):
+            return []
+
+        async def read(self, last_id, block_ms):
+            raise ConnectionError("connection reset")
+
+    def from_url(url, **kwargs):
+        attempts.append(url)
+        if len(attempts) in (1, 2):
+            raise ConnectionError("connection refused")
+        if len(attempts) == 4:
+            raise asyncio.CancelledError
+        return Client()
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(streaming.redis, "from_url", from_url)
+    monkeypatch.setattr(streaming, "FrameStreamReader", Reader)
+    monkeypatch.setattr(streaming.asyncio, "sleep", sleep)
+    hub = StreamHub(use_stream=True)
+    try:
+        asyncio.run(hub._listen())
+    except asyncio.CancelledError:
+        pass
+    # Two failed connects back off, the third caught up before dropping
+    assert delays == [0.5, 1.0, 0.5]
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark: rolling correlation cost per sample against the 200ms tick budget
+
+Times the incremental rank-2 update of RollingCorrelation, a full recompute
+of the covariance over the window for comparison, and building the binary
+payload the broadcaster stores in Redis.
+
+Usage:
+    python benchmarks/bench_correlation.py [--symbols N] [--window N]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from nexus_engine.correlation import RollingCorrelation  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rolling correlation benchmark")
+    parser.add_argument("--symbols", type=int, default=500, help="Symbols in the matrix (default: 500)")
+    parser.add_argument("--window", type=int, default=300, help="Return samples in the window (default: 300)")
+    parser.add_argument("--samples", type=int, default=200, help="Samples timed (default: 200)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(11)
+    names = [f"SYM{i}" for i in range(args.symbols)]
+    correlation = RollingCorrelation(names, window=args.window)
+    # Fill the window so every timed sample also removes one
+    for returns in rng.normal(0.0, 1e-3, (args.window, args.symbols)):
+        correlation.add_returns(returns)
+
+    prices = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 1e-3, (args.samples, args.symbols)), axis=0))
+    ticks = [dict(zip(names, row.tolist())) for row in prices]
+    started = time.perf_counter()
+    for ts, tick in enumerate(ticks):
+        correlation.update(tick, float(ts))
+    update = (time.perf_counter() - started) / args.samples
+
+    started = time.perf_counter()
+    for _ in range(10):
+        np.cov(correlation.returns, rowvar=False)
+    recompute = (time.perf_counter() - started) / 10
+
+    started = time.perf_counter()
+    for _ in range(10):
+        payload = correlation.encode(0)
+    encode = (time.perf_counter() - started) / 10
+
+    print(f"symbols: {args.symbols}, window: {args.window}")
+    print(f"  incremental update(): {update * 1e3:8.2f} ms/sample")
+    print(f"  full recompute:       {recompute * 1e3:8.2f} ms/sample")
+    print(f"  encode():             {encode * 1e3:8.2f} ms ({len(payload):,} bytes)")
+    print(f"  tick budget used:     {(update + encode) / 0.2 * 100:.1f}% of 200ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: indicator engine throughput in ticks per second on one core
+
+Feeds random-walk ticks for many symbols through the scalar path
+(IndicatorEngine.update(), one symbol at a time) and the vectorized path
+(update_batch(), one tick for every symbol per call), then times building
+the per-symbol snapshot that goes into the published frame.
+
+Usage:
+    python benchmarks/bench_indicators.py [--symbols N] [--steps N]
+"""
+import argparse
+import os
+import sys
+import time
+
+# One core: keep BLAS/OpenMP pools from spreading the vectorized path
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+
+import numpy as np  # noqa: E402
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from nexus_engine.indicators import IndicatorEngine  # noqa: E402
+
+
+def make_ticks(symbols: int, steps: int, seed: int = 7):
+    """Random-walk prices and volumes, one row per step"""
+    rng = np.random.default_rng(seed)
+    prices = 100.0 + np.cumsum(rng.normal(0.0, 0.5, (steps, symbols)), axis=0)
+    volumes = rng.uniform(0.0, 10.0, (steps, symbols))
+    timestamps = 1_700_000_000.0 + np.arange(steps, dtype=np.float64)
+    return prices, volumes, timestamps
+
+
+def bench_scalar(names, prices, volumes, timestamps) -> float:
+    engine = IndicatorEngine(capacity=len(names))
+    price_rows, volume_rows, stamps = prices.tolist(), volumes.tolist(), timestamps.tolist()
+    update = engine.update
+    started = time.perf_counter()
+    for step_prices, step_volumes, ts in zip(price_rows, volume_rows, stamps):
+        for name, price, volume in zip(names, step_prices, step_volumes):
+            update(name, price, volume, ts)
+    return time.perf_counter() - started
+
+
+def bench_batch(names, prices, volumes, timestamps) -> float:
+    engine = IndicatorEngine(capacity=len(names))
+    rows = engine.rows(names)
+    update_batch = engine.update_batch
+    started = time.perf_counter()
+    for step_prices, step_volumes, ts in zip(prices, volumes, timestamps):
+        update_batch(rows, step_prices, step_volumes, ts)
+    return time.perf_counter() - started
+
+
+def bench_snapshot(names, prices, volumes, timestamps, repeat: int = 20) -> float:
+    engine = IndicatorEngine(capacity=len(names))
+    rows = engine.rows(names)
+    for step_prices, step_volumes, ts in zip(prices[:64], volumes[:64], timestamps[:64]):
+        engine.update_batch(rows, step_prices, step_volumes, ts)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        engine.snapshot()
+    return (time.perf_counter() - started) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Indicator engine ticks/sec benchmark")
+    parser.add_argument("--symbols", type=int, default=500, help="Symbols updated per step (default: 500)")
+    parser.add_argument("--steps", type=int, default=2000, help="Ticks per symbol (default: 2000)")
+    args = parser.parse_args()
+
+    names = [f"SYM{i}" for i in range(args.symbols)]
+    prices, volumes, timestamps = make_ticks(args.symbols, args.steps)
+    ticks = args.symbols * args.steps
+    # The scalar path is much slower; a tenth of the steps gives a stable rate
+    scalar_steps = max(args.steps // 10, 1)
+
+    scalar = bench_scalar(names, prices[:scalar_steps], volumes[:scalar_steps], timestamps[:scalar_steps])
+    scalar_rate = args.symbols * scalar_steps / scalar
+    batch = bench_batch(names, prices, volumes, timestamps)
+    batch_rate = ticks / batch
+    snapshot = bench_snapshot(names, prices, volumes, timestamps)
+
+    print(f"symbols: {args.symbols}, steps: {args.steps}")
+    print(f"  scalar update():       {scalar_rate:12,.0f} ticks/s/core  ({scalar / (args.symbols * scalar_steps) * 1e6:.2f} µs/tick)")
+    print(f"  batch update_batch():  {batch_rate:12,.0f} ticks/s/core  ({batch / args.steps * 1e6:.1f} µs/step of {args.symbols})")
+    print(f"  speedup:               {batch_rate / scalar_rate:.1f}x")
+    print(f"  frame snapshot():      {snapshot * 1e3:.2f} ms for {args.symbols} symbols")
+
+
+if __name__ == "__main__":
+    main()
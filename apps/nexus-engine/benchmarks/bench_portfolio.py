@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: revaluing 100k portfolios per price tick on one core
+
+Loads random positions into PortfolioEngine and times a tick where one
+symbol moves (incremental update of its holders), a tick where every symbol
+moves (one matrix-vector product over all portfolios) and packing the
+records the broadcaster stores in Redis. The target is 50 ms per tick.
+
+Usage:
+    python benchmarks/bench_portfolio.py [--users N] [--symbols N] [--positions N]
+"""
+import argparse
+import os
+import sys
+import time
+
+# One core: keep BLAS from spreading the matrix-vector product
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+
+import numpy as np  # noqa: E402
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from nexus_engine.portfolio import PortfolioEngine  # noqa: E402
+
+
+def timed(func, repeat: int) -> float:
+    """Best of ``repeat`` runs, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Portfolio revaluation benchmark")
+    parser.add_argument("--users", type=int, default=100_000, help="Portfolios (default: 100,000)")
+    parser.add_argument("--symbols", type=int, default=50, help="Tradable symbols (default: 50)")
+    parser.add_argument("--positions", type=int, default=10, help="Average positions per portfolio (default: 10)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(23)
+    names = [f"SYM{i}" for i in range(args.symbols)]
+    users = [f"user{i}" for i in range(args.users)]
+    engine = PortfolioEngine(names, capacity=args.users)
+    holders = args.users * args.positions // args.symbols
+
+    started = time.perf_counter()
+    for name in names:
+        rows = rng.choice(args.users, holders, replace=False)
+        engine.set_positions([users[r] for r in rows], name, rng.uniform(1, 100, holders), rng.uniform(50, 150, holders))
+    load = time.perf_counter() - started
+    prices = dict(zip(names, rng.uniform(50, 150, args.symbols).tolist()))
+    engine.update_prices(prices)
+
+    def one_symbol():
+        name = names[int(rng.integers(args.symbols))]
+        prices[name] *= 1 + rng.normal(0, 0.001)
+        engine.update_prices({name: prices[name]})
+
+    def all_symbols():
+        for name in names:
+            prices[name] *= 1 + rng.normal(0, 0.001)
+        engine.update_prices(prices)
+
+    one = timed(one_symbol, 50)
+    everything = timed(all_symbols, 20)
+    encode = timed(lambda: engine.encode(0), 20)
+    payload = engine.encode(0)
+
+    def one_symbol_update():
+        one_symbol()
+        return engine.encode_updates(0)
+
+    engine.encode_updates(0)
+    update = timed(one_symbol_update, 20) - one
+    ranges = one_symbol_update()
+
+    matrix_mb = (engine.quantities.nbytes + engine.costs.nbytes) / 1e6
+    print(f"portfolios: {args.users:,}, symbols: {args.symbols}, positions: {holders * args.symbols:,} ({matrix_mb:.0f} MB)")
+    print(f"  load positions:       {load:8.2f} s")
+    print(f"  1 symbol moves:       {one * 1e3:8.2f} ms/tick ({holders:,} portfolios revalued)")
+    print(f"  all symbols move:     {everything * 1e3:8.2f} ms/tick (every portfolio, one multiply)")
+    print(f"  encode():             {encode * 1e3:8.2f} ms ({len(payload):,} bytes)")
+    print(f"  encode_updates():     {update * 1e3:8.2f} ms after 1 symbol moves ({sum(len(c) for _, c in ranges):,} bytes in {len(ranges):,} ranges)")
+
+
+if __name__ == "__main__":
+    main()
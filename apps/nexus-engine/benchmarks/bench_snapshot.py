@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: per-tick cost of building and serializing an AggregatedData snapshot
+
+Compares the validated path (constructor, model_dump(), json.dumps(default=str))
+with the trusted path (AggregatedData.from_trusted() and to_json_bytes()).
+
+Usage:
+    python benchmarks/bench_snapshot.py [--iterations N]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from nexus_engine.models.aggregated_data import (  # noqa: E402
+    AggregatedData,
+    BlockchainData,
+    MacroEconData,
+    MarketStreamData,
+    NewsSentimentData,
+    SectionStatus,
+    UserActivityData,
+)
+
+
+def make_sections() -> dict:
+    """Section models as the services produce them"""
+    return {
+        "market_stream": MarketStreamData(symbol="BTCUSD", price=65000.5, volume=1.2e9, change_24h=-1.25),
+        "macro_econ": MacroEconData(gdp_growth=2.1, inflation_rate=3.2, unemployment_rate=3.9, interest_rate=5.25, region="US"),
+        "news_sentiment": NewsSentimentData(
+            sentiment_score=0.12, sentiment_label="neutral", article_count=42,
+            keywords=["bitcoin", "fed", "rates", "etf", "earnings"],
+        ),
+        "blockchain": BlockchainData(network="ethereum", block_height=21000000, transaction_count=150, gas_price=12.5),
+        "user_activity": UserActivityData(active_users=1200, transactions_24h=5400, total_volume_24h=1.5e6, top_symbols=["BTCUSD", "SPX"]),
+    }
+
+
+def make_statuses() -> dict:
+    return {name: {"status": "fresh", "age_ms": 120.0, "error": None} for name in make_sections()}
+
+
+def validated_tick(sections: dict, statuses: dict) -> bytes:
+    """Previous per-tick path: full validation, dict dump, json.dumps"""
+    data = AggregatedData(
+        **sections,
+        sections={name: SectionStatus(**status) for name, status in statuses.items()},
+    )
+    return json.dumps(data.model_dump(), default=str).encode()
+
+
+def trusted_tick(sections: dict, statuses: dict) -> bytes:
+    """Trusted path used by the aggregator and broadcaster"""
+    data = AggregatedData.from_trusted(
+        **sections,
+        sections={name: SectionStatus(**status) for name, status in statuses.items()},
+    )
+    return data.to_json_bytes()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AggregatedData build + serialize benchmark")
+    parser.add_argument("--iterations", type=int, default=20000, help="Ticks per measurement (default: 20000)")
+    args = parser.parse_args()
+
+    sections = make_sections()
+    statuses = make_statuses()
+    results = {}
+    for name, func in (("validated", validated_tick), ("trusted", trusted_tick)):
+        best = min(timeit.repeat(lambda: func(sections, statuses), number=args.iterations, repeat=5))
+        results[name] = best / args.iterations * 1e6
+        size = len(func(sections, statuses))
+        print(f"{name:>9}: {results[name]:8.2f} µs/tick  ({size} bytes)")
+
+    print(f"  speedup: {results['validated'] / results['trusted']:.2f}x")
+    # At 5 Hz the broadcaster runs 432,000 ticks per day
+    saved_s = (results["validated"] - results["trusted"]) * 432000 / 1e6
+    print(f"    saved: {saved_s:.1f} CPU seconds/day at 5 Hz")
+
+
+if __name__ == "__main__":
+    main()
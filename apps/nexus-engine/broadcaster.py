@@ -3,7 +3,7 @@
 Broadcaster Script - Aggregates data from 5 sources and pushes to Redis every 200ms
 
 Usage:
-    python broadcaster.py [--redis-url REDIS_URL] [--redis-channel CHANNEL]
+    python broadcaster.py [--redis-url REDIS_URL] [--redis-channel CHANNEL] [--delta] [--encoding ENCODING]
 
 Environment Variables:
     REDIS_URL: Redis connection URL (default: redis://localhost:6379/0)
@@ -15,7 +15,17 @@ Environment Variables:
     NEWSAPI_KEY: API key for NewsAPI (optional - uses Reddit/Investing.com as fallback)
     BLOCKCHAIN_RPC_URL: Custom RPC endpoint URL (optional - uses public endpoints by default)
     BLOCKCHAIN_RPC_KEY: RPC authentication key (optional - not needed for public endpoints)
+    BLOCKCHAIN_NETWORKS: Comma-separated EVM networks to follow, first is primary (default: ethereum)
     DB_URL: Database connection URL for user activity
+    REDIS_TRANSPORT: "pubsub", "stream" or "both" (default: pubsub)
+    REDIS_STREAM_MAXLEN: Approximate frames kept in the stream (default: 10000)
+    FRAME_ENCODING: "json", "msgpack" or "struct" (default: json)
+    DELTA_MODE: Publish merge-patch deltas instead of full snapshots (default: off)
+    KEYFRAME_INTERVAL: Ticks between full keyframes in delta mode (default: 25)
+    OVERRUN_POLICY: "skip" (drop missed ticks) or "catch-up" (default: skip)
+    REFRESH_INTERVALS: Per-source refresh cadence in seconds, e.g. "market_stream=0.5,news_sentiment=60"
+    CORRELATION_WINDOW: Return samples in the rolling correlation matrix (default: 300)
+    PORTFOLIO_INTERVAL: Minimum seconds between portfolio P&L writes to Redis (default: 1.0)
     
     Note: Market data comes from CoinGecko (crypto), TradingView & Google Finance (yfinance)
           Macro data comes from Investing.com & FRED API
@@ -23,14 +33,22 @@ Environment Variables:
           Blockchain data comes from Public Ethereum RPC endpoints
 """
 import asyncio
-import json
 import os
 import signal
 import sys
-from typing import Optional
+import time
+from typing import Any, Optional, Tuple, Union
 
 import redis.asyncio as redis
+from nexus_engine.codec import ENCODING_JSON, check_encoding, encode_frame
+from nexus_engine.alerts import alerts_channel, alerts_registry_key
+from nexus_engine.correlation import correlation_key
+from nexus_engine.delta import DeltaEncoder
+from nexus_engine.frame_stream import FrameStreamWriter
+from nexus_engine.portfolio import portfolio_keys, positions_registry_key
+from nexus_engine.registry import OP_DELETE, OP_PUT, RedisRegistry
 from nexus_engine.services.aggregator import DataAggregatorService
+from nexus_engine.tick_timer import OVERRUN_SKIP, FixedRateTicker, PhaseTimer
 
 
 class Broadcaster:
@@ -40,7 +58,16 @@ class Broadcaster:
         self,
         redis_url: str = "redis://localhost:6379/0",
         redis_channel: str = "terminal-v:data",
-        aggregator: Optional[DataAggregatorService] = None
+        aggregator: Optional[DataAggregatorService] = None,
+        delta_mode: bool = False,
+        keyframe_interval: int = 25,
+        overrun_policy: str = OVERRUN_SKIP,
+        stats_interval: float = 10.0,
+        transport: str = "pubsub",
+        stream_maxlen: int = 10000,
+        redis_client: Optional[Any] = None,
+        encoding: str = ENCODING_JSON,
+        portfolio_interval: float = 1.0,
     ):
         """
         Initialize Broadcaster
@@ -49,12 +76,51 @@ class Broadcaster:
             redis_url: Redis connection URL
             redis_channel: Redis channel name for publishing
             aggregator: DataAggregatorService instance (creates default if None)
+            delta_mode: Publish keyframe/merge-patch envelopes instead of full snapshots
+            keyframe_interval: In delta mode, publish a full keyframe every N ticks
+            overrun_policy: What to do when a tick overruns its slot ("skip" or "catch-up")
+            stats_interval: Seconds between timing reports (0 disables them)
+            transport: "pubsub", "stream" (capped Redis Stream + latest snapshot) or "both"
+            stream_maxlen: Approximate number of frames retained in the stream
+            redis_client: Pre-built client (e.g. InMemoryRedis); skips connecting to redis_url
+            encoding: Frame encoding ("json", "msgpack" or "struct", see nexus_engine.codec)
+            portfolio_interval: Minimum seconds between portfolio P&L writes
         """
+        check_encoding(encoding)
+        if transport not in ("pubsub", "stream", "both"):
+            raise ValueError(f"Unknown transport: {transport}")
         self.redis_url = redis_url
         self.redis_channel = redis_channel
-        self.redis_client: Optional[redis.Redis] = None
+        self.redis_client: Optional[Any] = redis_client
+        self.transport = transport
+        self.stream_maxlen = stream_maxlen
+        self.encoding = encoding
+        self.writer: Optional[FrameStreamWriter] = None
+        # Alerts registered through core-api; loaded in full once, then drained per tick
+        self.alert_registry: Optional[RedisRegistry] = None
+        self._alerts_loaded = False
+        # Positions set through core-api, synced the same way
+        self.positions_registry: Optional[RedisRegistry] = None
+        self._positions_loaded = False
         self.aggregator = aggregator or self._create_default_aggregator()
         self.running = False
+        self.delta_encoder = DeltaEncoder(keyframe_interval=keyframe_interval) if delta_mode else None
+        self.bytes_published = 0
+        # Correlation matrix version last written to Redis
+        self._correlation_version = 0
+        self._portfolio_version = 0
+        self.portfolio_interval = portfolio_interval
+        self._next_portfolio_write = 0.0
+        self._portfolios_written = False
+        self.overrun_policy = overrun_policy
+        self.stats_interval = stats_interval
+        self.ticker: Optional[FixedRateTicker] = None
+        self.phase_timers = {
+            "aggregate": PhaseTimer(),
+            "serialize": PhaseTimer(),
+            "publish": PhaseTimer(),
+            "tick": PhaseTimer(),
+        }
     
     def _create_default_aggregator(self) -> DataAggregatorService:
         """Create default aggregator with environment variable configuration"""
@@ -72,11 +138,30 @@ class Broadcaster:
             # Blockchain - uses Public Ethereum RPC endpoints
             rpc_url=os.getenv("BLOCKCHAIN_RPC_URL"),
             rpc_key=os.getenv("BLOCKCHAIN_RPC_KEY"),
+            networks=os.getenv("BLOCKCHAIN_NETWORKS", "ethereum").split(","),
             # User Activity
             db_url=os.getenv("DB_URL"),
             db_credentials=self._parse_db_credentials(),
+            # Background refresh cadence per source
+            refresh_intervals=self._parse_refresh_intervals(),
+            # Rolling correlation across the market symbols
+            correlation_window=int(os.getenv("CORRELATION_WINDOW", "300")),
         )
     
+    def _parse_refresh_intervals(self) -> Optional[dict]:
+        """Parse REFRESH_INTERVALS ("name=seconds,...") from the environment"""
+        value = os.getenv("REFRESH_INTERVALS")
+        if not value:
+            return None
+        intervals = {}
+        for item in value.split(","):
+            name, _, seconds = item.partition("=")
+            try:
+                intervals[name.strip()] = float(seconds)
+            except ValueError:
+                print(f"✗ Ignoring invalid REFRESH_INTERVALS entry: {item!r}")
+        return intervals
+    
     def _parse_db_credentials(self) -> Optional[dict]:
         """Parse database credentials from environment variables"""
         db_user = os.getenv("DB_USER")
@@ -94,16 +179,26 @@ class Broadcaster:
     async def connect(self) -> None:
         """Connect to Redis"""
         try:
-            self.redis_client = await redis.from_url(
-                self.redis_url,
-                decode_responses=False  # We'll encode JSON ourselves
-            )
+            if self.redis_client is None:
+                self.redis_client = await redis.from_url(
+                    self.redis_url,
+                    decode_responses=False  # We'll encode JSON ourselves
+                )
             # Test connection
             await self.redis_client.ping()
             print(f"✓ Connected to Redis at {self.redis_url}")
         except Exception as e:
             print(f"✗ Failed to connect to Redis: {e}")
             raise
+        self.writer = FrameStreamWriter(
+            self.redis_client,
+            channel=self.redis_channel,
+            maxlen=self.stream_maxlen,
+            use_stream=self.transport in ("stream", "both"),
+            use_pubsub=self.transport in ("pubsub", "both"),
+        )
+        self.alert_registry = RedisRegistry(self.redis_client, alerts_registry_key(self.redis_channel))
+        self.positions_registry = RedisRegistry(self.redis_client, positions_registry_key(self.redis_channel))
     
     async def disconnect(self) -> None:
         """Disconnect from Redis"""
@@ -111,49 +206,325 @@ class Broadcaster:
             await self.redis_client.close()
             print("✓ Disconnected from Redis")
     
-    async def publish(self, data: dict) -> None:
+    def _encode(self, data: dict) -> Optional[Tuple[Union[str, bytes], bool]]:
+        """Return (payload, is_self_contained) for a snapshot, or None to skip it"""
+        keyframe = True
+        if self.delta_encoder is not None:
+            data = self.delta_encoder.encode(data)
+            if data is None:
+                return None
+            keyframe = data["type"] == "keyframe"
+        
+        return encode_frame(data, self.encoding), keyframe
+    
+    def serialize(self, data: dict) -> Optional[Union[str, bytes]]:
         """
-        Publish aggregated data to Redis channel
+        Serialize aggregated data into the payload to publish
+        
+        In delta mode only the fields that changed since the previous frame are
+        encoded (as a JSON merge patch), and frames with no meaningful change
+        are skipped.
         
         Args:
             data: Aggregated data dictionary
+        
+        Returns:
+            Payload to publish, or None if the frame should be skipped
+        """
+        encoded = self._encode(data)
+        return encoded[0] if encoded else None
+    
+    async def publish_payload(self, payload: Union[str, bytes], keyframe: bool = True) -> None:
         """
-        if not self.redis_client:
+        Publish an already serialized payload
+        
+        Depending on the transport the frame is published to the channel and/or
+        appended to the capped stream (updating the latest snapshot for
+        self-contained frames), all in one pipelined round trip.
+        
+        Args:
+            payload: Serialized frame
+            keyframe: Whether the frame is a full snapshot or keyframe
+        """
+        if not self.redis_client or not self.writer:
             raise RuntimeError("Redis client not connected")
         
-        # Serialize to JSON
-        json_data = json.dumps(data, default=str)
+        await self.writer.write(payload, keyframe=keyframe)
+        self.bytes_published += len(payload)
+    
+    async def publish_correlation(self) -> bool:
+        """
+        Store the correlation matrix in Redis if it gained a sample
+        
+        The matrix is too large for every frame, so it is kept as one binary
+        value (see nexus_engine.correlation) under "<channel>:correlation",
+        rewritten once per sample rather than once per tick.
+        
+        Returns:
+            bool: True if a new matrix was written
+        """
+        correlation = self.aggregator.correlation
+        if correlation.version == self._correlation_version or correlation.samples < 2:
+            return False
+        payload = correlation.encode(int(time.time() * 1000))
+        await self.redis_client.set(correlation_key(self.redis_channel), payload)
+        self._correlation_version = correlation.version
+        self.bytes_published += len(payload)
+        return True
+    
+    async def sync_alerts(self) -> int:
+        """
+        Apply the alert registrations made through core-api
+        
+        The first call registers every alert in the registry hash; later
+        calls apply only the queued changes. Records the engine cannot
+        register are dropped from the registry, and records whose direction
+        or reference the engine resolved are stored back.
+        
+        Returns:
+            int: Changes applied
+        """
+        if self.alert_registry is None:
+            return 0
+        alerts = self.aggregator.alerts
+        if self._alerts_loaded:
+            changes = await self.alert_registry.drain()
+        else:
+            records = await self.alert_registry.load()
+            changes = [{"op": OP_PUT, "key": key, "record": record} for key, record in records.items()]
+            self._alerts_loaded = True
+        resolved, rejected = {}, []
+        for change in changes:
+            key = change["key"]
+            if change["op"] == OP_DELETE:
+                alerts.unregister(key)
+                continue
+            try:
+                record = alerts.register(key, change["record"])
+            except ValueError as e:
+                print(f"✗ Rejected alert {key}: {e}")
+                rejected.append(key)
+                continue
+            if record != change["record"]:
+                resolved[key] = record
+        await self.alert_registry.store(resolved, rejected)
+        return len(changes)
+    
+    async def publish_alerts(self) -> int:
+        """
+        Publish the alerts fired since the last tick
+        
+        All of them go out as one JSON array message on "<channel>:alerts".
+        Registered alerts that fired are one-shot and leave the registry.
+        
+        Returns:
+            int: Bytes published (0 if nothing fired)
+        """
+        alerts = self.aggregator.alerts
+        if self.alert_registry is not None:
+            await self.alert_registry.store(removed=alerts.take_retired())
+        payload = alerts.drain_json()
+        if payload is None:
+            return 0
+        await self.redis_client.publish(alerts_channel(self.redis_channel), payload)
+        self.bytes_published += len(payload)
+        return len(payload)
+    
+    async def sync_positions(self) -> int:
+        """
+        Apply the positions set through core-api
+        
+        The first call loads every user's positions from the registry hash;
+        later calls apply only the queued changes. Each record replaces the
+        user's whole portfolio (a deleted record closes it). Records holding
+        a symbol outside the tracked market symbols are dropped from the
+        registry: that symbol would never be priced, so its cost basis would
+        count at a market value of zero.
+        
+        Returns:
+            int: Users whose positions changed
+        """
+        if self.positions_registry is None:
+            return 0
+        if self._positions_loaded:
+            changes = await self.positions_registry.drain()
+        else:
+            records = await self.positions_registry.load()
+            changes = [{"op": OP_PUT, "key": key, "record": record} for key, record in records.items()]
+            self._positions_loaded = True
+        tracked = set(self.aggregator.market_stream.symbols)
+        portfolios, rejected = {}, []
+        for change in changes:
+            user_id = change["key"]
+            if change["op"] == OP_DELETE:
+                portfolios[user_id] = {}
+                continue
+            try:
+                positions = {
+                    symbol: (float(quantity), float(average_price))
+                    for symbol, (quantity, average_price) in change["record"]["positions"].items()
+                }
+                untracked = set(positions) - tracked
+                if untracked:
+                    raise ValueError(f"untracked symbols {sorted(untracked)}")
+                portfolios[user_id] = positions
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"✗ Rejected positions of {user_id}: {e}")
+                rejected.append(user_id)
+        self.aggregator.portfolios.set_portfolios(portfolios)
+        await self.positions_registry.store(removed=rejected)
+        return len(portfolios)
+    
+    async def publish_portfolios(self) -> int:
+        """
+        Write the portfolio P&L records revalued since the last write
+        
+        The records are one packed value under "<channel>:portfolios" (see
+        nexus_engine.portfolio). Only the changed records are written, with
+        SETRANGE at their offsets, together with the header and the new
+        users of the "<channel>:portfolios:index" hash in one MULTI/EXEC
+        round trip, so readers (HGET + GETRANGE) never see a header that does
+        not match the records. The first write of a run replaces the value
+        and the index, as record order is not kept across restarts. Writes
+        happen at most once per portfolio_interval.
         
-        # Publish to Redis channel
-        await self.redis_client.publish(self.redis_channel, json_data)
+        Returns:
+            int: Bytes written (0 if nothing was due)
+        """
+        portfolios = self.aggregator.portfolios
+        if portfolios.version == self._portfolio_version or not len(portfolios):
+            return 0
+        now = time.monotonic()
+        if now < self._next_portfolio_write:
+            return 0
+        self._next_portfolio_write = now + self.portfolio_interval
+        records_key, index_key = portfolio_keys(self.redis_channel)
+        # Record order is per run: the first write replaces the value and the index
+        first = not self._portfolios_written
+        ranges = portfolios.encode_updates(int(time.time() * 1000), full=first)
+        pipe = self.redis_client.pipeline(transaction=True)
+        if first:
+            pipe.delete(index_key)
+        new_users = portfolios.new_users()
+        if new_users:
+            pipe.hset(index_key, mapping=new_users)
+        if first:
+            pipe.set(records_key, ranges[0][1])
+        else:
+            for offset, chunk in ranges:
+                pipe.setrange(records_key, offset, chunk)
+        await pipe.execute()
+        self._portfolios_written = True
+        self._portfolio_version = portfolios.version
+        written = sum(len(chunk) for _, chunk in ranges)
+        self.bytes_published += written
+        return written
+    
+    async def publish(self, data: dict) -> bool:
+        """
+        Publish aggregated data to Redis channel
+        
+        Args:
+            data: Aggregated data dictionary
+        
+        Returns:
+            bool: True if a frame was published, False if it was skipped
+        """
+        encoded = self._encode(data)
+        if encoded is None:
+            return False
+        await self.publish_payload(*encoded)
+        return True
+    
+    async def tick(self) -> None:
+        """Aggregate, serialize and publish one frame, timing each phase"""
+        started = time.perf_counter()
+        
+        # Aggregate data from all sources
+        aggregated_data = await self.aggregator.aggregate()
+        aggregated = time.perf_counter()
+        
+        # Serialize: full JSON snapshots go straight from the model to bytes;
+        # deltas and binary encodings need the dict form
+        if self.delta_encoder is None and self.encoding == ENCODING_JSON:
+            encoded = (aggregated_data.to_json_bytes(), True)
+        else:
+            encoded = self._encode(aggregated_data.model_dump())
+        serialized = time.perf_counter()
+        
+        # Publish to Redis
+        if encoded is not None:
+            await self.publish_payload(*encoded)
+        await self.publish_correlation()
+        await self.sync_alerts()
+        await self.publish_alerts()
+        await self.sync_positions()
+        await self.publish_portfolios()
+        published = time.perf_counter()
+        
+        self.phase_timers["aggregate"].record(aggregated - started)
+        self.phase_timers["serialize"].record(serialized - aggregated)
+        self.phase_timers["publish"].record(published - serialized)
+        self.phase_timers["tick"].record(published - started)
+    
+    def stats(self) -> dict:
+        """Return tick rate, overrun and per-phase timing statistics (milliseconds)"""
+        stats = self.ticker.stats() if self.ticker else {}
+        stats["phases_ms"] = {name: timer.stats() for name, timer in self.phase_timers.items()}
+        stats["bytes_published"] = self.bytes_published
+        stats["encoding"] = self.encoding
+        if self.delta_encoder is not None:
+            stats["delta"] = dict(self.delta_encoder.stats)
+        stats["http"] = self.aggregator.transport.stats()
+        stats["engine"] = self.aggregator.engine.stats()
+        stats["correlation"] = {
+            "symbols": len(self.aggregator.correlation.symbols),
+            "samples": self.aggregator.correlation.samples,
+            "version": self.aggregator.correlation.version,
+        }
+        stats["alerts"] = dict(self.aggregator.alerts.stats, live=len(self.aggregator.alerts))
+        stats["portfolios"] = dict(self.aggregator.portfolios.stats, users=len(self.aggregator.portfolios))
+        return stats
+    
+    def _report(self) -> None:
+        """Print a one-line timing summary"""
+        stats = self.stats()
+        jitter = stats.get("jitter_ms", {})
+        tick = stats["phases_ms"]["tick"]
+        print(
+            f"· ticks={stats.get('ticks', 0)} overruns={stats.get('overruns', 0)} missed={stats.get('missed', 0)} "
+            f"jitter p50={jitter.get('p50', 0):.1f}ms p99={jitter.get('p99', 0):.1f}ms "
+            f"tick p50={tick['p50']:.1f}ms p99={tick['p99']:.1f}ms"
+        )
     
     async def run(self, interval_ms: int = 200) -> None:
         """
         Run broadcaster loop - aggregates and publishes every interval_ms
         
+        Ticks are scheduled at a fixed rate on the monotonic clock, so the
+        period does not drift by the time spent aggregating and publishing.
+        
         Args:
             interval_ms: Publishing interval in milliseconds
         """
         await self.aggregator.initialize()
         self.running = True
+        self.ticker = FixedRateTicker(interval_ms / 1000.0, overrun_policy=self.overrun_policy)
         
-        print(f"✓ Starting broadcaster (interval: {interval_ms}ms)")
-        print(f"✓ Publishing to channel: {self.redis_channel}")
+        print(f"✓ Starting broadcaster (interval: {interval_ms}ms, overrun policy: {self.overrun_policy})")
+        print(f"✓ Publishing to channel: {self.redis_channel} ({self.encoding} frames)")
         print("Press Ctrl+C to stop...")
         
+        next_report = time.monotonic() + self.stats_interval
         try:
             while self.running:
-                # Aggregate data from all sources
-                aggregated_data = await self.aggregator.aggregate()
+                # Wait for the next fixed-rate slot
+                await self.ticker.wait()
+                await self.tick()
                 
-                # Convert to dict for JSON serialization
-                data_dict = aggregated_data.model_dump()
-                
-                # Publish to Redis
-                await self.publish(data_dict)
-                
-                # Wait for next interval
-                await asyncio.sleep(interval_ms / 1000.0)
+                if self.stats_interval and time.monotonic() >= next_report:
+                    self._report()
+                    next_report += self.stats_interval
         
         except KeyboardInterrupt:
             print("\n✓ Shutting down...")
@@ -190,13 +561,62 @@ async def main():
         default=200,
         help="Publishing interval in milliseconds (default: 200)"
     )
+    parser.add_argument(
+        "--transport",
+        choices=["pubsub", "stream", "both"],
+        default=os.getenv("REDIS_TRANSPORT", "pubsub"),
+        help="Publish via pub/sub, a capped Redis Stream with replay, or both (default: pubsub)"
+    )
+    parser.add_argument(
+        "--stream-maxlen",
+        type=int,
+        default=int(os.getenv("REDIS_STREAM_MAXLEN", "10000")),
+        help="Approximate number of frames retained in the stream (default: 10000)"
+    )
+    parser.add_argument(
+        "--encoding",
+        choices=["json", "msgpack", "struct"],
+        default=os.getenv("FRAME_ENCODING", "json"),
+        help="Frame encoding: JSON text, msgpack, or struct-packed numerics (default: json)"
+    )
+    parser.add_argument(
+        "--overrun-policy",
+        choices=["skip", "catch-up"],
+        default=os.getenv("OVERRUN_POLICY", "skip"),
+        help="When a tick overruns its slot: skip missed ticks or catch up (default: skip)"
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        default=os.getenv("DELTA_MODE", "").lower() in ("1", "true", "yes"),
+        help="Publish merge-patch deltas with periodic keyframes instead of full snapshots"
+    )
+    parser.add_argument(
+        "--keyframe-interval",
+        type=int,
+        default=int(os.getenv("KEYFRAME_INTERVAL", "25")),
+        help="In delta mode, publish a full keyframe every N ticks (default: 25)"
+    )
+    parser.add_argument(
+        "--portfolio-interval",
+        type=float,
+        default=float(os.getenv("PORTFOLIO_INTERVAL", "1.0")),
+        help="Minimum seconds between portfolio P&L writes to Redis (default: 1.0)"
+    )
     
     args = parser.parse_args()
     
     # Create broadcaster
     broadcaster = Broadcaster(
         redis_url=args.redis_url,
-        redis_channel=args.redis_channel
+        redis_channel=args.redis_channel,
+        delta_mode=args.delta,
+        keyframe_interval=args.keyframe_interval,
+        overrun_policy=args.overrun_policy,
+        transport=args.transport,
+        stream_maxlen=args.stream_maxlen,
+        encoding=args.encoding,
+        portfolio_interval=args.portfolio_interval,
     )
     
     # Setup signal handlers
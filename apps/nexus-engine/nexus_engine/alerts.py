@@ -0,0 +1,454 @@
+"""Price alert engine - per-symbol sorted threshold indexes searched by bisection"""
+import json
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+ABOVE = 1   # Fires when the price rises to or through the level
+BELOW = -1  # Fires when the price falls to or through the level
+DIRECTIONS = {"above": ABOVE, "below": BELOW}
+_DIRECTION_NAMES = {ABOVE: "above", BELOW: "below"}
+
+KIND_PRICE = 0    # Absolute price level
+KIND_PERCENT = 1  # Percent move from the price when the alert was registered
+_KIND_NAMES = {KIND_PRICE: "price", KIND_PERCENT: "percent"}
+
+# An index is compacted once this share of its entries belongs to removed alerts
+COMPACT_RATIO = 0.25
+
+
+def alerts_channel(channel: str) -> str:
+    """Redis pub/sub channel fired alerts are published to"""
+    return f"{channel}:alerts"
+
+
+def alerts_registry_key(channel: str) -> str:
+    """Redis hash of the alerts registered through core-api (see nexus_engine.registry)"""
+    return f"{channel}:alerts:registry"
+
+
+class ThresholdIndex:
+    """
+    Alert levels of one symbol and direction, sorted for bisection
+
+    New levels are buffered and merged in on the next query. Removed and
+    fired alerts stay in the arrays as tombstones (filtered through the
+    engine's active mask) until they make up COMPACT_RATIO of the index.
+    """
+
+    __slots__ = ("levels", "ids", "_pending_levels", "_pending_ids", "dead")
+
+    def __init__(self):
+        self.levels = np.empty(0, dtype=np.float64)
+        self.ids = np.empty(0, dtype=np.int64)
+        self._pending_levels: List[np.ndarray] = []
+        self._pending_ids: List[np.ndarray] = []
+        self.dead = 0
+
+    def __len__(self) -> int:
+        return len(self.levels) + sum(len(ids) for ids in self._pending_ids)
+
+    def add(self, levels: np.ndarray, ids: np.ndarray) -> None:
+        self._pending_levels.append(levels)
+        self._pending_ids.append(ids)
+
+    def _merge(self) -> None:
+        """Insert buffered levels: O(n + k log k) for k new levels"""
+        levels = np.concatenate(self._pending_levels)
+        ids = np.concatenate(self._pending_ids)
+        self._pending_levels.clear()
+        self._pending_ids.clear()
+        order = np.argsort(levels, kind="stable")
+        levels, ids = levels[order], ids[order]
+        if not len(self.levels):
+            self.levels, self.ids = levels, ids
+            return
+        positions = np.searchsorted(self.levels, levels, side="right")
+        self.levels = np.insert(self.levels, positions, levels)
+        self.ids = np.insert(self.ids, positions, ids)
+
+    def crossed(self, low: float, high: float, include_low: bool) -> np.ndarray:
+        """
+        Alert ids (live or not) with a level in the price interval
+
+        Args:
+            low: Lower bound of the move
+            high: Upper bound of the move
+            include_low: Interval is [low, high) instead of (low, high]
+        """
+        if self._pending_ids:
+            self._merge()
+        side = "left" if include_low else "right"
+        start = np.searchsorted(self.levels, low, side=side)
+        end = np.searchsorted(self.levels, high, side=side)
+        return self.ids[start:end]
+
+    def compact(self, active: np.ndarray) -> None:
+        """Drop tombstones if enough have accumulated"""
+        if self.dead <= len(self.levels) * COMPACT_RATIO:
+            return
+        if self._pending_ids:
+            self._merge()
+        keep = active[self.ids]
+        self.levels = self.levels[keep]
+        self.ids = self.ids[keep]
+        self.dead = 0
+
+
+class AlertEngine:
+    """
+    One-shot price-crossing and percent-move alerts for many users and symbols
+
+    Every alert is reduced to a level and a direction: a percent move of
+    ``p`` from the reference price fires at ``reference * (1 + p / 100)``.
+    Each symbol keeps one sorted ThresholdIndex per direction, so a tick
+    from ``previous`` to ``price`` finds the alerts it crossed by bisecting
+    for both prices: O(log n + fired) per tick instead of checking every
+    rule. Per-alert fields are stored column-wise in NumPy arrays indexed
+    by alert id.
+
+    Fired alerts are queued as events; ``drain()`` returns them for
+    publishing (the broadcaster sends them to ``alerts_channel()``).
+    Alerts registered through core-api carry a registration key
+    (``register()``/``unregister()``) that is echoed in their events.
+    """
+
+    def __init__(self, capacity: int = 1024, max_pending: int = 100000):
+        """
+        Initialize Alert Engine
+
+        Args:
+            capacity: Alerts preallocated (grows by doubling)
+            max_pending: Fired alerts kept for drain(); the oldest are dropped beyond this
+        """
+        self.capacity = max(capacity, 1)
+        self.size = 0  # Alert ids ever assigned
+        self.active = np.zeros(self.capacity, dtype=bool)
+        self.levels = np.zeros(self.capacity, dtype=np.float64)
+        self.references = np.full(self.capacity, np.nan)
+        self.directions = np.zeros(self.capacity, dtype=np.int8)
+        self.kinds = np.zeros(self.capacity, dtype=np.int8)
+        self.symbol_rows = np.zeros(self.capacity, dtype=np.int32)
+        self.user_ids: List[str] = []
+        self.symbols: List[str] = []
+        self._symbol_rows: Dict[str, int] = {}
+        self._indexes: Dict[Tuple[int, int], ThresholdIndex] = {}
+        self._keys: Dict[int, str] = {}  # alert id -> registration key
+        self._ids: Dict[str, int] = {}   # registration key -> live alert id
+        self._retired: List[str] = []    # Keys of registered alerts that fired since take_retired()
+        self.last_prices: Dict[str, float] = {}
+        self.max_pending = max_pending
+        # (ids, symbol, price, previous price, epoch seconds) per evaluation that fired
+        self._pending: Deque[Tuple[np.ndarray, str, float, float, float]] = deque()
+        self._pending_count = 0
+        self.stats = {"registered": 0, "removed": 0, "ticks": 0, "fired": 0, "dropped": 0}
+
+    def __len__(self) -> int:
+        """Live (registered, not fired or removed) alerts"""
+        return self.stats["registered"] - self.stats["removed"] - self.stats["fired"]
+
+    def _grow(self, needed: int) -> None:
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        extra = capacity - self.capacity
+        self.active = np.concatenate((self.active, np.zeros(extra, dtype=bool)))
+        self.levels = np.concatenate((self.levels, np.zeros(extra)))
+        self.references = np.concatenate((self.references, np.full(extra, np.nan)))
+        self.directions = np.concatenate((self.directions, np.zeros(extra, dtype=np.int8)))
+        self.kinds = np.concatenate((self.kinds, np.zeros(extra, dtype=np.int8)))
+        self.symbol_rows = np.concatenate((self.symbol_rows, np.zeros(extra, dtype=np.int32)))
+        self.capacity = capacity
+
+    def _symbol_row(self, symbol: str) -> int:
+        row = self._symbol_rows.get(symbol)
+        if row is None:
+            row = self._symbol_rows[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return row
+
+    def _index(self, row: int, direction: int) -> ThresholdIndex:
+        index = self._indexes.get((row, direction))
+        if index is None:
+            index = self._indexes[(row, direction)] = ThresholdIndex()
+        return index
+
+    def add_many(
+        self,
+        user_ids: Union[str, Sequence[str]],
+        symbol: str,
+        levels: Sequence[float],
+        directions: Union[None, str, Sequence[str]] = None,
+        kind: int = KIND_PRICE,
+        references: Optional[Sequence[float]] = None,
+    ) -> np.ndarray:
+        """
+        Register price-crossing alerts of one symbol in bulk
+
+        Args:
+            user_ids: Owner per alert, or one owner for all
+            symbol: Trading symbol
+            levels: Price level per alert
+            directions: "above"/"below" per alert or for all (default: the side
+                of the last price each level lies on)
+            kind: KIND_PRICE or KIND_PERCENT (how the level was derived)
+            references: Reference price per alert (percent alerts)
+
+        Returns:
+            np.ndarray: Alert ids
+
+        Raises:
+            ValueError: If a direction is unknown, or must be inferred before
+                the symbol has a price
+        """
+        levels = np.asarray(levels, dtype=np.float64)
+        count = len(levels)
+        if directions is None:
+            last = self.last_prices.get(symbol)
+            if last is None:
+                raise ValueError(f"No price for {symbol} yet; give the alert direction")
+            signs = np.where(levels > last, ABOVE, BELOW).astype(np.int8)
+        elif isinstance(directions, str):
+            if directions not in DIRECTIONS:
+                raise ValueError(f"Unknown alert direction: {directions}")
+            signs = np.full(count, DIRECTIONS[directions], dtype=np.int8)
+        else:
+            try:
+                signs = np.array([DIRECTIONS[d] for d in directions], dtype=np.int8)
+            except KeyError as e:
+                raise ValueError(f"Unknown alert direction: {e.args[0]}")
+        if self.size + count > self.capacity:
+            self._grow(self.size + count)
+
+        ids = np.arange(self.size, self.size + count, dtype=np.int64)
+        row = self._symbol_row(symbol)
+        self.active[ids] = True
+        self.levels[ids] = levels
+        self.directions[ids] = signs
+        self.kinds[ids] = kind
+        self.symbol_rows[ids] = row
+        if references is not None:
+            self.references[ids] = references
+        if isinstance(user_ids, str):
+            self.user_ids.extend([user_ids] * count)
+        else:
+            self.user_ids.extend(user_ids)
+        for direction in (ABOVE, BELOW):
+            selected = signs == direction
+            if selected.any():
+                self._index(row, direction).add(levels[selected], ids[selected])
+        self.size += count
+        self.stats["registered"] += count
+        return ids
+
+    def add_price_alert(self, user_id: str, symbol: str, level: float, direction: Optional[str] = None) -> int:
+        """
+        Register one price-crossing alert
+
+        Args:
+            user_id: Owner
+            symbol: Trading symbol
+            level: Price that triggers the alert
+            direction: "above" or "below" (default: inferred from the last price)
+
+        Returns:
+            int: Alert id
+        """
+        return int(self.add_many(user_id, symbol, [level], direction)[0])
+
+    def add_percent_alert(self, user_id: str, symbol: str, percent: float, reference: Optional[float] = None) -> int:
+        """
+        Register one percent-move alert
+
+        Args:
+            user_id: Owner
+            symbol: Trading symbol
+            percent: Move that triggers the alert (e.g. 5 or -3)
+            reference: Price the move is measured from (default: the last price)
+
+        Returns:
+            int: Alert id
+
+        Raises:
+            ValueError: If there is no reference price
+        """
+        reference = self.last_prices.get(symbol) if reference is None else reference
+        if not reference:
+            raise ValueError(f"No price for {symbol} yet; give a reference price")
+        level = reference * (1 + percent / 100)
+        direction = "above" if percent > 0 else "below"
+        return int(self.add_many(user_id, symbol, [level], direction, KIND_PERCENT, [reference])[0])
+
+    def register(self, key: str, record: dict) -> dict:
+        """
+        Register an alert from a registration record, once per key
+
+        Registering a key that is already live is a no-op, so replayed
+        records are safe.
+
+        Args:
+            key: Registration key
+            record: user_id, symbol, kind ("price" or "percent"), then
+                level and optional direction, or percent and optional reference
+
+        Returns:
+            dict: The record with its direction or reference resolved, to be
+            stored back so a restart recreates the same level
+
+        Raises:
+            ValueError: If the record is incomplete or cannot be resolved yet
+        """
+        if key in self._ids:
+            return record
+        try:
+            user_id, symbol, kind = record["user_id"], record["symbol"], record.get("kind", "price")
+            if kind == "price":
+                alert_id = self.add_price_alert(user_id, symbol, float(record["level"]), record.get("direction"))
+                resolved = {**record, "direction": _DIRECTION_NAMES[int(self.directions[alert_id])]}
+            elif kind == "percent":
+                alert_id = self.add_percent_alert(user_id, symbol, float(record["percent"]), record.get("reference"))
+                resolved = {**record, "reference": float(self.references[alert_id])}
+            else:
+                raise ValueError(f"Unknown alert kind: {kind}")
+        except KeyError as e:
+            raise ValueError(f"Alert record without {e.args[0]}")
+        self._ids[key] = alert_id
+        self._keys[alert_id] = key
+        return resolved
+
+    def take_retired(self) -> List[str]:
+        """Registration keys of the alerts that fired since the previous call"""
+        retired, self._retired = self._retired, []
+        return retired
+
+    def unregister(self, key: str) -> bool:
+        """Cancel a registered alert; returns False if it is not live"""
+        alert_id = self._ids.pop(key, None)
+        if alert_id is None:
+            return False
+        self._keys.pop(alert_id, None)
+        return self.remove(alert_id)
+
+    def remove(self, alert_id: int) -> bool:
+        """Cancel an alert; returns False if it already fired or was removed"""
+        if not 0 <= alert_id < self.size or not self.active[alert_id]:
+            return False
+        self.active[alert_id] = False
+        index = self._indexes[(int(self.symbol_rows[alert_id]), int(self.directions[alert_id]))]
+        index.dead += 1
+        index.compact(self.active)
+        self.stats["removed"] += 1
+        return True
+
+    def evaluate(self, symbol: str, price: float, ts: Optional[float] = None) -> np.ndarray:
+        """
+        Fire the alerts a move to ``price`` crossed
+
+        A rise fires "above" alerts with previous < level <= price, a fall
+        fires "below" alerts with price <= level < previous. The first price
+        of a symbol only sets its reference.
+
+        Args:
+            symbol: Trading symbol
+            price: Latest price
+            ts: Epoch seconds of the price (default: now)
+
+        Returns:
+            np.ndarray: Ids of the alerts that fired
+        """
+        previous = self.last_prices.get(symbol)
+        self.last_prices[symbol] = price
+        self.stats["ticks"] += 1
+        row = self._symbol_rows.get(symbol)
+        if previous is None or row is None or price == previous:
+            return np.empty(0, dtype=np.int64)
+        if price > previous:
+            index = self._indexes.get((row, ABOVE))
+            candidates = index.crossed(previous, price, include_low=False) if index else None
+        else:
+            index = self._indexes.get((row, BELOW))
+            candidates = index.crossed(price, previous, include_low=True) if index else None
+        if candidates is None or not len(candidates):
+            return np.empty(0, dtype=np.int64)
+        fired = candidates[self.active[candidates]]
+        if not len(fired):
+            return fired
+        # One-shot: fired alerts become tombstones in their index
+        self.active[fired] = False
+        index.dead += len(fired)
+        index.compact(self.active)
+        self.stats["fired"] += len(fired)
+        if self._keys:
+            for alert_id in fired.tolist():
+                key = self._keys.get(alert_id)
+                if key is not None:
+                    del self._ids[key]
+                    self._retired.append(key)
+        self._queue(fired, symbol, price, previous, time.time() if ts is None else ts)
+        return fired
+
+    def evaluate_batch(self, prices: Dict[str, float], ts: Optional[float] = None) -> int:
+        """
+        Evaluate one price per symbol
+
+        Returns:
+            int: Number of alerts that fired
+        """
+        return sum(len(self.evaluate(symbol, price, ts)) for symbol, price in prices.items())
+
+    def _queue(self, ids: np.ndarray, symbol: str, price: float, previous: float, ts: float) -> None:
+        self._pending.append((ids, symbol, price, previous, ts))
+        self._pending_count += len(ids)
+        while self._pending_count > self.max_pending and len(self._pending) > 1:
+            dropped = self._pending.popleft()
+            for alert_id in dropped[0].tolist():
+                self._keys.pop(alert_id, None)
+            self._pending_count -= len(dropped[0])
+            self.stats["dropped"] += len(dropped[0])
+
+    def drain(self) -> List[dict]:
+        """
+        Take the queued fired alerts as event dicts
+
+        Returns:
+            list: alert_id, key (registration key or None), user_id, symbol,
+            kind, direction, level, reference, price, previous_price and
+            triggered_at (ISO 8601 UTC) per alert
+        """
+        events = []
+        while self._pending:
+            ids, symbol, price, previous, ts = self._pending.popleft()
+            triggered_at = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(ts)) + f".{int(ts % 1 * 1e6):06d}"
+            levels = self.levels[ids].tolist()
+            references = self.references[ids].tolist()
+            for alert_id, level, reference, direction, kind in zip(
+                ids.tolist(), levels, references, self.directions[ids].tolist(), self.kinds[ids].tolist()
+            ):
+                events.append({
+                    "alert_id": alert_id,
+                    "key": self._keys.pop(alert_id, None),
+                    "user_id": self.user_ids[alert_id],
+                    "symbol": symbol,
+                    "kind": _KIND_NAMES[kind],
+                    "direction": _DIRECTION_NAMES[direction],
+                    "level": level,
+                    "reference": None if reference != reference else reference,
+                    "price": price,
+                    "previous_price": previous,
+                    "triggered_at": triggered_at,
+                })
+        self._pending_count = 0
+        return events
+
+    def drain_json(self) -> Optional[bytes]:
+        """Queued fired alerts as one JSON array message, or None if nothing fired"""
+        events = self.drain()
+        return json.dumps(events, separators=(",", ":")).encode() if events else None
+
+    def alerts_of(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Live alerts per symbol"""
+        names = self.symbols if symbols is None else [s for s in symbols if s in self._symbol_rows]
+        live = np.bincount(self.symbol_rows[:self.size][self.active[:self.size]], minlength=len(self.symbols))
+        return {name: int(live[self._symbol_rows[name]]) for name in names}
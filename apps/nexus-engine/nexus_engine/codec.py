@@ -0,0 +1,297 @@
+"""Wire encodings for broadcaster frames (JSON, msgpack and fixed-layout struct)"""
+import json
+import struct
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import msgpack
+except ImportError:  # optional dependency: pip install nexus-engine[msgpack]
+    msgpack = None
+
+from .models.aggregated_data import AggregatedData
+
+
+ENCODING_JSON = "json"
+ENCODING_MSGPACK = "msgpack"
+ENCODING_STRUCT = "struct"
+ENCODINGS = (ENCODING_JSON, ENCODING_MSGPACK, ENCODING_STRUCT)
+
+MAGIC = b"TV"
+# magic, encoding id, schema version (major, minor, patch)
+HEADER = struct.Struct("<2sBBBB")
+_ENCODING_IDS = {ENCODING_MSGPACK: 1, ENCODING_STRUCT: 2}
+_ENCODING_NAMES = {v: k for k, v in _ENCODING_IDS.items()}
+
+SCHEMA_VERSION: str = AggregatedData.model_fields["version"].default
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MS = timedelta(milliseconds=1)
+
+# Numeric fields packed into the fixed block of struct frames, in order.
+# "t" marks a timestamp sent as epoch milliseconds (int64).
+STRUCT_FIELDS: Tuple[Tuple[str, str, str], ...] = (
+    ("market_stream", "price", "d"),
+    ("market_stream", "volume", "d"),
+    ("market_stream", "change_24h", "d"),
+    ("market_stream", "timestamp", "t"),
+    ("macro_econ", "gdp_growth", "d"),
+    ("macro_econ", "inflation_rate", "d"),
+    ("macro_econ", "unemployment_rate", "d"),
+    ("macro_econ", "interest_rate", "d"),
+    ("macro_econ", "timestamp", "t"),
+    ("news_sentiment", "sentiment_score", "d"),
+    ("news_sentiment", "article_count", "q"),
+    ("news_sentiment", "timestamp", "t"),
+    ("blockchain", "block_height", "q"),
+    ("blockchain", "transaction_count", "q"),
+    ("blockchain", "gas_price", "d"),
+    ("blockchain", "hash_rate", "d"),
+    ("blockchain", "timestamp", "t"),
+    ("user_activity", "active_users", "q"),
+    ("user_activity", "transactions_24h", "q"),
+    ("user_activity", "total_volume_24h", "d"),
+    ("user_activity", "timestamp", "t"),
+    ("", "aggregated_at", "t"),
+)
+# kind | tail flags, bitmask of packed fields, then the values
+_STRUCT_PREFIX = struct.Struct("<BI")
+_STRUCT_BLOCK = struct.Struct("<" + "".join("q" if kind == "t" else kind for _, _, kind in STRUCT_FIELDS))
+
+_KIND_SNAPSHOT = 0
+_KIND_KEYFRAME = 1
+_KIND_ENVELOPE = 2
+_TAIL_MSGPACK = 0x80
+
+
+class CodecError(ValueError):
+    """Raised for frames that cannot be decoded"""
+
+
+def _parse_version(version: str) -> Tuple[int, int, int]:
+    parts = [int(p) if p.isdigit() else 0 for p in str(version).split(".")[:3]]
+    return tuple(parts + [0] * (3 - len(parts)))  # type: ignore[return-value]
+
+
+def to_epoch_ms(value: Union[datetime, str]) -> int:
+    """Convert a datetime (naive = UTC) or ISO string to epoch milliseconds"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _MS
+
+
+def from_epoch_ms(value: int) -> str:
+    """Convert epoch milliseconds to a naive-UTC ISO string (as model_dump_json emits)"""
+    return (_EPOCH + value * _MS).replace(tzinfo=None).isoformat()
+
+
+def _is_timestamp_key(key: Any) -> bool:
+    return isinstance(key, str) and (key == "timestamp" or key.endswith("_at"))
+
+
+def _default(value: Any) -> Any:
+    """Serializer hook: datetimes become epoch milliseconds"""
+    if isinstance(value, datetime):
+        return to_epoch_ms(value)
+    return str(value)
+
+
+def _restore_timestamps(value: Any) -> Any:
+    """Turn epoch-millisecond timestamp fields back into ISO strings (in place)"""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if _is_timestamp_key(key) and isinstance(item, int) and not isinstance(item, bool):
+                value[key] = from_epoch_ms(item)
+            else:
+                _restore_timestamps(item)
+    elif isinstance(value, list):
+        for item in value:
+            _restore_timestamps(item)
+    return value
+
+
+def check_encoding(encoding: str) -> None:
+    """Raise if ``encoding`` is unknown or its dependency is missing"""
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown frame encoding: {encoding}")
+    if encoding == ENCODING_MSGPACK and msgpack is None:
+        raise RuntimeError("msgpack encoding requires the msgpack package")
+
+
+def _dump_tail(value: Any) -> Tuple[bytes, bool]:
+    if msgpack is not None:
+        return msgpack.packb(value, default=_default, use_bin_type=True), True
+    return json.dumps(value, default=_default, separators=(",", ":")).encode(), False
+
+
+def _load_tail(raw: bytes, is_msgpack: bool) -> Any:
+    if is_msgpack:
+        if msgpack is None:
+            raise CodecError("Frame requires the msgpack package")
+        return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+    return json.loads(raw)
+
+
+def _schema_version(data: dict) -> str:
+    if data.get("type") == "keyframe" and isinstance(data.get("data"), dict):
+        data = data["data"]
+    return data.get("version") or SCHEMA_VERSION
+
+
+def _pack_snapshot(snapshot: dict) -> Tuple[int, bytes, dict]:
+    """Split a snapshot into (present mask, fixed block, remainder)"""
+    remainder = dict(snapshot)
+    copied = set()
+    mask = 0
+    values: List[Any] = []
+    for index, (section, field, kind) in enumerate(STRUCT_FIELDS):
+        container = remainder
+        if section:
+            container = remainder.get(section)
+            if isinstance(container, dict) and section not in copied:
+                container = remainder[section] = dict(container)
+                copied.add(section)
+        value = container.get(field) if isinstance(container, dict) else None
+        if value is None or isinstance(value, bool):
+            values.append(0.0 if kind == "d" else 0)
+            continue
+        try:
+            if kind == "t":
+                packed: Any = to_epoch_ms(value)
+            elif kind == "q":
+                packed = int(value)
+            else:
+                packed = float(value)
+        except (TypeError, ValueError):
+            values.append(0.0 if kind == "d" else 0)
+            continue
+        values.append(packed)
+        mask |= 1 << index
+        del container[field]
+    return mask, _STRUCT_BLOCK.pack(*values), remainder
+
+
+def _unpack_snapshot(mask: int, block: bytes, remainder: dict, timestamps: str) -> dict:
+    values = _STRUCT_BLOCK.unpack(block)
+    for index, (section, field, kind) in enumerate(STRUCT_FIELDS):
+        if not mask & (1 << index):
+            continue
+        value = values[index]
+        if kind == "t" and timestamps == "iso":
+            value = from_epoch_ms(value)
+        if section:
+            remainder.setdefault(section, {})[field] = value
+        else:
+            remainder[field] = value
+    return remainder
+
+
+def encode_frame(data: dict, encoding: str = ENCODING_JSON) -> Union[str, bytes]:
+    """
+    Encode a snapshot or delta envelope for publishing
+
+    ``json`` frames are plain JSON text (unchanged from the original format,
+    so existing subscribers keep working). Binary frames start with a 6-byte
+    header: ``b"TV"``, the encoding id and the schema version taken from
+    ``AggregatedData.version``. ``msgpack`` frames carry the whole document
+    with timestamps as epoch milliseconds. ``struct`` frames pack the numeric
+    fields of a snapshot into a fixed little-endian block and send the
+    remaining fields (symbols, keywords, sections, ...) as a small msgpack
+    tail (JSON if msgpack is not installed); delta envelopes are sent as a
+    tail only.
+
+    Args:
+        data: Snapshot (``AggregatedData.model_dump()``) or delta envelope
+        encoding: "json", "msgpack" or "struct"
+
+    Returns:
+        str for JSON, bytes for binary encodings
+    """
+    if encoding == ENCODING_JSON:
+        return json.dumps(data, default=str)
+    check_encoding(encoding)
+
+    major, minor, patch = _parse_version(_schema_version(data))
+    header = HEADER.pack(MAGIC, _ENCODING_IDS[encoding], major, minor, patch)
+    if encoding == ENCODING_MSGPACK:
+        return header + msgpack.packb(data, default=_default, use_bin_type=True)
+
+    kind = data.get("type")
+    if kind == "keyframe" and isinstance(data.get("data"), dict):
+        mask, block, remainder = _pack_snapshot(data["data"])
+        tail, is_msgpack = _dump_tail({**data, "data": remainder})
+        flags = _KIND_KEYFRAME
+    elif kind is None:
+        mask, block, remainder = _pack_snapshot(data)
+        tail, is_msgpack = _dump_tail(remainder)
+        flags = _KIND_SNAPSHOT
+    else:
+        mask, block = 0, b""
+        tail, is_msgpack = _dump_tail(data)
+        flags = _KIND_ENVELOPE
+    if is_msgpack:
+        flags |= _TAIL_MSGPACK
+    return header + _STRUCT_PREFIX.pack(flags, mask) + block + tail
+
+
+def frame_info(payload: Union[str, bytes]) -> Optional[Dict[str, Any]]:
+    """Return ``{"encoding", "schema_version"}`` for a binary frame (None for JSON)"""
+    if not isinstance(payload, (bytes, bytearray, memoryview)) or bytes(payload[:2]) != MAGIC:
+        return None
+    if len(payload) < HEADER.size:
+        raise CodecError("Truncated frame header")
+    _, encoding_id, major, minor, patch = HEADER.unpack_from(payload)
+    if encoding_id not in _ENCODING_NAMES:
+        raise CodecError(f"Unknown frame encoding id: {encoding_id}")
+    return {"encoding": _ENCODING_NAMES[encoding_id], "schema_version": f"{major}.{minor}.{patch}"}
+
+
+def decode_frame(payload: Union[str, bytes], timestamps: str = "iso") -> Any:
+    """
+    Decode a frame produced by ``encode_frame`` (any encoding)
+
+    Args:
+        payload: Frame as published
+        timestamps: "iso" to return timestamps as ISO strings (as JSON frames
+            carry them), "ms" to keep epoch milliseconds
+
+    Returns:
+        Decoded snapshot or delta envelope
+
+    Raises:
+        CodecError: If the frame is malformed or has an incompatible schema
+            major version
+    """
+    info = frame_info(payload)
+    if info is None:
+        try:
+            return json.loads(payload)
+        except ValueError as e:
+            raise CodecError(f"Invalid JSON frame: {e}") from e
+    if _parse_version(info["schema_version"])[0] != _parse_version(SCHEMA_VERSION)[0]:
+        raise CodecError(f"Unsupported schema version: {info['schema_version']}")
+
+    body = memoryview(payload)[HEADER.size:]
+    try:
+        if info["encoding"] == ENCODING_MSGPACK:
+            data = _load_tail(bytes(body), True)
+            return _restore_timestamps(data) if timestamps == "iso" else data
+
+        flags, mask = _STRUCT_PREFIX.unpack_from(body)
+        kind = flags & ~_TAIL_MSGPACK
+        offset = _STRUCT_PREFIX.size
+        if kind == _KIND_ENVELOPE:
+            data = _load_tail(bytes(body[offset:]), bool(flags & _TAIL_MSGPACK))
+            return _restore_timestamps(data) if timestamps == "iso" else data
+        block = bytes(body[offset:offset + _STRUCT_BLOCK.size])
+        tail = _load_tail(bytes(body[offset + _STRUCT_BLOCK.size:]), bool(flags & _TAIL_MSGPACK))
+    except (struct.error, ValueError, TypeError) as e:
+        raise CodecError(f"Malformed {info['encoding']} frame: {e}") from e
+
+    if timestamps == "iso":
+        _restore_timestamps(tail)
+    if kind == _KIND_KEYFRAME:
+        tail["data"] = _unpack_snapshot(mask, block, tail.get("data") or {}, timestamps)
+        return tail
+    return _unpack_snapshot(mask, block, tail, timestamps)
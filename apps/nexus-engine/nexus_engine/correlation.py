@@ -0,0 +1,229 @@
+"""Rolling cross-asset correlation and volatility over a window of sampled returns"""
+import math
+import struct
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# magic, format version, flags, symbol count, window, samples in window, epoch ms
+MATRIX_HEADER = struct.Struct("<4sBBHIIq")
+MATRIX_MAGIC = b"TVCM"
+MATRIX_VERSION = 1
+
+SECONDS_PER_YEAR = 365 * 24 * 3600.0
+
+
+def correlation_key(channel: str) -> str:
+    """Redis key holding the latest encoded matrix of a broadcaster channel"""
+    return f"{channel}:correlation"
+
+
+class RollingCorrelation:
+    """
+    Covariance, correlation and volatility of many symbols over a rolling window
+
+    Log returns of all symbols are sampled together (at most once per
+    ``sample_interval``) into one ``window x symbols`` ring. The per-symbol
+    return sums and the cross-product matrix (sum of r rᵀ) are updated with a
+    rank-2 step per sample: the new return vector is added and the one
+    leaving the window subtracted, O(symbols²) instead of recomputing over
+    the whole window. The cross products are recomputed from the ring every
+    ``resync_interval`` samples to drop accumulated rounding error.
+
+    Samples are taken on the caller's cadence, so the seconds each return
+    spans are kept alongside it and volatility is annualized with their
+    measured mean rather than the nominal ``sample_interval``.
+    """
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        window: int = 300,
+        sample_interval: float = 1.0,
+        resync_interval: Optional[int] = None,
+    ):
+        """
+        Initialize Rolling Correlation
+
+        Args:
+            symbols: Symbols, in matrix order
+            window: Return samples kept
+            sample_interval: Minimum seconds between samples
+            resync_interval: Samples between exact recomputes (default: 4 windows)
+        """
+        self.symbols: List[str] = list(symbols)
+        self.window = window
+        self.sample_interval = sample_interval
+        self.resync_interval = resync_interval or window * 4
+        size = len(self.symbols)
+        self.returns = np.zeros((window, size), dtype=np.float64)
+        self.sums = np.zeros(size, dtype=np.float64)
+        self.spans = np.zeros(window, dtype=np.float64)  # Seconds covered by each return sample
+        self.span_sum = 0.0
+        self.cross = np.zeros((size, size), dtype=np.float64)
+        self.last_prices = np.full(size, np.nan)
+        self.count = 0  # Return samples ever added; slot = count % window
+        self.last_sample: Optional[float] = None
+        self.version = 0  # Bumped on every sample, for publishers
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._signs = np.array([[1.0], [-1.0]])
+        self._upper = np.triu_indices(size, k=1)
+
+    @property
+    def samples(self) -> int:
+        """Return samples currently in the window"""
+        return min(self.count, self.window)
+
+    def update(self, prices: Dict[str, float], ts: float) -> bool:
+        """
+        Sample the latest prices
+
+        Symbols without a (positive) price this time carry their previous
+        price, i.e. contribute a zero return.
+
+        Args:
+            prices: symbol -> latest price (unknown symbols are ignored)
+            ts: Epoch seconds of the prices
+
+        Returns:
+            bool: True if a return sample was added
+        """
+        if self.last_sample is not None and ts - self.last_sample < self.sample_interval:
+            return False
+        current = self.last_prices.copy()
+        for symbol, price in prices.items():
+            i = self._index.get(symbol)
+            if i is not None and price and price > 0:
+                current[i] = price
+        span = ts - self.last_sample if self.last_sample is not None else None
+        self.last_sample = ts
+        if self.count == 0 and np.isnan(self.last_prices).all():
+            # First sample only sets the reference prices
+            self.last_prices = current
+            return False
+        with np.errstate(invalid="ignore", divide="ignore"):
+            returns = np.log(current / self.last_prices)
+        returns[~np.isfinite(returns)] = 0.0
+        self.last_prices = current
+        self.add_returns(returns, span)
+        return True
+
+    def add_returns(self, returns: np.ndarray, span: Optional[float] = None) -> None:
+        """
+        Add one vector of returns (aligned with ``symbols``) to the window
+
+        Args:
+            returns: Return per symbol
+            span: Seconds the returns cover (default: sample_interval)
+        """
+        slot = self.count % self.window
+        span = self.sample_interval if span is None or span <= 0 else span
+        self.span_sum += span - (self.spans[slot] if self.count >= self.window else 0.0)
+        self.spans[slot] = span
+        leaving = self.returns[slot] if self.count >= self.window else np.zeros_like(returns)
+        # cross += r rᵀ - old oldᵀ as one rank-2 product
+        pair = np.stack((returns, leaving))
+        self.cross += (pair * self._signs).T @ pair
+        self.sums += returns - leaving
+        self.returns[slot] = returns
+        self.count += 1
+        self.version += 1
+        if self.count % self.resync_interval == 0:
+            window = self.returns[:self.samples]
+            self.cross = window.T @ window
+            self.sums = window.sum(axis=0)
+            self.span_sum = float(self.spans[:self.samples].sum())
+
+    @property
+    def mean_interval(self) -> float:
+        """Measured mean seconds between the samples in the window (sample_interval until the first)"""
+        n = self.samples
+        return self.span_sum / n if n else self.sample_interval
+
+    def covariance(self) -> np.ndarray:
+        """Sample covariance of returns over the window (per sample)"""
+        n = self.samples
+        if n < 2:
+            return np.full_like(self.cross, np.nan)
+        return (self.cross - np.outer(self.sums, self.sums) / n) / (n - 1)
+
+    def volatility(self, covariance: Optional[np.ndarray] = None) -> np.ndarray:
+        """Annualized realized volatility per symbol (std of returns scaled by sqrt(samples/year) at the measured spacing)"""
+        covariance = self.covariance() if covariance is None else covariance
+        scale = math.sqrt(SECONDS_PER_YEAR / self.mean_interval)
+        return np.sqrt(np.maximum(np.diagonal(covariance), 0.0)) * scale
+
+    def correlation(self, covariance: Optional[np.ndarray] = None) -> np.ndarray:
+        """Correlation matrix (NaN for symbols whose returns did not vary)"""
+        covariance = self.covariance() if covariance is None else covariance
+        std = np.sqrt(np.maximum(np.diagonal(covariance), 0.0))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            correlation = covariance / np.outer(std, std)
+        np.clip(correlation, -1.0, 1.0, out=correlation)
+        valid = std > 0
+        np.fill_diagonal(correlation, np.where(valid, 1.0, np.nan))
+        return correlation
+
+    def encode(self, ts_ms: int) -> bytes:
+        """
+        Pack the current matrices as a compact binary payload
+
+        Layout (little endian): MATRIX_HEADER, uint32 length + newline-joined
+        UTF-8 symbols, float32 annualized volatility per symbol, then the
+        float32 upper triangle of the correlation matrix (row-major, without
+        the diagonal). Covariance is corr[i, j] * vol[i] * vol[j].
+
+        Args:
+            ts_ms: Epoch milliseconds stamped into the header
+        """
+        covariance = self.covariance()
+        correlation = self.correlation(covariance)
+        upper = correlation[self._upper]
+        names = "\n".join(self.symbols).encode()
+        return b"".join((
+            MATRIX_HEADER.pack(MATRIX_MAGIC, MATRIX_VERSION, 0, len(self.symbols), self.window, self.samples, ts_ms),
+            struct.pack("<I", len(names)),
+            names,
+            self.volatility(covariance).astype("<f4").tobytes(),
+            upper.astype("<f4").tobytes(),
+        ))
+
+
+def decode_matrix(payload: bytes) -> dict:
+    """
+    Unpack a payload built by RollingCorrelation.encode()
+
+    Returns:
+        dict: symbols, window, samples, timestamp_ms, volatility (float32 array)
+        and correlation (full symmetric float32 matrix)
+
+    Raises:
+        ValueError: If the payload is not a correlation matrix
+    """
+    if len(payload) < MATRIX_HEADER.size + 4:
+        raise ValueError("Truncated correlation payload")
+    magic, version, _, size, window, samples, ts_ms = MATRIX_HEADER.unpack_from(payload)
+    if magic != MATRIX_MAGIC or version != MATRIX_VERSION:
+        raise ValueError("Not a correlation payload")
+    offset = MATRIX_HEADER.size
+    (names_length,) = struct.unpack_from("<I", payload, offset)
+    offset += 4
+    names = payload[offset:offset + names_length].decode()
+    offset += names_length
+    volatility = np.frombuffer(payload, dtype="<f4", count=size, offset=offset)
+    offset += size * 4
+    upper = np.frombuffer(payload, dtype="<f4", count=size * (size - 1) // 2, offset=offset)
+    correlation = np.eye(size, dtype=np.float32)
+    rows, cols = np.triu_indices(size, k=1)
+    correlation[rows, cols] = upper
+    correlation[cols, rows] = upper
+    correlation[np.isnan(volatility) | (volatility == 0), :] = np.nan
+    correlation[:, np.isnan(volatility) | (volatility == 0)] = np.nan
+    return {
+        "symbols": names.split("\n") if names else [],
+        "window": window,
+        "samples": samples,
+        "timestamp_ms": ts_ms,
+        "volatility": volatility,
+        "correlation": correlation,
+    }
@@ -0,0 +1,194 @@
+"""JSON merge patch (RFC 7386) helpers for delta publishing"""
+import copy
+from typing import Any, Iterable, Optional, Tuple
+
+
+def merge_patch(old: dict, new: dict) -> dict:
+    """
+    Compute the JSON merge patch that turns ``old`` into ``new``
+
+    Nested dicts are diffed recursively; any other changed value (including
+    lists) is replaced as a whole. Keys missing from ``new`` become ``None``,
+    which per RFC 7386 deletes them, so a field whose value changes to None is
+    removed on the receiving side.
+
+    Args:
+        old: Previously published document
+        new: Current document
+
+    Returns:
+        dict: Merge patch (empty if the documents are equal)
+    """
+    patch = {}
+    for key, value in new.items():
+        if key not in old:
+            patch[key] = value
+            continue
+        previous = old[key]
+        if isinstance(value, dict) and isinstance(previous, dict):
+            sub = merge_patch(previous, value)
+            if sub:
+                patch[key] = sub
+        elif value != previous:
+            patch[key] = value
+    for key in old:
+        if key not in new:
+            patch[key] = None
+    return patch
+
+
+def apply_merge_patch(target: Any, patch: Any) -> Any:
+    """
+    Apply a JSON merge patch, returning a new document
+
+    Args:
+        target: Document to patch (not modified)
+        patch: Merge patch produced by ``merge_patch``
+
+    Returns:
+        Any: Patched document
+    """
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_merge_patch(result.get(key), value)
+    return result
+
+
+def strip_paths(patch: dict, paths: Iterable[Tuple[str, ...]]) -> dict:
+    """Return ``patch`` without the given paths ("*" matches any key)"""
+    result = dict(patch)
+    for path in paths:
+        head, rest = path[0], path[1:]
+        keys = list(result) if head == "*" else [head]
+        for key in keys:
+            if key not in result:
+                continue
+            if not rest:
+                del result[key]
+            elif isinstance(result[key], dict):
+                stripped = strip_paths(result[key], [rest])
+                if stripped:
+                    result[key] = stripped
+                else:
+                    del result[key]
+    return result
+
+
+# Fields that change on every tick without carrying new information
+VOLATILE_PATHS: Tuple[Tuple[str, ...], ...] = (
+    ("aggregated_at",),
+    ("sections", "*", "age_ms"),
+)
+
+
+class DeltaEncoder:
+    """
+    Turns a stream of full snapshots into keyframes and merge-patch deltas
+
+    Frames are envelopes with a sequence number:
+
+    - ``{"type": "keyframe", "seq": n, "data": {...}}`` - full snapshot
+    - ``{"type": "delta", "seq": n, "patch": {...}}`` - merge patch against
+      the snapshot with sequence number ``n - 1``
+
+    A snapshot whose only changes are in volatile fields (e.g. aggregated_at)
+    is skipped entirely. A keyframe is sent every ``keyframe_interval`` ticks
+    (published or skipped) so late joiners and subscribers that missed a frame
+    can resync.
+    """
+
+    def __init__(self, keyframe_interval: int = 25, volatile_paths: Iterable[Tuple[str, ...]] = VOLATILE_PATHS):
+        """
+        Initialize Delta Encoder
+
+        Args:
+            keyframe_interval: Publish a full keyframe every N encoded snapshots
+            volatile_paths: Paths ignored when deciding if a snapshot changed
+        """
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.volatile_paths = tuple(volatile_paths)
+        self.seq = 0
+        self._last: Optional[dict] = None
+        self._since_keyframe = 0
+        self.stats = {"keyframes": 0, "deltas": 0, "skipped": 0}
+
+    def force_keyframe(self) -> None:
+        """Make the next encoded frame a keyframe"""
+        self._last = None
+
+    def encode(self, data: dict) -> Optional[dict]:
+        """
+        Encode the next snapshot
+
+        Args:
+            data: Full snapshot (e.g. ``AggregatedData.model_dump()``)
+
+        Returns:
+            dict: Envelope to publish, or None if nothing meaningful changed
+        """
+        if self._last is None or self._since_keyframe + 1 >= self.keyframe_interval:
+            self.seq += 1
+            self._last = data
+            self._since_keyframe = 0
+            self.stats["keyframes"] += 1
+            return {"type": "keyframe", "seq": self.seq, "data": data}
+
+        self._since_keyframe += 1
+        patch = merge_patch(self._last, data)
+        if not strip_paths(patch, self.volatile_paths):
+            self.stats["skipped"] += 1
+            return None
+
+        self.seq += 1
+        self._last = data
+        self.stats["deltas"] += 1
+        return {"type": "delta", "seq": self.seq, "patch": patch}
+
+
+class DeltaDecoder:
+    """Rebuilds full snapshots from keyframe/delta envelopes"""
+
+    def __init__(self):
+        self.seq: Optional[int] = None
+        self.state: Optional[dict] = None
+        self.stats = {"keyframes": 0, "deltas": 0, "gaps": 0}
+
+    def decode(self, envelope: dict) -> Optional[dict]:
+        """
+        Apply one envelope
+
+        Args:
+            envelope: Keyframe or delta envelope (plain snapshots pass through)
+
+        Returns:
+            dict: Current full snapshot, or None while waiting for a keyframe
+            after a sequence gap
+        """
+        kind = envelope.get("type")
+        if kind == "keyframe":
+            self.stats["keyframes"] += 1
+            self.seq = envelope.get("seq")
+            self.state = envelope.get("data")
+            return self.state
+        if kind == "delta":
+            seq = envelope.get("seq")
+            if self.state is None or self.seq is None or seq != self.seq + 1:
+                # Missed a frame: drop state until the next keyframe
+                if self.state is not None:
+                    self.stats["gaps"] += 1
+                self.state = None
+                self.seq = None
+                return None
+            self.stats["deltas"] += 1
+            self.state = apply_merge_patch(self.state, envelope.get("patch", {}))
+            self.seq = seq
+            return self.state
+        # Not an envelope: a full snapshot from a non-delta publisher
+        self.state = envelope
+        self.seq = None
+        return envelope
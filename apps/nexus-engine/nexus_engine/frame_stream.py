@@ -0,0 +1,208 @@
+"""Redis Streams transport for broadcaster frames (replay, latest snapshot, consumer groups)"""
+import time
+from typing import Any, List, Optional, Tuple, Union
+
+Payload = Union[str, bytes]
+Entry = Tuple[bytes, bytes]  # (stream id, frame payload)
+
+FRAME_FIELD = b"frame"
+
+
+def _as_bytes(value: Any) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode()
+
+
+def _entries(raw: List[Tuple[Any, dict]]) -> List[Entry]:
+    """Convert redis-py stream entries into (id, payload) pairs"""
+    out = []
+    for entry_id, fields in raw:
+        payload = fields.get(FRAME_FIELD, fields.get("frame"))
+        if payload is not None:
+            out.append((_as_bytes(entry_id), _as_bytes(payload)))
+    return out
+
+
+class FrameStreamWriter:
+    """
+    Writes each frame to a capped Redis Stream, a ``latest`` hash and/or pub/sub
+
+    All writes for one frame go out in a single pipelined round trip. Stream
+    IDs are generated locally (``<epoch ms>-<seq>``, strictly increasing) so
+    the ``latest`` hash can record the ID of the frame it holds in the same
+    pipeline. If Redis rejects the ID because the stream top is already
+    newer (the wall clock stepped back across a restart, or another writer
+    shares the stream), the frame is re-added with a server-assigned ID and
+    later IDs continue after it. In delta mode only keyframes are stored in
+    ``latest``; a consumer reads it and replays the stream from its ID to
+    rebuild current state.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        channel: str = "terminal-v:data",
+        stream_key: Optional[str] = None,
+        latest_key: Optional[str] = None,
+        maxlen: int = 10000,
+        use_stream: bool = True,
+        use_pubsub: bool = True,
+    ):
+        """
+        Initialize Frame Stream Writer
+
+        Args:
+            client: redis.asyncio.Redis (or InMemoryRedis) client
+            channel: Pub/sub channel name
+            stream_key: Stream key (default: "<channel>:stream")
+            latest_key: Latest-snapshot hash key (default: "<channel>:latest")
+            maxlen: Approximate stream length cap
+            use_stream: XADD frames to the stream and maintain the latest hash
+            use_pubsub: PUBLISH frames to the channel
+        """
+        self.client = client
+        self.channel = channel
+        self.stream_key = stream_key or f"{channel}:stream"
+        self.latest_key = latest_key or f"{channel}:latest"
+        self.maxlen = maxlen
+        self.use_stream = use_stream
+        self.use_pubsub = use_pubsub
+        self._last_id = (0, 0)  # (ms, seq) of the last ID written
+
+    def _next_id(self) -> str:
+        now_ms = int(time.time() * 1000)
+        ms, seq = self._last_id
+        self._last_id = (now_ms, 0) if now_ms > ms else (ms, seq + 1)
+        return "%d-%d" % self._last_id
+
+    async def _readd(self, payload: Payload, keyframe: bool) -> str:
+        """Add a frame whose local ID was rejected, letting Redis assign one after the stream top"""
+        entry_id = _as_bytes(await self.client.xadd(self.stream_key, {FRAME_FIELD: payload}, maxlen=self.maxlen, approximate=True)).decode()
+        ms, _, seq = entry_id.partition("-")
+        self._last_id = (int(ms), int(seq or 0))
+        if keyframe:
+            await self.client.hset(self.latest_key, mapping={b"id": entry_id, FRAME_FIELD: payload})
+        return entry_id
+
+    async def write(self, payload: Payload, keyframe: bool = True) -> Optional[str]:
+        """
+        Write one frame
+
+        Args:
+            payload: Serialized frame
+            keyframe: Whether the frame is self-contained (full snapshot or
+                keyframe envelope) and should become the latest snapshot
+
+        Returns:
+            str: Stream ID of the frame (None if streams are disabled)
+        """
+        pipe = self.client.pipeline(transaction=False)
+        entry_id = None
+        if self.use_stream:
+            entry_id = self._next_id()
+            pipe.xadd(self.stream_key, {FRAME_FIELD: payload}, id=entry_id, maxlen=self.maxlen, approximate=True)
+            if keyframe:
+                pipe.hset(self.latest_key, mapping={b"id": entry_id, FRAME_FIELD: payload})
+        if self.use_pubsub:
+            pipe.publish(self.channel, payload)
+        results = await pipe.execute(raise_on_error=False)
+        if entry_id is not None and isinstance(results[0], Exception):
+            if "equal or smaller" not in str(results[0]):
+                raise results[0]
+            # The pipeline's other writes went through; only the frame needs a new ID
+            entry_id = await self._readd(payload, keyframe)
+            results = results[1:]
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return entry_id
+
+
+class FrameStreamReader:
+    """
+    Reads broadcaster frames back from the stream
+
+    - ``latest()`` returns the newest self-contained frame for instant render
+    - ``catch_up()`` returns that frame plus every later frame (for delta mode)
+    - ``read()`` tails the stream; every reader sees every frame (shared)
+    - ``read_group()`` splits the stream across consumers of one group; give
+      each worker its own group instead to have all of them see every frame
+    """
+
+    def __init__(self, client: Any, channel: str = "terminal-v:data", stream_key: Optional[str] = None, latest_key: Optional[str] = None):
+        """
+        Initialize Frame Stream Reader
+
+        Args:
+            client: redis.asyncio.Redis (or InMemoryRedis) client
+            channel: Pub/sub channel name the keys are derived from
+            stream_key: Stream key (default: "<channel>:stream")
+            latest_key: Latest-snapshot hash key (default: "<channel>:latest")
+        """
+        self.client = client
+        self.stream_key = stream_key or f"{channel}:stream"
+        self.latest_key = latest_key or f"{channel}:latest"
+
+    async def latest(self) -> Optional[Entry]:
+        """Return (id, payload) of the newest self-contained frame, if any"""
+        data = await self.client.hgetall(self.latest_key)
+        if not data:
+            return None
+        entry_id = data.get(b"id", data.get("id"))
+        payload = data.get(FRAME_FIELD, data.get("frame"))
+        if entry_id is None or payload is None:
+            return None
+        return _as_bytes(entry_id), _as_bytes(payload)
+
+    async def replay(self, from_id: Union[str, bytes] = "-", count: Optional[int] = None, exclusive: bool = False) -> List[Entry]:
+        """
+        Return frames from ``from_id`` onwards
+
+        Args:
+            from_id: First stream ID to return ("-" for the oldest retained)
+            count: Maximum number of frames
+            exclusive: Start strictly after ``from_id``
+        """
+        start = from_id.decode() if isinstance(from_id, bytes) else from_id
+        if exclusive and start != "-":
+            start = f"({start}"
+        return _entries(await self.client.xrange(self.stream_key, min=start, max="+", count=count))
+
+    async def catch_up(self) -> List[Entry]:
+        """Return the latest self-contained frame followed by every newer frame"""
+        latest = await self.latest()
+        if latest is None:
+            return []
+        return [latest] + await self.replay(latest[0], exclusive=True)
+
+    async def read(self, last_id: Union[str, bytes] = "$", count: Optional[int] = None, block_ms: Optional[int] = None) -> List[Entry]:
+        """
+        Tail the stream after ``last_id``
+
+        Args:
+            last_id: Last ID already seen ("$" for only new frames)
+            count: Maximum number of frames
+            block_ms: Block up to this many milliseconds waiting for frames
+        """
+        result = await self.client.xread({self.stream_key: last_id}, count=count, block=block_ms)
+        return _entries(result[0][1]) if result else []
+
+    async def ensure_group(self, group: str, start_id: str = "$") -> None:
+        """Create a consumer group (and the stream) if it does not exist yet"""
+        try:
+            await self.client.xgroup_create(self.stream_key, group, id=start_id, mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def read_group(self, group: str, consumer: str, count: Optional[int] = None, block_ms: Optional[int] = None) -> List[Entry]:
+        """Read frames not yet delivered to any consumer of ``group``"""
+        result = await self.client.xreadgroup(group, consumer, {self.stream_key: ">"}, count=count, block=block_ms)
+        return _entries(result[0][1]) if result else []
+
+    async def ack(self, group: str, *entry_ids: Union[str, bytes]) -> int:
+        """Acknowledge frames processed by a consumer of ``group``"""
+        if not entry_ids:
+            return 0
+        return await self.client.xack(self.stream_key, group, *entry_ids)
@@ -0,0 +1,331 @@
+"""Incremental technical indicators over array-backed per-symbol state"""
+import math
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .models.aggregated_data import IndicatorValues
+
+# Running window sums are recomputed from the window every RESYNC_WINDOWS
+# full windows to drop accumulated floating-point error
+RESYNC_WINDOWS = 64
+
+# Per-symbol scalar state, one float64 array each (row = symbol)
+_STATE = ("last", "ema", "ema_fast", "ema_slow", "signal", "gain", "loss",
+          "window_sum", "window_sumsq", "vwap_pv", "vwap_volume", "session")
+
+
+class IndicatorEngine:
+    """
+    SMA, EMA, RSI, MACD, Bollinger bands and VWAP for many symbols
+
+    All state lives in NumPy arrays with one row per symbol: a ring of the
+    last ``period`` prices for SMA/Bollinger (with running sum and sum of
+    squares), the EMA/MACD accumulators, Wilder-smoothed RSI averages and
+    the session's price*volume and volume sums for VWAP. Every update is
+    O(1) per symbol:
+
+    - ``update()`` folds one tick (or bar close) of one symbol in scalar code.
+    - ``update_batch()`` folds one tick for each of many symbols with
+      vectorized array operations; this is the fast path for a refresh that
+      brings quotes for hundreds of symbols at once.
+
+    Both paths apply the same recurrences, so they can be mixed freely.
+    Indicators report None until enough samples arrived to warm them up.
+    """
+
+    def __init__(
+        self,
+        sma_period: int = 20,
+        ema_period: int = 20,
+        rsi_period: int = 14,
+        macd_fast: int = 12,
+        macd_slow: int = 26,
+        macd_signal: int = 9,
+        bollinger_k: float = 2.0,
+        session_seconds: Optional[float] = 86400.0,
+        capacity: int = 64,
+    ):
+        """
+        Initialize Indicator Engine
+
+        Args:
+            sma_period: Window of the SMA and the Bollinger bands
+            ema_period: EMA span
+            rsi_period: RSI period (Wilder smoothing)
+            macd_fast: MACD fast EMA span
+            macd_slow: MACD slow EMA span
+            macd_signal: MACD signal EMA span
+            bollinger_k: Band width in standard deviations
+            session_seconds: VWAP resets when a tick's timestamp enters a new
+                session of this length (UTC-aligned); None never resets
+            capacity: Symbols preallocated (grows by doubling)
+        """
+        self.sma_period = sma_period
+        self.ema_period = ema_period
+        self.rsi_period = rsi_period
+        self.macd_fast = macd_fast
+        self.macd_slow = macd_slow
+        self.macd_signal = macd_signal
+        self.bollinger_k = bollinger_k
+        self.session_seconds = session_seconds
+        self.alpha = 2.0 / (ema_period + 1)
+        self.alpha_fast = 2.0 / (macd_fast + 1)
+        self.alpha_slow = 2.0 / (macd_slow + 1)
+        self.alpha_signal = 2.0 / (macd_signal + 1)
+        self.symbols: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self.capacity = max(capacity, 1)
+        self.counts = np.zeros(self.capacity, dtype=np.int64)
+        self.window = np.zeros((self.capacity, sma_period), dtype=np.float64)
+        for name in _STATE:
+            setattr(self, name, np.zeros(self.capacity, dtype=np.float64))
+        self.session.fill(np.nan)
+        self.stats = {"ticks": 0, "batches": 0}
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def _grow(self) -> None:
+        """Double the row capacity, keeping existing state"""
+        extra = self.capacity
+        self.counts = np.concatenate((self.counts, np.zeros(extra, dtype=np.int64)))
+        self.window = np.concatenate((self.window, np.zeros((extra, self.sma_period))))
+        for name in _STATE:
+            fill = np.nan if name == "session" else 0.0
+            setattr(self, name, np.concatenate((getattr(self, name), np.full(extra, fill))))
+        self.capacity += extra
+
+    def row(self, symbol: str) -> int:
+        """Row of a symbol, registering it on first use"""
+        row = self._rows.get(symbol)
+        if row is None:
+            if len(self.symbols) == self.capacity:
+                self._grow()
+            row = self._rows[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return row
+
+    def rows(self, symbols: Iterable[str]) -> np.ndarray:
+        """Rows of several symbols (cache this for repeated update_batch calls)"""
+        return np.fromiter((self.row(s) for s in symbols), dtype=np.int64)
+
+    def update(
+        self,
+        symbol: str,
+        price: float,
+        volume: float = 0.0,
+        ts: Optional[float] = None,
+        vwap_price: Optional[float] = None,
+    ) -> int:
+        """
+        Fold one tick of one symbol into its indicators
+
+        Args:
+            symbol: Trading symbol
+            price: Trade price or bar close
+            volume: Volume of the tick or bar
+            ts: Epoch seconds (used for the VWAP session)
+            vwap_price: Price weighted into VWAP (default: price; the typical
+                price for bars, see update_bar())
+
+        Returns:
+            int: The symbol's row
+        """
+        i = self.row(symbol)
+        n = int(self.counts[i]) + 1
+        self.counts[i] = n
+        if n == 1:
+            self.ema[i] = self.ema_fast[i] = self.ema_slow[i] = price
+            self.signal[i] = 0.0
+        else:
+            change = price - self.last[i]
+            k = min(n - 1, self.rsi_period)
+            self.gain[i] += ((change if change > 0 else 0.0) - self.gain[i]) / k
+            self.loss[i] += ((-change if change < 0 else 0.0) - self.loss[i]) / k
+            self.ema[i] += self.alpha * (price - self.ema[i])
+            fast = self.ema_fast[i] = self.ema_fast[i] + self.alpha_fast * (price - self.ema_fast[i])
+            slow = self.ema_slow[i] = self.ema_slow[i] + self.alpha_slow * (price - self.ema_slow[i])
+            self.signal[i] += self.alpha_signal * ((fast - slow) - self.signal[i])
+        self.last[i] = price
+
+        period = self.sma_period
+        slot = (n - 1) % period
+        window = self.window[i]
+        if n > period:
+            old = window[slot]
+            self.window_sum[i] -= old
+            self.window_sumsq[i] -= old * old
+        window[slot] = price
+        self.window_sum[i] += price
+        self.window_sumsq[i] += price * price
+        if n % (period * RESYNC_WINDOWS) == 0:
+            self.window_sum[i] = window.sum()
+            self.window_sumsq[i] = window @ window
+
+        if ts is not None and self.session_seconds:
+            session = ts // self.session_seconds
+            if session != self.session[i]:
+                self.session[i] = session
+                self.vwap_pv[i] = self.vwap_volume[i] = 0.0
+        if volume > 0:
+            self.vwap_pv[i] += (price if vwap_price is None else vwap_price) * volume
+            self.vwap_volume[i] += volume
+        self.stats["ticks"] += 1
+        return i
+
+    def update_bar(self, symbol: str, high: float, low: float, close: float, volume: float, ts: Optional[float] = None) -> int:
+        """Fold one completed bar (close for the price indicators, typical price for VWAP)"""
+        return self.update(symbol, close, volume, ts, vwap_price=(high + low + close) / 3)
+
+    def update_batch(
+        self,
+        symbols: Union[Sequence[str], np.ndarray],
+        prices: Sequence[float],
+        volumes: Optional[Sequence[float]] = None,
+        ts: Union[None, float, Sequence[float]] = None,
+    ) -> np.ndarray:
+        """
+        Fold one tick for each of many symbols with vectorized operations
+
+        Args:
+            symbols: Symbols, or rows from rows(); each must appear at most once
+            prices: Price per symbol
+            volumes: Volume per symbol (default: no volume)
+            ts: Epoch seconds, one for all or one per symbol (used for the VWAP session; NaN = unknown)
+
+        Returns:
+            np.ndarray: Rows that were updated
+        """
+        rows = symbols if isinstance(symbols, np.ndarray) else self.rows(symbols)
+        if not len(rows):
+            return rows
+        prices = np.asarray(prices, dtype=np.float64)
+        counts = self.counts[rows] + 1
+        self.counts[rows] = counts
+
+        last = self.last[rows]
+        first = counts == 1
+        if first.any():
+            # Seed the averages so the first step leaves them at the price
+            last = np.where(first, prices, last)
+            for array in (self.ema, self.ema_fast, self.ema_slow):
+                array[rows[first]] = prices[first]
+            self.signal[rows[first]] = 0.0
+        change = prices - last
+        k = np.minimum(np.maximum(counts - 1, 1), self.rsi_period)
+        gain = self.gain[rows]
+        loss = self.loss[rows]
+        later = ~first
+        gain += np.where(later, (np.maximum(change, 0.0) - gain) / k, 0.0)
+        loss += np.where(later, (np.maximum(-change, 0.0) - loss) / k, 0.0)
+        self.gain[rows] = gain
+        self.loss[rows] = loss
+        self.ema[rows] += self.alpha * (prices - self.ema[rows])
+        fast = self.ema_fast[rows] + self.alpha_fast * (prices - self.ema_fast[rows])
+        slow = self.ema_slow[rows] + self.alpha_slow * (prices - self.ema_slow[rows])
+        self.ema_fast[rows] = fast
+        self.ema_slow[rows] = slow
+        self.signal[rows] += self.alpha_signal * ((fast - slow) - self.signal[rows])
+        self.last[rows] = prices
+
+        period = self.sma_period
+        slots = (counts - 1) % period
+        old = np.where(counts > period, self.window[rows, slots], 0.0)
+        self.window[rows, slots] = prices
+        self.window_sum[rows] += prices - old
+        self.window_sumsq[rows] += prices * prices - old * old
+        resync = counts % (period * RESYNC_WINDOWS) == 0
+        if resync.any():
+            windows = self.window[rows[resync]]
+            self.window_sum[rows[resync]] = windows.sum(axis=1)
+            self.window_sumsq[rows[resync]] = np.einsum("ij,ij->i", windows, windows)
+
+        if ts is not None and self.session_seconds:
+            sessions = np.broadcast_to(np.asarray(ts, dtype=np.float64) // self.session_seconds, rows.shape)
+            # NaN timestamps (unknown) keep the current session
+            new_session = (sessions != self.session[rows]) & ~np.isnan(sessions)
+            if new_session.any():
+                changed = rows[new_session]
+                self.session[changed] = sessions[new_session]
+                self.vwap_pv[changed] = 0.0
+                self.vwap_volume[changed] = 0.0
+        if volumes is not None:
+            volumes = np.maximum(np.asarray(volumes, dtype=np.float64), 0.0)
+            self.vwap_pv[rows] += prices * volumes
+            self.vwap_volume[rows] += volumes
+        self.stats["ticks"] += len(rows)
+        self.stats["batches"] += 1
+        return rows
+
+    def columns(self, rows: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Indicator values of many symbols as arrays (NaN while warming up)
+
+        Args:
+            rows: Rows to read (default: every registered symbol)
+
+        Returns:
+            dict: Indicator name -> array aligned with ``rows``
+        """
+        if rows is None:
+            rows = np.arange(len(self.symbols))
+        counts = self.counts[rows]
+        nan = np.nan
+        with np.errstate(all="ignore"):
+            period = self.sma_period
+            full = counts >= period
+            mean = self.window_sum[rows] / period
+            std = np.sqrt(np.maximum(self.window_sumsq[rows] / period - mean * mean, 0.0))
+            sma = np.where(full, mean, nan)
+            band = self.bollinger_k * std
+            gain = self.gain[rows]
+            loss = self.loss[rows]
+            rsi = np.where(loss > 0, 100.0 - 100.0 / (1.0 + gain / loss), np.where(gain > 0, 100.0, 50.0))
+            macd = self.ema_fast[rows] - self.ema_slow[rows]
+            volume = self.vwap_volume[rows]
+            return {
+                "price": np.where(counts > 0, self.last[rows], nan),
+                "sma": sma,
+                "ema": np.where(counts >= self.ema_period, self.ema[rows], nan),
+                "rsi": np.where(counts > self.rsi_period, rsi, nan),
+                "macd": np.where(counts >= self.macd_slow, macd, nan),
+                "macd_signal": np.where(counts >= self.macd_slow + self.macd_signal - 1, self.signal[rows], nan),
+                "bollinger_upper": np.where(full, mean + band, nan),
+                "bollinger_lower": np.where(full, mean - band, nan),
+                "vwap": np.where(volume > 0, self.vwap_pv[rows] / volume, nan),
+                "samples": counts,
+            }
+
+    def snapshot(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, IndicatorValues]:
+        """
+        Indicator values per symbol for the published frame
+
+        Args:
+            symbols: Symbols to include (default: all; unknown ones are skipped)
+
+        Returns:
+            dict: symbol -> IndicatorValues
+        """
+        names = self.symbols if symbols is None else [s for s in symbols if s in self._rows]
+        if not names:
+            return {}
+        rows = np.fromiter((self._rows[s] for s in names), dtype=np.int64)
+        columns = {key: values.tolist() for key, values in self.columns(rows).items()}
+        result = {}
+        for index, symbol in enumerate(names):
+            # NaN marks an indicator still warming up
+            values = {key: None if math.isnan(column[index]) else column[index]
+                      for key, column in columns.items() if key != "samples"}
+            macd, signal = values["macd"], values["macd_signal"]
+            result[symbol] = IndicatorValues(
+                symbol=symbol,
+                samples=columns["samples"][index],
+                macd_histogram=macd - signal if macd is not None and signal is not None else None,
+                **values,
+            )
+        return result
+
+    def values(self, symbol: str) -> Optional[IndicatorValues]:
+        """Indicator values of one symbol (None if it never ticked)"""
+        return self.snapshot([symbol]).get(symbol)
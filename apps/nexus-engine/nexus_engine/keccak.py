@@ -0,0 +1,79 @@
+"""
+Pure-Python Keccak-256 (the pre-standard SHA-3 variant Ethereum uses)
+
+``hashlib.sha3_256`` uses different padding and gives different digests, so
+Ethereum hashes (log topics, bloom bits) need this implementation. It is slow
+compared to a C hash but only runs on small inputs at setup time.
+"""
+from typing import List
+
+_ROUND_CONSTANTS = [
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+]
+
+_ROTATIONS = [
+    [0, 36, 3, 41, 18],
+    [1, 44, 10, 45, 2],
+    [62, 6, 43, 15, 61],
+    [28, 55, 25, 21, 56],
+    [27, 20, 39, 8, 14],
+]
+
+_MASK = (1 << 64) - 1
+_RATE = 136  # bytes, for a 256-bit digest
+
+
+def _rotl(value: int, shift: int) -> int:
+    return ((value << shift) | (value >> (64 - shift))) & _MASK if shift else value
+
+
+def _permute(lanes: List[List[int]]) -> None:
+    """Keccak-f[1600] on a 5x5 lane state indexed [x][y]"""
+    for round_constant in _ROUND_CONSTANTS:
+        # theta
+        columns = [lanes[x][0] ^ lanes[x][1] ^ lanes[x][2] ^ lanes[x][3] ^ lanes[x][4] for x in range(5)]
+        for x in range(5):
+            d = columns[(x - 1) % 5] ^ _rotl(columns[(x + 1) % 5], 1)
+            for y in range(5):
+                lanes[x][y] ^= d
+        # rho and pi
+        moved = [[0] * 5 for _ in range(5)]
+        for x in range(5):
+            for y in range(5):
+                moved[y][(2 * x + 3 * y) % 5] = _rotl(lanes[x][y], _ROTATIONS[x][y])
+        # chi
+        for x in range(5):
+            for y in range(5):
+                lanes[x][y] = moved[x][y] ^ (~moved[(x + 1) % 5][y] & moved[(x + 2) % 5][y])
+        # iota
+        lanes[0][0] ^= round_constant
+
+
+def keccak256(data: bytes) -> bytes:
+    """
+    Keccak-256 digest
+
+    Args:
+        data: Input bytes
+
+    Returns:
+        bytes: 32-byte digest
+    """
+    padded = bytearray(data)
+    padded.append(0x01)
+    padded.extend(b"\x00" * (-len(padded) % _RATE))
+    padded[-1] |= 0x80
+
+    lanes = [[0] * 5 for _ in range(5)]
+    for offset in range(0, len(padded), _RATE):
+        block = padded[offset:offset + _RATE]
+        for i in range(_RATE // 8):
+            lanes[i % 5][i // 5] ^= int.from_bytes(block[i * 8:(i + 1) * 8], "little")
+        _permute(lanes)
+
+    return b"".join(lanes[i % 5][i // 5].to_bytes(8, "little") for i in range(4))
@@ -1,16 +1,91 @@
 """Main Nexus Engine module"""
-from typing import Any, Dict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Mapping, Optional, Union
+
+import numpy as np
+
+from .indicators import IndicatorEngine
+from .models.aggregated_data import IndicatorValues, MarketStreamData
+
+Tick = Union[MarketStreamData, Mapping[str, Any]]
+
+
+def _epoch_seconds(value: Any) -> Optional[float]:
+    """Epoch seconds of a tick timestamp (datetime, ISO string or number; naive = UTC)"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
 
 
 class NexusEngine:
-    """Core data processing engine"""
-    
-    def __init__(self):
+    """Core data processing engine - incremental technical indicators per symbol"""
+
+    def __init__(self, indicators: Optional[IndicatorEngine] = None, **indicator_options):
+        """
+        Initialize Nexus Engine
+
+        Args:
+            indicators: Indicator engine to feed (creates one if None)
+            **indicator_options: IndicatorEngine options when creating one
+        """
         self.initialized = True
-    
+        self.indicators = indicators or IndicatorEngine(**indicator_options)
+
     def process(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Process financial data"""
-        return {"status": "processed", "data": data}
+        """
+        Process financial data
+
+        Args:
+            data: One tick ({"symbol", "price", "volume", "timestamp"}) or
+                {"ticks": [tick, ...]} with at most one tick per symbol
+
+        Returns:
+            dict: {"status": "processed", "indicators": {symbol: values}}
+        """
+        ticks = data["ticks"] if "ticks" in data else [data]
+        indicators = self.process_batch(ticks)
+        return {
+            "status": "processed",
+            "indicators": {symbol: values.model_dump() for symbol, values in indicators.items()},
+        }
+
+    def process_batch(self, ticks: Iterable[Tick]) -> Dict[str, IndicatorValues]:
+        """
+        Fold one tick per symbol into the indicators in one vectorized step
+
+        Args:
+            ticks: MarketStreamData or tick dicts, at most one per symbol
+
+        Returns:
+            dict: symbol -> IndicatorValues of the symbols that ticked
+        """
+        symbols, prices, volumes, stamps = [], [], [], []
+        for tick in ticks:
+            if isinstance(tick, MarketStreamData):
+                tick = {"symbol": tick.symbol, "price": tick.price, "volume": tick.volume, "timestamp": tick.timestamp}
+            symbols.append(tick["symbol"])
+            prices.append(float(tick["price"]))
+            volumes.append(float(tick.get("volume") or 0.0))
+            ts = _epoch_seconds(tick.get("timestamp"))
+            stamps.append(np.nan if ts is None else ts)
+        if not symbols:
+            return {}
+        self.indicators.update_batch(symbols, prices, volumes, ts=stamps)
+        return self.indicators.snapshot(symbols)
+
+    def snapshot(self) -> Dict[str, IndicatorValues]:
+        """Indicator values of every symbol seen so far"""
+        return self.indicators.snapshot()
+
+    def stats(self) -> Dict[str, int]:
+        """Return symbols tracked and ticks processed"""
+        return {"symbols": len(self.indicators), **self.indicators.stats}
 
 
 def get_engine() -> NexusEngine:
@@ -0,0 +1,291 @@
+"""In-process stand-in for the subset of redis.asyncio used by the frame transport"""
+import asyncio
+import time
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def _b(value: Any) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode()
+
+
+def _parse_id(value: Any) -> Tuple[int, int]:
+    text = value.decode() if isinstance(value, bytes) else str(value)
+    ms, _, seq = text.partition("-")
+    return int(ms), int(seq or 0)
+
+
+class ResponseError(Exception):
+    """Mirrors redis.exceptions.ResponseError"""
+
+
+class _Group:
+    def __init__(self, last_id: Tuple[int, int]):
+        self.last_id = last_id
+        self.pending: Dict[Tuple[int, int], bytes] = {}
+
+
+class _Stream:
+    def __init__(self):
+        self.ids: List[Tuple[int, int]] = []
+        self.entries: List[Dict[bytes, bytes]] = []
+        self.groups: Dict[bytes, _Group] = {}
+
+    @property
+    def last_id(self) -> Tuple[int, int]:
+        return self.ids[-1] if self.ids else (0, 0)
+
+    def after(self, after: Tuple[int, int], count: Optional[int]) -> List[Tuple[bytes, Dict[bytes, bytes]]]:
+        start = bisect_right(self.ids, after)
+        stop = len(self.ids) if count is None else min(len(self.ids), start + count)
+        return [(_b(f"{i[0]}-{i[1]}"), self.entries[k]) for k, i in zip(range(start, stop), self.ids[start:stop])]
+
+
+class _Pipeline:
+    def __init__(self, client: "InMemoryRedis"):
+        self._client = client
+        self._calls: List[Tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self, raise_on_error: bool = True) -> List[Any]:
+        # Like a non-transactional Redis pipeline, a failing command does not stop the others
+        calls, self._calls = self._calls, []
+        results: List[Any] = []
+        for name, args, kwargs in calls:
+            try:
+                results.append(await getattr(self._client, name)(*args, **kwargs))
+            except ResponseError as e:
+                results.append(e)
+        if raise_on_error:
+            for result in results:
+                if isinstance(result, ResponseError):
+                    raise result
+        return results
+
+
+class InMemoryRedis:
+    """
+    Single-process Redis stand-in for tests and local runs without a server
+
+    Implements pub/sub publishing (with per-channel asyncio queues for
+    listeners), hashes, strings, the list commands used by
+    ``nexus_engine.registry`` and the stream commands used by
+    ``nexus_engine.frame_stream``. Values are returned as bytes, matching a
+    redis.asyncio client created with ``decode_responses=False``.
+    """
+
+    def __init__(self):
+        self._strings: Dict[bytes, bytes] = {}
+        self._hashes: Dict[bytes, Dict[bytes, bytes]] = {}
+        self._streams: Dict[bytes, _Stream] = {}
+        self._lists: Dict[bytes, List[bytes]] = {}
+        self._channels: Dict[bytes, List[asyncio.Queue]] = {}
+        self._changed = asyncio.Condition()
+
+    async def ping(self) -> bool:
+        return True
+
+    async def close(self) -> None:
+        return None
+
+    def pipeline(self, transaction: bool = True) -> _Pipeline:
+        return _Pipeline(self)
+
+    # Strings and hashes
+    async def set(self, name: Any, value: Any) -> bool:
+        self._strings[_b(name)] = _b(value)
+        return True
+
+    async def get(self, name: Any) -> Optional[bytes]:
+        return self._strings.get(_b(name))
+
+    async def setrange(self, name: Any, offset: int, value: Any) -> int:
+        current = self._strings.get(_b(name), b"")
+        value = _b(value)
+        current = current.ljust(offset, b"\0")
+        self._strings[_b(name)] = current[:offset] + value + current[offset + len(value):]
+        return len(self._strings[_b(name)])
+
+    async def delete(self, *names: Any) -> int:
+        deleted = 0
+        for name in names:
+            for store in (self._strings, self._hashes, self._lists, self._streams):
+                if store.pop(_b(name), None) is not None:
+                    deleted += 1
+        return deleted
+
+    async def getrange(self, name: Any, start: int, end: int) -> bytes:
+        value = self._strings.get(_b(name), b"")
+        return value[start:end + 1 if end != -1 else None]
+
+    async def hset(self, name: Any, key: Any = None, value: Any = None, mapping: Optional[dict] = None) -> int:
+        target = self._hashes.setdefault(_b(name), {})
+        items = dict(mapping or {})
+        if key is not None:
+            items[key] = value
+        added = sum(1 for k in items if _b(k) not in target)
+        target.update({_b(k): _b(v) for k, v in items.items()})
+        return added
+
+    async def hget(self, name: Any, key: Any) -> Optional[bytes]:
+        return self._hashes.get(_b(name), {}).get(_b(key))
+
+    async def hgetall(self, name: Any) -> Dict[bytes, bytes]:
+        return dict(self._hashes.get(_b(name), {}))
+
+    async def hdel(self, name: Any, *keys: Any) -> int:
+        target = self._hashes.get(_b(name), {})
+        return sum(1 for k in keys if target.pop(_b(k), None) is not None)
+
+    # Lists
+    async def rpush(self, name: Any, *values: Any) -> int:
+        target = self._lists.setdefault(_b(name), [])
+        target.extend(_b(v) for v in values)
+        return len(target)
+
+    @staticmethod
+    def _slice(length: int, start: int, end: int) -> slice:
+        start = max(start + length if start < 0 else start, 0)
+        end = end + length if end < 0 else end
+        return slice(start, max(end + 1, start))
+
+    async def lrange(self, name: Any, start: int, end: int) -> List[bytes]:
+        target = self._lists.get(_b(name), [])
+        return target[self._slice(len(target), start, end)]
+
+    async def ltrim(self, name: Any, start: int, end: int) -> bool:
+        target = self._lists.get(_b(name), [])
+        target[:] = target[self._slice(len(target), start, end)]
+        return True
+
+    # Pub/sub
+    async def publish(self, channel: Any, message: Any) -> int:
+        queues = self._channels.get(_b(channel), [])
+        for queue in queues:
+            queue.put_nowait(_b(message))
+        return len(queues)
+
+    def listen(self, channel: Any) -> asyncio.Queue:
+        """Return a queue receiving every message published to ``channel``"""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._channels.setdefault(_b(channel), []).append(queue)
+        return queue
+
+    # Streams
+    async def xadd(self, name: Any, fields: dict, id: Any = "*", maxlen: Optional[int] = None, approximate: bool = True) -> bytes:
+        stream = self._streams.setdefault(_b(name), _Stream())
+        if id == "*" or id == b"*":
+            ms = int(time.time() * 1000)
+            last = stream.last_id
+            new_id = (ms, 0) if ms > last[0] else (last[0], last[1] + 1)
+        else:
+            new_id = _parse_id(id)
+            if new_id <= stream.last_id:
+                raise ResponseError("The ID specified in XADD is equal or smaller than the target stream top item")
+        stream.ids.append(new_id)
+        stream.entries.append({_b(k): _b(v) for k, v in fields.items()})
+        if maxlen is not None and len(stream.ids) > maxlen:
+            drop = len(stream.ids) - maxlen
+            del stream.ids[:drop]
+            del stream.entries[:drop]
+        async with self._changed:
+            self._changed.notify_all()
+        return _b(f"{new_id[0]}-{new_id[1]}")
+
+    async def xlen(self, name: Any) -> int:
+        stream = self._streams.get(_b(name))
+        return len(stream.ids) if stream else 0
+
+    async def xrange(self, name: Any, min: Any = "-", max: Any = "+", count: Optional[int] = None) -> list:
+        stream = self._streams.get(_b(name))
+        if not stream:
+            return []
+        lo_text = min.decode() if isinstance(min, bytes) else str(min)
+        hi_text = max.decode() if isinstance(max, bytes) else str(max)
+        if lo_text == "-":
+            start = 0
+        elif lo_text.startswith("("):
+            start = bisect_right(stream.ids, _parse_id(lo_text[1:]))
+        else:
+            start = bisect_left(stream.ids, _parse_id(lo_text))
+        stop = len(stream.ids) if hi_text == "+" else bisect_right(stream.ids, _parse_id(hi_text))
+        if count is not None:
+            stop = min(stop, start + count)
+        return [(_b(f"{i[0]}-{i[1]}"), stream.entries[k]) for k, i in zip(range(start, stop), stream.ids[start:stop])]
+
+    async def _wait(self, ready, block: Optional[int]) -> None:
+        if block is None or ready():
+            return
+        async with self._changed:
+            try:
+                await asyncio.wait_for(self._changed.wait_for(ready), timeout=(block / 1000) if block else None)
+            except asyncio.TimeoutError:
+                pass
+
+    async def xread(self, streams: dict, count: Optional[int] = None, block: Optional[int] = None) -> list:
+        positions = {}
+        for name, last in streams.items():
+            stream = self._streams.setdefault(_b(name), _Stream())
+            positions[_b(name)] = stream.last_id if last in ("$", b"$") else _parse_id(last)
+
+        def ready() -> bool:
+            return any(self._streams[n].after(p, 1) for n, p in positions.items())
+
+        await self._wait(ready, block)
+        result = []
+        for name, position in positions.items():
+            entries = self._streams[name].after(position, count)
+            if entries:
+                result.append([name, entries])
+        return result
+
+    async def xgroup_create(self, name: Any, groupname: Any, id: Any = "$", mkstream: bool = False) -> bool:
+        key = _b(name)
+        if key not in self._streams:
+            if not mkstream:
+                raise ResponseError("The XGROUP subcommand requires the key to exist")
+            self._streams[key] = _Stream()
+        stream = self._streams[key]
+        if _b(groupname) in stream.groups:
+            raise ResponseError("BUSYGROUP Consumer Group name already exists")
+        start = stream.last_id if id in ("$", b"$") else _parse_id(id)
+        stream.groups[_b(groupname)] = _Group(start)
+        return True
+
+    async def xreadgroup(self, groupname: Any, consumername: Any, streams: dict, count: Optional[int] = None, block: Optional[int] = None, noack: bool = False) -> list:
+        targets = []
+        for name in streams:
+            stream = self._streams.get(_b(name))
+            if stream is None or _b(groupname) not in stream.groups:
+                raise ResponseError("NOGROUP No such key or consumer group")
+            targets.append((_b(name), stream, stream.groups[_b(groupname)]))
+
+        def ready() -> bool:
+            return any(stream.after(group.last_id, 1) for _, stream, group in targets)
+
+        await self._wait(ready, block)
+        result = []
+        for name, stream, group in targets:
+            entries = stream.after(group.last_id, count)
+            if not entries:
+                continue
+            group.last_id = _parse_id(entries[-1][0])
+            if not noack:
+                for entry_id, _ in entries:
+                    group.pending[_parse_id(entry_id)] = _b(consumername)
+            result.append([name, entries])
+        return result
+
+    async def xack(self, name: Any, groupname: Any, *ids: Any) -> int:
+        stream = self._streams.get(_b(name))
+        if stream is None or _b(groupname) not in stream.groups:
+            return 0
+        pending = stream.groups[_b(groupname)].pending
+        return sum(1 for entry_id in ids if pending.pop(_parse_id(entry_id), None) is not None)
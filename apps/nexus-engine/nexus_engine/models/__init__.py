@@ -1,6 +1,6 @@
 """Pydantic models for data structures"""
 
-from .aggregated_data import AggregatedData, MarketStreamData, MacroEconData, NewsSentimentData, BlockchainData, UserActivityData
+from .aggregated_data import AggregatedData, MarketStreamData, MacroEconData, NewsSentimentData, BlockchainData, GasEstimate, GasTier, IndicatorValues, LargeTransfer, UserActivityData, SectionStatus
 
 __all__ = [
     "AggregatedData",
@@ -8,5 +8,10 @@ __all__ = [
     "MacroEconData",
     "NewsSentimentData",
     "BlockchainData",
+    "GasEstimate",
+    "GasTier",
+    "IndicatorValues",
+    "LargeTransfer",
     "UserActivityData",
+    "SectionStatus",
 ]
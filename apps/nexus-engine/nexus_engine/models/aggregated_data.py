@@ -1,6 +1,6 @@
 """Pydantic models for aggregated data structure"""
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -10,6 +10,7 @@ class MarketStreamData(BaseModel):
     price: float = Field(..., description="Current price")
     volume: float = Field(..., description="Trading volume")
     change_24h: float = Field(..., description="24-hour price change percentage")
+    volume_24h: Optional[float] = Field(None, ge=0, description="Rolling 24h volume from local tick history")
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Data timestamp")
 
 
@@ -32,6 +33,38 @@ class NewsSentimentData(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Analysis timestamp")
 
 
+class LargeTransfer(BaseModel):
+    """A large ERC-20 Transfer event of a watched token"""
+    token: str = Field(..., description="Token symbol")
+    contract: str = Field(..., description="Token contract address")
+    from_address: str = Field(..., description="Sender address")
+    to_address: str = Field(..., description="Recipient address")
+    amount: float = Field(..., ge=0, description="Amount in whole tokens")
+    block_number: int = Field(..., ge=0, description="Block containing the transfer")
+    tx_hash: str = Field(..., description="Transaction hash")
+    log_index: int = Field(..., ge=0, description="Log index within the block")
+
+
+class GasTier(BaseModel):
+    """EIP-1559 fee suggestion for one confirmation speed"""
+    priority_fee_gwei: float = Field(..., ge=0, description="Suggested max priority fee (Gwei)")
+    max_fee_gwei: float = Field(..., ge=0, description="Suggested max fee per gas (Gwei)")
+
+
+class GasEstimate(BaseModel):
+    """Gas oracle estimate from recent fee history"""
+    base_fee_gwei: float = Field(..., ge=0, description="Base fee of the latest block (Gwei)")
+    next_base_fee_gwei: float = Field(..., ge=0, description="Base fee of the next block (Gwei)")
+    base_fee_trend: float = Field(..., description="Base fee slope over the window (Gwei per block)")
+    projected_base_fee_gwei: float = Field(..., ge=0, description="Base fee projected from the trend (Gwei)")
+    gas_used_ratio: Optional[float] = Field(None, ge=0, description="Mean gas-used ratio over the window")
+    slow: GasTier = Field(..., description="10th percentile priority fee")
+    standard: GasTier = Field(..., description="Median priority fee")
+    fast: GasTier = Field(..., description="90th percentile priority fee")
+    window_blocks: int = Field(..., ge=0, description="Blocks in the fee history window")
+    latest_block: int = Field(..., ge=0, description="Newest block in the window")
+
+
 class BlockchainData(BaseModel):
     """Blockchain data from RPC scanner"""
     network: str = Field(..., description="Blockchain network name")
@@ -40,6 +73,17 @@ class BlockchainData(BaseModel):
     gas_price: Optional[float] = Field(None, description="Gas price (if applicable)")
     hash_rate: Optional[float] = Field(None, description="Network hash rate")
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Block timestamp")
+    # Rolling metrics over the recent blocks tracked by the chain follower
+    window_blocks: Optional[int] = Field(None, ge=0, description="Blocks in the rolling window")
+    tps: Optional[float] = Field(None, ge=0, description="Transactions per second over the window")
+    gas_used_ratio: Optional[float] = Field(None, ge=0, description="Gas used / gas limit over the window")
+    base_fee_gwei: Optional[float] = Field(None, description="Base fee of the latest block (Gwei)")
+    base_fee_percentiles: Optional[Dict[str, float]] = Field(None, description="Base fee p10/p50/p90 over the window (Gwei)")
+    block_time_avg: Optional[float] = Field(None, description="Mean block time over the window (seconds)")
+    block_time_stddev: Optional[float] = Field(None, description="Block time standard deviation (seconds)")
+    reorg_count: Optional[int] = Field(None, ge=0, description="Reorgs observed since the follower started")
+    gas_estimate: Optional[GasEstimate] = Field(None, description="Fee-history based gas estimate")
+    large_transfers: Optional[List[LargeTransfer]] = Field(None, description="Recent large transfers of watched tokens, newest first")
 
 
 class UserActivityData(BaseModel):
@@ -51,6 +95,29 @@ class UserActivityData(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Activity timestamp")
 
 
+class IndicatorValues(BaseModel):
+    """Technical indicators of one symbol (None while an indicator warms up)"""
+    symbol: str = Field(..., description="Trading symbol")
+    price: Optional[float] = Field(None, description="Last price")
+    sma: Optional[float] = Field(None, description="Simple moving average")
+    ema: Optional[float] = Field(None, description="Exponential moving average")
+    rsi: Optional[float] = Field(None, ge=0, le=100, description="Relative strength index (Wilder)")
+    macd: Optional[float] = Field(None, description="MACD line (fast EMA - slow EMA)")
+    macd_signal: Optional[float] = Field(None, description="MACD signal line")
+    macd_histogram: Optional[float] = Field(None, description="MACD line - signal line")
+    bollinger_upper: Optional[float] = Field(None, description="Upper Bollinger band")
+    bollinger_lower: Optional[float] = Field(None, description="Lower Bollinger band")
+    vwap: Optional[float] = Field(None, description="Session volume-weighted average price")
+    samples: int = Field(..., ge=0, description="Ticks or bars folded in")
+
+
+class SectionStatus(BaseModel):
+    """Freshness of one aggregated section"""
+    status: str = Field(..., description="Section status (fresh/stale/fallback)")
+    age_ms: float = Field(..., ge=0.0, description="Milliseconds since the section data was fetched")
+    error: Optional[str] = Field(None, description="Why the latest fetch did not produce data")
+
+
 class AggregatedData(BaseModel):
     """Normalized aggregated data from all sources"""
     market_stream: MarketStreamData = Field(..., description="Market stream data")
@@ -58,10 +125,74 @@ class AggregatedData(BaseModel):
     news_sentiment: NewsSentimentData = Field(..., description="News sentiment analysis")
     blockchain: BlockchainData = Field(..., description="Blockchain scanner data")
     user_activity: UserActivityData = Field(..., description="User activity metrics")
+    chains: Optional[List[BlockchainData]] = Field(None, description="Per-network blockchain data when several chains are followed")
+    indicators: Optional[Dict[str, IndicatorValues]] = Field(None, description="Technical indicators per tracked symbol")
+    sections: Dict[str, SectionStatus] = Field(default_factory=dict, description="Per-section freshness")
     aggregated_at: datetime = Field(default_factory=datetime.utcnow, description="Aggregation timestamp")
     version: str = Field(default="1.0.0", description="Data schema version")
 
+    @classmethod
+    def from_trusted(
+        cls,
+        market_stream: MarketStreamData,
+        macro_econ: MacroEconData,
+        news_sentiment: NewsSentimentData,
+        blockchain: BlockchainData,
+        user_activity: UserActivityData,
+        sections: Optional[Dict[str, SectionStatus]] = None,
+        chains: Optional[List[BlockchainData]] = None,
+        indicators: Optional[Dict[str, IndicatorValues]] = None,
+    ) -> "AggregatedData":
+        """
+        Build a snapshot from already-validated section models without revalidating them
+
+        Only for internal callers (the aggregator) whose sections were produced
+        by our own services as model instances: the compiled validator accepts
+        them by type check alone (instances are never revalidated), and the
+        BaseModel.__init__ wrapper is skipped. This is cheaper than
+        model_construct(), whose pure-Python field loop costs more than the
+        compiled validator for a graph of ready-made instances. External input
+        must go through the normal constructor or ``model_validate``.
+
+        Args:
+            market_stream: Market stream section
+            macro_econ: Macroeconomic section
+            news_sentiment: News sentiment section
+            blockchain: Blockchain section
+            user_activity: User activity section
+            sections: Per-section freshness
+            chains: Per-network blockchain sections (multi-chain only)
+            indicators: Technical indicators per symbol
+
+        Returns:
+            AggregatedData: Snapshot (defaults such as aggregated_at are applied)
+        """
+        return _AGGREGATED_VALIDATOR.validate_python({
+            "market_stream": market_stream,
+            "macro_econ": macro_econ,
+            "news_sentiment": news_sentiment,
+            "blockchain": blockchain,
+            "user_activity": user_activity,
+            "chains": chains,
+            "indicators": indicators,
+            "sections": sections or {},
+        })
+
+    def to_json_bytes(self) -> bytes:
+        """
+        Serialize straight to JSON bytes
+
+        Uses the class's compiled pydantic-core serializer in one pass, instead
+        of model_dump() followed by json.dumps(). Datetimes are ISO 8601.
+        """
+        return _AGGREGATED_SERIALIZER.to_json(self)
+
     class Config:
         json_encoders = {
             datetime: lambda v: v.isoformat()
         }
+
+
+# Compiled once when the class is created; reused for every snapshot
+_AGGREGATED_VALIDATOR = AggregatedData.__pydantic_validator__
+_AGGREGATED_SERIALIZER = AggregatedData.__pydantic_serializer__
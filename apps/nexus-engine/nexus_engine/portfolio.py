@@ -0,0 +1,363 @@
+"""Portfolio mark-to-market engine over a dense users x symbols position matrix"""
+import struct
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# magic, format version, flags, record size, portfolios, epoch ms
+PORTFOLIO_HEADER = struct.Struct("<4sBBHIq")
+PORTFOLIO_MAGIC = b"TVPF"
+PORTFOLIO_VERSION = 1
+# Per portfolio: market value, cost basis
+PORTFOLIO_RECORD = struct.Struct("<dd")
+
+# Revalue everything with one matrix-vector product when the changed
+# symbols touch more than this share of the portfolios
+FULL_REVALUE_RATIO = 0.5
+
+# Cost of one more SETRANGE in a pipeline, in bytes of value written: packing
+# it (about 3 µs in redis-py), parsing its reply and running it on the server
+# take about as long as sending and copying 2 KB more of one value
+SETRANGE_COST = 2048
+
+# Changed records at most this many records apart are written as one range:
+# rewriting the unchanged records in between is cheaper than another SETRANGE
+MERGE_GAP = SETRANGE_COST // PORTFOLIO_RECORD.size
+
+
+def portfolio_keys(channel: str) -> Tuple[str, str]:
+    """Redis keys of a broadcaster channel: (packed records, user id -> record index hash)"""
+    return f"{channel}:portfolios", f"{channel}:portfolios:index"
+
+
+def positions_registry_key(channel: str) -> str:
+    """Redis hash of the positions set through core-api (see nexus_engine.registry)"""
+    return f"{channel}:positions"
+
+
+def decode_portfolio(header: bytes, record: bytes) -> dict:
+    """
+    Unpack one portfolio read with GETRANGE from the packed records
+
+    Args:
+        header: The first PORTFOLIO_HEADER.size bytes
+        record: PORTFOLIO_RECORD.size bytes at the portfolio's offset
+
+    Returns:
+        dict: market_value, cost_basis, unrealized_pnl, pnl_percent and timestamp_ms
+
+    Raises:
+        ValueError: If the bytes are not a portfolio record
+    """
+    if len(header) < PORTFOLIO_HEADER.size or len(record) < PORTFOLIO_RECORD.size:
+        raise ValueError("Truncated portfolio payload")
+    magic, version, _, record_size, _, ts_ms = PORTFOLIO_HEADER.unpack_from(header)
+    if magic != PORTFOLIO_MAGIC or version != PORTFOLIO_VERSION or record_size != PORTFOLIO_RECORD.size:
+        raise ValueError("Not a portfolio payload")
+    market_value, cost_basis = PORTFOLIO_RECORD.unpack_from(record)
+    pnl = market_value - cost_basis
+    return {
+        "market_value": market_value,
+        "cost_basis": cost_basis,
+        "unrealized_pnl": pnl,
+        "pnl_percent": pnl / abs(cost_basis) * 100 if cost_basis else None,
+        "timestamp_ms": ts_ms,
+    }
+
+
+def record_offset(index: int) -> int:
+    """Byte offset of portfolio ``index`` in the packed records"""
+    return PORTFOLIO_HEADER.size + index * PORTFOLIO_RECORD.size
+
+
+class PortfolioEngine:
+    """
+    Live P&L of every user's portfolio
+
+    Positions are a dense ``users x symbols`` quantity matrix and the latest
+    prices a vector. Market values are kept per portfolio and revalued
+    incrementally: a price change of one symbol adds ``quantity * change``
+    to the rows that hold it (rows are indexed per symbol), and when the
+    changed symbols touch most portfolios every market value is recomputed
+    with one matrix-vector product. Market value and cost basis live side
+    by side in one ``(users, 2)`` array, which is exactly the packed record
+    layout published to Redis. Rows changed since the last publish are
+    tracked so that encode_updates() only packs those records.
+    """
+
+    def __init__(self, symbols: Optional[Sequence[str]] = None, capacity: int = 1024, resync_ticks: int = 1000):
+        """
+        Initialize Portfolio Engine
+
+        Args:
+            symbols: Symbols known up front (more are added on first use)
+            capacity: Portfolios preallocated (grows by doubling)
+            resync_ticks: Price updates between full revaluations, which drop
+                accumulated rounding error of the incremental path
+        """
+        self.user_ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self.symbols: List[str] = []
+        self._columns: Dict[str, int] = {}
+        self.capacity = max(capacity, 1)
+        self.symbol_capacity = max(len(symbols or ()), 8)
+        self.quantities = np.zeros((self.capacity, self.symbol_capacity), dtype=np.float64)
+        self.costs = np.zeros((self.capacity, self.symbol_capacity), dtype=np.float64)  # Cost basis per position
+        self.values = np.zeros((self.capacity, 2), dtype=np.float64)  # Market value, cost basis
+        self.dirty = np.zeros(self.capacity, dtype=bool)  # Rows changed since encode_updates()
+        self.prices = np.zeros(self.symbol_capacity, dtype=np.float64)  # 0 until a symbol is priced
+        self._holders: Dict[int, np.ndarray] = {}  # column -> rows with a position (rebuilt lazily)
+        self.resync_ticks = resync_ticks
+        self.version = 0  # Bumped whenever values change, for publishers
+        self._published_users = 0
+        self.stats = {"ticks": 0, "incremental": 0, "full": 0, "rows_touched": 0}
+        for symbol in symbols or ():
+            self._column(symbol)
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def _row(self, user_id: str) -> int:
+        row = self._rows.get(user_id)
+        if row is None:
+            if len(self.user_ids) == self.capacity:
+                self._grow_rows(self.capacity * 2)
+            row = self._rows[user_id] = len(self.user_ids)
+            self.user_ids.append(user_id)
+        return row
+
+    def _column(self, symbol: str) -> int:
+        column = self._columns.get(symbol)
+        if column is None:
+            if len(self.symbols) == self.symbol_capacity:
+                self._grow_columns(self.symbol_capacity * 2)
+            column = self._columns[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return column
+
+    def _grow_rows(self, capacity: int) -> None:
+        extra = capacity - self.capacity
+        self.quantities = np.concatenate((self.quantities, np.zeros((extra, self.symbol_capacity))))
+        self.costs = np.concatenate((self.costs, np.zeros((extra, self.symbol_capacity))))
+        self.values = np.concatenate((self.values, np.zeros((extra, 2))))
+        self.dirty = np.concatenate((self.dirty, np.zeros(extra, dtype=bool)))
+        self.capacity = capacity
+
+    def _grow_columns(self, capacity: int) -> None:
+        extra = capacity - self.symbol_capacity
+        self.quantities = np.concatenate((self.quantities, np.zeros((self.capacity, extra))), axis=1)
+        self.costs = np.concatenate((self.costs, np.zeros((self.capacity, extra))), axis=1)
+        self.prices = np.concatenate((self.prices, np.zeros(extra)))
+        self.symbol_capacity = capacity
+
+    def set_positions(
+        self,
+        user_ids: Sequence[str],
+        symbol: str,
+        quantities: Sequence[float],
+        average_prices: Sequence[float],
+    ) -> None:
+        """
+        Set (replace) the positions of many users in one symbol
+
+        Args:
+            user_ids: Users, each at most once
+            symbol: Trading symbol
+            quantities: Position size per user (0 closes the position)
+            average_prices: Average entry price per user
+        """
+        if len(user_ids) + len(self.user_ids) > self.capacity:
+            capacity = self.capacity
+            while capacity < len(user_ids) + len(self.user_ids):
+                capacity *= 2
+            self._grow_rows(capacity)
+        rows = np.fromiter((self._row(user_id) for user_id in user_ids), dtype=np.int64)
+        column = self._column(symbol)
+        quantities = np.asarray(quantities, dtype=np.float64)
+        costs = quantities * np.asarray(average_prices, dtype=np.float64)
+        price = self.prices[column]
+        self.values[rows, 0] += (quantities - self.quantities[rows, column]) * price
+        self.values[rows, 1] += costs - self.costs[rows, column]
+        self.quantities[rows, column] = quantities
+        self.costs[rows, column] = costs
+        self.dirty[rows] = True
+        self._holders.pop(column, None)
+        self.version += 1
+
+    def set_position(self, user_id: str, symbol: str, quantity: float, average_price: float) -> None:
+        """Set (replace) one user's position in one symbol"""
+        self.set_positions([user_id], symbol, [quantity], [average_price])
+
+    def set_portfolios(self, portfolios: Dict[str, Dict[str, Sequence[float]]]) -> None:
+        """
+        Replace the whole portfolio of many users
+
+        The users' current positions are closed, then the new ones are set
+        with one set_positions() call per symbol.
+
+        Args:
+            portfolios: user id -> {symbol: (quantity, average price)}; an
+                empty dict closes every position of the user
+        """
+        if not portfolios:
+            return
+        needed = len(self.user_ids) + len(portfolios)
+        if needed > self.capacity:
+            capacity = self.capacity
+            while capacity < needed:
+                capacity *= 2
+            self._grow_rows(capacity)
+        rows = np.fromiter((self._row(user_id) for user_id in portfolios), dtype=np.int64)
+        for column in np.flatnonzero(self.quantities[rows].any(axis=0)).tolist():
+            self._holders.pop(column, None)
+        self.quantities[rows] = 0.0
+        self.costs[rows] = 0.0
+        self.values[rows] = 0.0
+        self.dirty[rows] = True
+        by_symbol: Dict[str, Tuple[List[str], List[float], List[float]]] = {}
+        for user_id, positions in portfolios.items():
+            for symbol, (quantity, average_price) in positions.items():
+                users, quantities, prices = by_symbol.setdefault(symbol, ([], [], []))
+                users.append(user_id)
+                quantities.append(quantity)
+                prices.append(average_price)
+        for symbol, (users, quantities, prices) in by_symbol.items():
+            self.set_positions(users, symbol, quantities, prices)
+        self.version += 1
+
+    def _holders_of(self, column: int) -> np.ndarray:
+        rows = self._holders.get(column)
+        if rows is None:
+            rows = self._holders[column] = np.flatnonzero(self.quantities[:len(self.user_ids), column])
+        return rows
+
+    def update_prices(self, prices: Dict[str, float]) -> int:
+        """
+        Revalue the portfolios holding the symbols whose price changed
+
+        Args:
+            prices: symbol -> latest price (unknown symbols are added)
+
+        Returns:
+            int: Portfolios revalued
+        """
+        changes = []
+        for symbol, price in prices.items():
+            if not price or price <= 0:
+                continue
+            column = self._column(symbol)
+            change = price - self.prices[column]
+            if change:
+                changes.append((column, price, change))
+        if not changes:
+            return 0
+        self.stats["ticks"] += 1
+        users = len(self.user_ids)
+        holders = [(column, self._holders_of(column), change) for column, _, change in changes]
+        touched = sum(len(rows) for _, rows, _ in holders)
+        for column, price, _ in changes:
+            self.prices[column] = price
+        if touched > users * FULL_REVALUE_RATIO or self.stats["ticks"] % self.resync_ticks == 0:
+            # One multiply revalues every portfolio
+            self.values[:users, 0] = self.quantities[:users] @ self.prices
+            self.dirty[:users] = True
+            self.stats["full"] += 1
+            touched = users
+        else:
+            for column, rows, change in holders:
+                self.values[rows, 0] += self.quantities[rows, column] * change
+                self.dirty[rows] = True
+            self.stats["incremental"] += 1
+        self.stats["rows_touched"] += touched
+        self.version += 1
+        return touched
+
+    def revalue(self) -> None:
+        """Recompute every market value and cost basis from the matrices"""
+        users = len(self.user_ids)
+        self.values[:users, 0] = self.quantities[:users] @ self.prices
+        self.values[:users, 1] = self.costs[:users].sum(axis=1)
+        self.dirty[:users] = True
+        self.version += 1
+
+    def pnl(self, user_id: str) -> Optional[dict]:
+        """
+        Market value, cost basis and unrealized P&L of one portfolio
+
+        Returns:
+            dict: market_value, cost_basis, unrealized_pnl, pnl_percent and
+            positions (symbol -> quantity), or None for unknown users
+        """
+        row = self._rows.get(user_id)
+        if row is None:
+            return None
+        market_value, cost_basis = self.values[row].tolist()
+        pnl = market_value - cost_basis
+        quantities = self.quantities[row, :len(self.symbols)]
+        return {
+            "market_value": market_value,
+            "cost_basis": cost_basis,
+            "unrealized_pnl": pnl,
+            "pnl_percent": pnl / abs(cost_basis) * 100 if cost_basis else None,
+            "positions": {self.symbols[i]: float(quantities[i]) for i in np.flatnonzero(quantities)},
+        }
+
+    def encode(self, ts_ms: int) -> bytes:
+        """
+        Pack every portfolio as fixed-size records
+
+        Layout (little endian): PORTFOLIO_HEADER, then one PORTFOLIO_RECORD
+        (market value, cost basis as float64) per portfolio in index order,
+        so a reader fetches one portfolio with GETRANGE at record_offset().
+
+        Args:
+            ts_ms: Epoch milliseconds stamped into the header
+        """
+        users = len(self.user_ids)
+        return self._header(ts_ms) + self.values[:users].astype("<f8", copy=False).tobytes()
+
+    def _header(self, ts_ms: int) -> bytes:
+        return PORTFOLIO_HEADER.pack(PORTFOLIO_MAGIC, PORTFOLIO_VERSION, 0, PORTFOLIO_RECORD.size, len(self.user_ids), ts_ms)
+
+    def encode_updates(self, ts_ms: int, full: bool = False) -> List[Tuple[int, bytes]]:
+        """
+        Pack the records changed since the previous call as byte ranges
+
+        Each range is meant for SETRANGE at its offset into the value built
+        by encode(). The header (with the new timestamp and portfolio count)
+        is always the first range. Changed records close together are merged
+        into one range (MERGE_GAP). When the ranges would cost at least as
+        much as rewriting every record (their bytes plus SETRANGE_COST per
+        range), the single range is the whole encode() payload.
+
+        Args:
+            ts_ms: Epoch milliseconds stamped into the header
+            full: Pack everything regardless of what changed
+
+        Returns:
+            list: (byte offset, bytes) ranges, header first
+        """
+        users = len(self.user_ids)
+        changed = np.flatnonzero(self.dirty[:users])
+        self.dirty[:users] = False
+        if full:
+            return [(0, self.encode(ts_ms))]
+        ranges = [(0, self._header(ts_ms))]
+        if not len(changed):
+            return ranges
+        breaks = np.flatnonzero(np.diff(changed) > MERGE_GAP)
+        starts = changed[np.concatenate(([0], breaks + 1))]
+        ends = changed[np.concatenate((breaks, [len(changed) - 1]))] + 1
+        cost = int((ends - starts).sum()) * PORTFOLIO_RECORD.size + len(starts) * SETRANGE_COST
+        if cost >= users * PORTFOLIO_RECORD.size:
+            return [(0, self.encode(ts_ms))]
+        values = self.values
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            ranges.append((record_offset(start), values[start:end].astype("<f8", copy=False).tobytes()))
+        return ranges
+
+    def new_users(self) -> Dict[str, int]:
+        """Users added since the previous call -> record index (for the Redis index hash)"""
+        added = {user_id: self._published_users + i for i, user_id in enumerate(self.user_ids[self._published_users:])}
+        self._published_users = len(self.user_ids)
+        return added
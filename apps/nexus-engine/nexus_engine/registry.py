@@ -0,0 +1,90 @@
+"""Keyed records kept in Redis and handed to the broadcaster as a list of changes"""
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+OP_PUT = "put"
+OP_DELETE = "delete"
+
+
+def _decode(value: Any) -> Any:
+    return json.loads(value.decode() if isinstance(value, bytes) else value)
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+class RedisRegistry:
+    """
+    Records (alerts, positions, ...) registered through core-api for the broadcaster
+
+    Every record is stored under its key in a hash, so a broadcaster that
+    (re)starts loads the current set with load(). Each change is also
+    pushed onto a list in the same MULTI/EXEC transaction, and the running
+    broadcaster drain()s that list once per tick instead of rereading the
+    hash. load() reads the hash and clears the list atomically, so no
+    change it already includes is replayed by a later drain() (a replayed
+    put would re-register a record the consumer has since retired).
+    """
+
+    def __init__(self, client: Any, key: str, batch: int = 1000):
+        """
+        Initialize Redis Registry
+
+        Args:
+            client: redis.asyncio.Redis (or InMemoryRedis) client
+            key: Hash of the records; changes go to the "<key>:changes" list
+            batch: Most changes taken per drain()
+        """
+        self.client = client
+        self.key = key
+        self.changes_key = f"{key}:changes"
+        self.batch = batch
+
+    async def put(self, key: str, record: dict) -> None:
+        """Store (or replace) a record and queue the change"""
+        pipe = self.client.pipeline(transaction=True)
+        pipe.hset(self.key, key, _encode(record))
+        pipe.rpush(self.changes_key, _encode({"op": OP_PUT, "key": key, "record": record}))
+        await pipe.execute()
+
+    async def delete(self, key: str) -> bool:
+        """Delete a record and queue the change; returns False if it did not exist"""
+        pipe = self.client.pipeline(transaction=True)
+        pipe.hdel(self.key, key)
+        pipe.rpush(self.changes_key, _encode({"op": OP_DELETE, "key": key}))
+        deleted, _ = await pipe.execute()
+        return bool(deleted)
+
+    async def get(self, key: str) -> Optional[dict]:
+        """Return one record, or None"""
+        value = await self.client.hget(self.key, key)
+        return None if value is None else _decode(value)
+
+    async def load(self) -> Dict[str, dict]:
+        """Return every record (key -> record) and drop the changes it already includes"""
+        pipe = self.client.pipeline(transaction=True)
+        pipe.hgetall(self.key)
+        pipe.delete(self.changes_key)
+        data, _ = await pipe.execute()
+        return {(k.decode() if isinstance(k, bytes) else k): _decode(v) for k, v in data.items()}
+
+    async def drain(self) -> List[dict]:
+        """Take up to ``batch`` queued changes, oldest first ({"op", "key"[, "record"]})"""
+        pipe = self.client.pipeline(transaction=False)
+        pipe.lrange(self.changes_key, 0, self.batch - 1)
+        pipe.ltrim(self.changes_key, self.batch, -1)
+        values, _ = await pipe.execute()
+        return [_decode(value) for value in values]
+
+    async def store(self, records: Optional[Dict[str, dict]] = None, removed: Iterable[str] = ()) -> None:
+        """Write back records resolved or retired by the consumer, without queueing changes"""
+        removed = list(removed)
+        if not records and not removed:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        if records:
+            pipe.hset(self.key, mapping={key: _encode(record) for key, record in records.items()})
+        if removed:
+            pipe.hdel(self.key, *removed)
+        await pipe.execute()
@@ -1,17 +1,29 @@
 """Service classes for data source management"""
 
+from .market_provider import YFinanceProvider
 from .market_stream import MarketStreamService
 from .macro_econ import MacroEconService
 from .news_sentiment import NewsSentimentService
+from .rpc_pool import RpcEndpointPool
+from .transfer_scanner import LargeTransferScanner
 from .blockchain_scanner import BlockchainScannerService
+from .multi_chain import ChainConfig, MultiChainScanner
 from .user_activity import UserActivityService
+from .scheduler import RefreshScheduler, SnapshotStore
 from .aggregator import DataAggregatorService
 
 __all__ = [
+    "YFinanceProvider",
     "MarketStreamService",
     "MacroEconService",
     "NewsSentimentService",
+    "RpcEndpointPool",
+    "LargeTransferScanner",
     "BlockchainScannerService",
+    "ChainConfig",
+    "MultiChainScanner",
     "UserActivityService",
+    "RefreshScheduler",
+    "SnapshotStore",
     "DataAggregatorService",
 ]
@@ -1,11 +1,50 @@
 """Data Aggregator Service - Manages all 5 data sources"""
-from typing import Optional
-from nexus_engine.models.aggregated_data import AggregatedData
+import asyncio
+import dataclasses
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from nexus_engine.alerts import AlertEngine
+from nexus_engine.correlation import RollingCorrelation
+from nexus_engine.main import NexusEngine
+from nexus_engine.portfolio import PortfolioEngine
+from nexus_engine.models.aggregated_data import AggregatedData, MarketStreamData, SectionStatus
 from nexus_engine.services.market_stream import MarketStreamService
 from nexus_engine.services.macro_econ import MacroEconService
 from nexus_engine.services.news_sentiment import NewsSentimentService
-from nexus_engine.services.blockchain_scanner import BlockchainScannerService
+from nexus_engine.services.multi_chain import ChainConfig, MultiChainScanner, resolve_chains
 from nexus_engine.services.user_activity import UserActivityService
+from nexus_engine.services.scheduler import RefreshScheduler, SnapshotStore
+from nexus_engine.transport import HttpTransport
+
+
+# Default per-source deadlines in seconds. A source that misses its deadline
+# keeps fetching in the background and the tick uses its last-known-good value.
+DEFAULT_SOURCE_DEADLINES = {
+    "market_stream": 1.5,
+    "macro_econ": 1.0,
+    "news_sentiment": 1.0,
+    "blockchain": 1.5,
+    "user_activity": 0.5,
+}
+
+# Default background refresh cadences in seconds, matched to how often each
+# upstream actually changes (and to its rate limits)
+DEFAULT_REFRESH_INTERVALS = {
+    "market_stream": 0.5,
+    "blockchain": 2.0,       # New Ethereum block roughly every 12s
+    "news_sentiment": 60.0,  # NewsAPI free tier: 100 requests/day
+    "macro_econ": 3600.0,    # FRED series are monthly/quarterly
+    "user_activity": 5.0,
+}
+
+# Upper bound on a single background refresh
+REFRESH_DEADLINE = 10.0
+
+# A scheduled section older than this many refresh intervals is reported stale
+STALE_AFTER_INTERVALS = 3
+
+# Section name prefix of the additional chains carried in AggregatedData.chains
+CHAIN_SECTION_PREFIX = "chain:"
 
 
 class DataAggregatorService:
@@ -22,9 +61,26 @@ class DataAggregatorService:
         # Blockchain config
         rpc_url: Optional[str] = None,
         rpc_key: Optional[str] = None,
+        networks: Optional[List[str]] = None,
+        chain_configs: Optional[Dict[str, ChainConfig]] = None,
         # User Activity config
         db_url: Optional[str] = None,
         db_credentials: Optional[dict] = None,
+        # Per-source deadlines (seconds)
+        source_deadlines: Optional[Dict[str, float]] = None,
+        # Background refresh cadences (seconds)
+        refresh_intervals: Optional[Dict[str, float]] = None,
+        # Shared HTTP connection pool
+        transport: Optional[HttpTransport] = None,
+        # Technical indicators over the market symbols
+        engine: Optional[NexusEngine] = None,
+        # Rolling cross-asset correlation (return samples kept, seconds between samples)
+        correlation_window: int = 300,
+        correlation_interval: float = 1.0,
+        # Price alerts evaluated on every market refresh
+        alerts: Optional[AlertEngine] = None,
+        # Users' positions revalued on every market refresh
+        portfolios: Optional[PortfolioEngine] = None,
     ):
         """
         Initialize Data Aggregator Service with all data sources
@@ -35,70 +91,287 @@ class DataAggregatorService:
             newsapi_key: NewsAPI key for news sentiment (optional)
             rpc_url: RPC endpoint URL for blockchain scanner
             rpc_key: RPC authentication key
+            networks: Blockchain networks to follow (default: ['ethereum']); the first
+                fills the blockchain section, all of them are listed in chains
+            chain_configs: Endpoint configs replacing or extending DEFAULT_CHAINS
             db_url: Database connection URL for user activity
             db_credentials: Database credentials dict
+            source_deadlines: Per-section fetch deadlines in seconds (overrides DEFAULT_SOURCE_DEADLINES)
+            refresh_intervals: Per-section background refresh cadences in seconds
+                (overrides DEFAULT_REFRESH_INTERVALS)
+            transport: HTTP transport shared by all sources (creates one if None)
+            engine: Indicator engine fed with every market refresh (creates one if None)
+            correlation_window: Return samples in the rolling correlation window
+            correlation_interval: Minimum seconds between correlation samples
+            alerts: Alert engine checked against every market refresh (creates one if None)
+            portfolios: Portfolio engine revalued on every market refresh (creates one if None)
         """
+        self.region = macro_region
+        self._owns_transport = transport is None
+        self.transport = transport or HttpTransport()
+        chains = resolve_chains(networks or ["ethereum"], chain_configs)
+        if rpc_url or rpc_key:
+            # The custom endpoint belongs to the primary network
+            chains[0] = dataclasses.replace(chains[0], rpc_url=rpc_url or chains[0].rpc_url, rpc_key=rpc_key or chains[0].rpc_key)
+        self.network = chains[0].name
         # Initialize all service instances
         # Market Stream - gets data from TradingView & Google Finance
         self.market_stream = MarketStreamService(
-            symbols=market_symbols
+            symbols=market_symbols,
+            transport=self.transport
+        )
+        # Indicators for every tracked symbol, updated in one batch per refresh
+        self.engine = engine or NexusEngine()
+        self._folded: Dict[str, float] = {}  # symbol -> timestamp of the last tick folded into the engine
+        # Covariance/correlation/volatility across the symbols, sampled from the same refresh
+        self.correlation = RollingCorrelation(
+            self.market_stream.symbols,
+            window=correlation_window,
+            sample_interval=correlation_interval,
         )
+        # Registered price alerts; fired ones queue until the broadcaster publishes them
+        self.alerts = alerts or AlertEngine()
+        # Live P&L per user portfolio, published by the broadcaster as packed records
+        self.portfolios = portfolios or PortfolioEngine(self.market_stream.symbols)
         
         # Macro Econ - gets data from Investing.com & FRED API
         self.macro_econ = MacroEconService(
-            region=macro_region
+            region=macro_region,
+            transport=self.transport
         )
         
         # News Sentiment - gets data from NewsAPI, Reddit, and Investing.com
         self.news_sentiment = NewsSentimentService(
-            newsapi_key=newsapi_key
+            newsapi_key=newsapi_key,
+            transport=self.transport
         )
         
-        self.blockchain_scanner = BlockchainScannerService(
-            rpc_url=rpc_url,
-            rpc_key=rpc_key
-        )
+        # Blockchain - one scanner (endpoint pool, follower, gas oracle) per network
+        self.chains = MultiChainScanner(chains, transport=self.transport)
+        self.blockchain_scanner = self.chains.scanners[self.network]
         
         self.user_activity = UserActivityService(
             db_url=db_url,
             db_credentials=db_credentials
         )
+        
+        self.source_deadlines = {**DEFAULT_SOURCE_DEADLINES, **(source_deadlines or {})}
+        self.refresh_intervals = {
+            **DEFAULT_REFRESH_INTERVALS,
+            **{CHAIN_SECTION_PREFIX + chain.name: chain.refresh_interval for chain in chains[1:]},
+            **(refresh_intervals or {}),
+        }
+        for name in self._chain_sections():
+            self.source_deadlines.setdefault(name, self.source_deadlines["blockchain"])
+        # Latest value per section, written by the scheduler or on-demand fetches
+        self.snapshots = SnapshotStore()
+        self.scheduler = RefreshScheduler(self.snapshots)
+        # section -> on-demand fetch still running from an earlier tick
+        self._inflight: Dict[str, asyncio.Task] = {}
     
-    async def initialize(self) -> None:
-        """Initialize all data source connections"""
+    def _chain_sections(self) -> Dict[str, str]:
+        """Section name -> network of the chains besides the primary one"""
+        return {CHAIN_SECTION_PREFIX + name: name for name in self.chains.networks[1:]}
+    
+    def _fetchers(self, region: str, network: str) -> Dict[str, Callable[[], Awaitable[Any]]]:
+        """Per-section coroutine factories returning real data or None"""
+        fetchers = {
+            "market_stream": self._fetch_market,
+            "macro_econ": lambda: self.macro_econ.fetch_latest(region=region, use_fallback=False),
+            "news_sentiment": lambda: self.news_sentiment.fetch_latest(use_fallback=False),
+            "blockchain": lambda: self.chains.fetch_latest(network=network, use_fallback=False),
+            "user_activity": self.user_activity.fetch_latest,
+        }
+        # Each chain is its own section, so each gets its own refresh task
+        for name, chain in self._chain_sections().items():
+            fetchers[name] = lambda chain=chain: self.chains.fetch_latest(network=chain, use_fallback=False)
+        return fetchers
+    
+    async def _fetch_market(self) -> Optional[MarketStreamData]:
+        """Fetch every tracked symbol, feed the analytics stages and return the first symbol's data"""
+        batch = await self.market_stream.fetch_many(self.market_stream.symbols, use_fallback=False)
+        # Only new quotes are samples: a provider's cached quote repeated by
+        # this refresh must not advance the indicator periods
+        ticks = []
+        for symbol in batch:
+            tick = self.market_stream.latest_tick(symbol)
+            if tick is not None and tick["timestamp"] > self._folded.get(symbol, float("-inf")):
+                self._folded[symbol] = tick["timestamp"]
+                ticks.append(tick)
+        self.engine.process_batch(ticks)
+        prices = {symbol: data.price for symbol, data in batch.items()}
+        now = time.time()
+        self.correlation.update(prices, now)
+        self.alerts.evaluate_batch(prices, now)
+        self.portfolios.update_prices(prices)
+        return batch.get(self.market_stream.symbols[0])
+    
+    def _fallbacks(self, region: str, network: str) -> Dict[str, Callable[[], Any]]:
+        """Per-section mock data used until a section has produced real data"""
+        fallbacks = {
+            "market_stream": lambda: self.market_stream.fallback_data(self.market_stream.symbols[0]),
+            "macro_econ": lambda: self.macro_econ.fallback_data(region),
+            "news_sentiment": self.news_sentiment.fallback_data,
+            "blockchain": lambda: self.chains.fallback_data(network),
+            "user_activity": self.user_activity.fallback_data,
+        }
+        for name, chain in self._chain_sections().items():
+            fallbacks[name] = lambda chain=chain: self.chains.fallback_data(chain)
+        return fallbacks
+    
+    async def initialize(self, background_refresh: bool = True) -> None:
+        """
+        Initialize all data source connections
+        
+        Args:
+            background_refresh: Start the per-source refresh scheduler so that
+                aggregate() only reads the latest snapshots
+        """
         await self.market_stream.connect()
         # Other services don't need explicit connection (REST/DB)
+        if background_refresh:
+            for name, fetch in self._fetchers(self.region, self.network).items():
+                self.scheduler.add(name, fetch, interval=self.refresh_intervals[name], deadline=REFRESH_DEADLINE)
+            self.scheduler.start()
     
     async def shutdown(self) -> None:
         """Shutdown all data source connections"""
+        await self.scheduler.stop()
+        for task in self._inflight.values():
+            task.cancel()
+        self._inflight.clear()
         await self.market_stream.disconnect()
         await self.macro_econ.close()
         await self.news_sentiment.close()
-        await self.blockchain_scanner.close()
+        await self.chains.close()
+        if self._owns_transport:
+            await self.transport.close()
     
-    async def aggregate(self, region: str = "US", network: str = "ethereum") -> AggregatedData:
+    async def aggregate(self, region: Optional[str] = None, network: Optional[str] = None) -> AggregatedData:
         """
         Aggregate data from all 5 sources into normalized structure
         
+        While the refresh scheduler is running (see initialize()), this only reads
+        the latest snapshots; otherwise all sources are fetched on demand.
+        Sections asked for another region or network than the configured ones
+        are always fetched on demand, under their own snapshot and in-flight
+        keys (see _scoped_sections()), so they never replace the configured
+        sections' data.
+        
         Args:
-            region: Geographic region for macroeconomic data (default: "US")
-            network: Blockchain network name (default: "ethereum")
+            region: Geographic region for macroeconomic data (default: the configured macro_region)
+            network: Blockchain network name (default: the configured primary network)
         
         Returns:
             AggregatedData: Normalized aggregated data object
         """
-        # Fetch data from all sources concurrently
-        market_data = await self.market_stream.fetch_latest()
-        macro_data = await self.macro_econ.fetch_latest(region=region)
-        sentiment_data = await self.news_sentiment.fetch_latest()
-        blockchain_data = await self.blockchain_scanner.fetch_latest(network=network)
-        activity_data = await self.user_activity.fetch_latest()
-        
-        # Combine into normalized structure
-        return AggregatedData(
-            market_stream=market_data,
-            macro_econ=macro_data,
-            news_sentiment=sentiment_data,
-            blockchain=blockchain_data,
-            user_activity=activity_data
+        region = region or self.region
+        network = network or self.network
+        scoped = self._scoped_sections(region, network)
+        if self.scheduler.running:
+            if scoped:
+                fetchers = self._fetchers(region, network)
+                await asyncio.gather(*(self._fetch_section(key, fetchers[name]) for name, key in scoped.items()))
+            # Background tasks keep the other snapshots current; reading them is O(1)
+            return self._build(region, network, scheduled=True, scoped=scoped)
+        
+        # Fetch data from all sources concurrently, each bounded by its own deadline
+        fetchers = self._fetchers(region, network)
+        await asyncio.gather(*(self._fetch_section(scoped.get(name, name), fetch) for name, fetch in fetchers.items()))
+        return self._build(region, network, scheduled=False, scoped=scoped)
+    
+    def _scoped_sections(self, region: str, network: str) -> Dict[str, str]:
+        """Snapshot and in-flight key of the sections asked for another region or network"""
+        scoped = {}
+        if region != self.region:
+            scoped["macro_econ"] = f"macro_econ@{region}"
+        if network != self.network:
+            scoped["blockchain"] = f"blockchain@{network}"
+        return scoped
+    
+    def _build(self, region: str, network: str, scheduled: bool, scoped: Optional[Dict[str, str]] = None) -> AggregatedData:
+        """Assemble the latest snapshots into one AggregatedData with section statuses"""
+        now = time.monotonic()
+        scoped = scoped or {}
+        fallbacks = self._fallbacks(region, network)
+        sections: Dict[str, Any] = {}
+        statuses: Dict[str, SectionStatus] = {}
+        for name, fallback in fallbacks.items():
+            snapshot = self.snapshots.get(scoped.get(name, name))
+            age = snapshot.age(now)
+            if age is None:
+                # Nothing real has ever arrived for this section
+                sections[name] = fallback()
+                statuses[name] = SectionStatus(status="fallback", age_ms=0.0, error=snapshot.error)
+                continue
+            stale = snapshot.error is not None
+            if scheduled and name not in scoped and age > self.refresh_intervals[name] * STALE_AFTER_INTERVALS:
+                stale = True
+            sections[name] = snapshot.value
+            statuses[name] = SectionStatus(
+                status="stale" if stale else "fresh",
+                age_ms=age * 1000,
+                error=snapshot.error,
+            )
+        
+        chains = None
+        chain_sections = self._chain_sections()
+        if chain_sections:
+            # Primary chain first, then the others in configured order
+            chains = [sections["blockchain"]] + [sections.pop(name) for name in chain_sections]
+        
+        # Combine into normalized structure. Every section is a model our own
+        # services already validated, so skip revalidating the whole graph.
+        return AggregatedData.from_trusted(
+            **sections,
+            sections=statuses,
+            chains=chains,
+            indicators=self.engine.snapshot() or None,
         )
+    
+    async def _fetch_section(self, name: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        """
+        Refresh one section's snapshot within its deadline
+        
+        A fetch that misses the deadline is not cancelled: it keeps running and
+        the next tick waits on the same task instead of starting another one, so
+        a slow source still delivers data eventually.
+        """
+        task = self._inflight.get(name)
+        if task is None:
+            task = asyncio.create_task(fetch())
+            self._inflight[name] = task
+            task.add_done_callback(lambda t, name=name: self._on_section_done(name, t))
+        
+        # A scoped key ("macro_econ@EU") shares its section's deadline
+        done, _ = await asyncio.wait({task}, timeout=self.source_deadlines.get(name.split("@", 1)[0]))
+        if not done:
+            self.snapshots.fail(name, "deadline exceeded")
+    
+    def _on_section_done(self, name: str, task: asyncio.Task) -> None:
+        """Record the outcome of a finished on-demand section fetch"""
+        self._inflight.pop(name, None)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            self.snapshots.fail(name, f"{type(exc).__name__}: {exc}")
+        elif task.result() is None:
+            self.snapshots.fail(name, "upstream unavailable")
+        else:
+            self.snapshots.put(name, task.result())
+    
+    def chain_snapshot(self, network: str) -> Optional[Any]:
+        """
+        Latest data of one network, an O(1) snapshot read (None if it has not reported)
+        
+        Args:
+            network: Network name
+        """
+        network = network.lower()
+        name = "blockchain" if network == self.network else CHAIN_SECTION_PREFIX + network
+        return self.snapshots.get(name).value
+    
+    def stats(self) -> Dict[str, dict]:
+        """Return background refresh cadence and lag per source"""
+        return self.scheduler.stats()
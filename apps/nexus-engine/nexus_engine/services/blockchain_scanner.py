@@ -1,44 +1,107 @@
 """Blockchain Scanner Service - Public Ethereum RPC integration"""
 import aiohttp
-import json
-from typing import Optional, List
+from typing import Any, List, Optional, Tuple
 from datetime import datetime
 from nexus_engine.models.aggregated_data import BlockchainData
+from nexus_engine.services.chain_follower import ChainFollower
+from nexus_engine.services.gas_oracle import GasOracle
+from nexus_engine.services.rpc_pool import RpcEndpointPool
+from nexus_engine.services.transfer_scanner import LargeTransferScanner
+from nexus_engine.transport import HttpTransport
+
+
+class RpcError(Exception):
+    """An RPC endpoint failed or returned an unusable response"""
 
 
 class BlockchainScannerService:
     """Service for managing blockchain data from Public Ethereum RPC endpoints"""
     
-    def __init__(self, rpc_url: Optional[str] = None, rpc_key: Optional[str] = None):
+    def __init__(
+        self,
+        rpc_url: Optional[str] = None,
+        network: str = "ethereum",
+        public_endpoints: Optional[List[str]] = None,
+        rpc_key: Optional[str] = None,
+        request_timeout: float = 5.0,
+        follow_chain: bool = True,
+        history_blocks: int = 128,
+        watch_transfers: bool = True,
+        gas_oracle: bool = True,
+        transport: Optional[HttpTransport] = None,
+    ):
         """
         Initialize Blockchain Scanner Service
         
         Args:
-            rpc_url: Custom RPC endpoint URL (optional)
-            rpc_key: RPC authentication key (optional, not needed for public endpoints)
+            rpc_url: Custom RPC endpoint URL (optional, preferred over the public ones)
+            network: Network this scanner follows
+            public_endpoints: Public RPC endpoints of the network (default: Ethereum's)
+            rpc_key: RPC authentication key (optional, only sent to rpc_url)
+            request_timeout: Timeout in seconds for a single attempt against one endpoint
+            follow_chain: Follow the head across calls for rolling on-chain metrics
+            history_blocks: Recent block headers kept for the rolling metrics
+            watch_transfers: Scan followed blocks for large USDC/USDT transfers
+                (requires follow_chain)
+            gas_oracle: Maintain a fee-history window for slow/standard/fast estimates
+            transport: Shared HTTP transport (creates a private one if None)
         """
+        self.network = network.lower()
         # Public Ethereum RPC endpoints (free, no API key required)
-        self.public_rpc_endpoints = [
+        self.public_rpc_endpoints = list(public_endpoints or [
             "https://eth.llamarpc.com",
             "https://rpc.ankr.com/eth",
             "https://ethereum.publicnode.com",
-        ]
+        ])
         self.rpc_url = rpc_url or self.public_rpc_endpoints[0]
         self.rpc_key = rpc_key
-        self._session: Optional[aiohttp.ClientSession] = None
+        self.request_timeout = request_timeout
+        # Requests go to the fastest healthy endpoint, hedged to the next one
+        self.pool = RpcEndpointPool(self._endpoints())
+        # Fee history rides in the same batch as the latest block
+        self.gas_oracle = GasOracle() if gas_oracle else None
+        self.transfers = LargeTransferScanner(self._rpc_batch) if follow_chain and watch_transfers else None
+        # Fed from the blocks fetch_latest already receives (no extra calls per tick)
+        self.follower = ChainFollower(
+            self._rpc_batch,
+            capacity=history_blocks,
+            on_block=self.transfers.observe if self.transfers else None,
+            on_rollback=self.transfers.rollback if self.transfers else None,
+        ) if follow_chain else None
+        self._owns_transport = transport is None
+        self.transport = transport or HttpTransport()
     
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create HTTP session"""
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
+        """Get the transport's shared HTTP session"""
+        return await self.transport.session()
     
     async def close(self) -> None:
-        """Close HTTP session"""
-        if self._session and not self._session.closed:
-            await self._session.close()
+        """Close HTTP session (only if the transport is private to this service)"""
+        if self._owns_transport:
+            await self.transport.close()
+    
+    def _endpoints(self) -> List[str]:
+        """Configured endpoint first, then the other public endpoints as fallbacks"""
+        return [self.rpc_url] + [e for e in self.public_rpc_endpoints if e != self.rpc_url]
+    
+    async def _post(self, payload: Any, endpoint: str) -> Any:
+        """POST a JSON-RPC payload (object or batch array) and return the decoded body"""
+        session = await self._get_session()
+        headers = {}
+        if self.rpc_key and endpoint == self.rpc_url:
+            headers["Authorization"] = f"Bearer {self.rpc_key}"
+        
+        async with session.post(
+            endpoint,
+            json=payload,
+            headers=headers,
+            timeout=self.transport.timeout(endpoint, self.request_timeout)
+        ) as response:
+            if response.status != 200:
+                raise RpcError(f"HTTP {response.status}")
+            return await response.json(content_type=None)
     
-    async def _rpc_call(self, method: str, params: List = None, endpoint: Optional[str] = None) -> Optional[dict]:
+    async def _rpc_call(self, method: str, params: List = None, endpoint: Optional[str] = None) -> Optional[Any]:
         """
         Make JSON-RPC call to Ethereum node
         
@@ -48,118 +111,154 @@ class BlockchainScannerService:
             endpoint: RPC endpoint URL (uses default if not provided)
             
         Returns:
-            dict: RPC response or None if failed
+            RPC result or None if failed
         """
-        endpoint = endpoint or self.rpc_url
-        params = params or []
+        results = await self._rpc_batch([(method, params or [])], endpoint=endpoint)
+        return results[0] if results else None
+    
+    async def _rpc_batch(self, calls: List[Tuple[str, List]], endpoint: Optional[str] = None) -> Optional[List[Optional[Any]]]:
+        """
+        Make several JSON-RPC calls in one HTTP round trip
         
-        try:
-            session = await self._get_session()
-            payload = {
-                "jsonrpc": "2.0",
-                "method": method,
-                "params": params,
-                "id": 1
-            }
-            
-            headers = {}
-            if self.rpc_key:
-                headers["Authorization"] = f"Bearer {self.rpc_key}"
+        The calls are sent as a JSON-RPC batch array and the responses, which
+        nodes may return in any order, are matched back by ``id``.
+        
+        Args:
+            calls: (method, params) pairs
+            endpoint: RPC endpoint URL (routed through the endpoint pool if not provided)
             
-            async with session.post(
-                endpoint, 
-                json=payload, 
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if 'result' in data:
-                        return data['result']
-            return None
+        Returns:
+            list: Result per call, in call order (None for calls that returned
+            an error), or None if the request itself failed
+        """
+        try:
+            if endpoint:
+                return await self._rpc_batch_at(calls, endpoint)
+            return await self.pool.request(lambda url: self._rpc_batch_at(calls, url))
         except Exception as e:
-            print(f"RPC call error ({method}): {e}")
+            print(f"RPC batch error ({', '.join(method for method, _ in calls)}): {e}")
             return None
     
-    async def _fetch_block_number(self) -> Optional[int]:
-        """Fetch latest block number"""
-        result = await self._rpc_call("eth_blockNumber")
-        if result:
-            try:
-                # Convert hex to int
-                return int(result, 16)
-            except (ValueError, TypeError):
-                return None
-        return None
+    async def _rpc_batch_at(self, calls: List[Tuple[str, List]], endpoint: str) -> List[Optional[Any]]:
+        """Send one batch to one endpoint, raising RpcError on any transport-level failure"""
+        payload = [
+            {"jsonrpc": "2.0", "method": method, "params": params, "id": request_id}
+            for request_id, (method, params) in enumerate(calls, start=1)
+        ]
+        data = await self._post(payload, endpoint)
+        if isinstance(data, dict):
+            # Some nodes answer a batch they reject with a single error object
+            raise RpcError(f"batch rejected: {data.get('error')}")
+        if not isinstance(data, list):
+            raise RpcError("unexpected response")
+        
+        by_id = {item.get("id"): item for item in data if isinstance(item, dict)}
+        results = []
+        for request_id in range(1, len(calls) + 1):
+            item = by_id.get(request_id, {})
+            results.append(item.get("result") if "error" not in item else None)
+        return results
     
-    async def _fetch_block_data(self, block_number: int) -> Optional[dict]:
-        """Fetch block data by number"""
-        # Convert to hex
-        block_hex = hex(block_number)
-        result = await self._rpc_call("eth_getBlockByNumber", [block_hex, False])
-        return result
+    @staticmethod
+    def _hex_to_int(value: Any) -> Optional[int]:
+        """Decode a hex quantity ("0x1b4") returned by the node"""
+        try:
+            return int(value, 16)
+        except (ValueError, TypeError):
+            return None
     
-    async def _fetch_gas_price(self) -> Optional[float]:
-        """Fetch current gas price in Gwei"""
-        result = await self._rpc_call("eth_gasPrice")
-        if result:
-            try:
-                # Convert from Wei to Gwei (1 Gwei = 10^9 Wei)
-                gas_price_wei = int(result, 16)
-                gas_price_gwei = gas_price_wei / 1e9
-                return gas_price_gwei
-            except (ValueError, TypeError):
-                return None
-        return None
+    def fallback_data(self, network: Optional[str] = None) -> BlockchainData:
+        """Mock blockchain data used when RPC calls fail"""
+        return BlockchainData(
+            network=network or self.network,
+            block_height=18500000,
+            transaction_count=150,
+            gas_price=25.5,
+            hash_rate=350.2,
+            timestamp=datetime.utcnow()
+        )
     
-    async def fetch_latest(self, network: str = "ethereum") -> BlockchainData:
+    async def fetch_latest(self, network: Optional[str] = None, use_fallback: bool = True) -> Optional[BlockchainData]:
         """
-        Fetch latest blockchain data from Public Ethereum RPC
+        Fetch latest blockchain data from the network's RPC endpoints
         
         Args:
-            network: Blockchain network name (currently supports 'ethereum')
+            network: Blockchain network name (default: the scanner's network)
+            use_fallback: Return mock data if RPC calls fail (otherwise None)
             
         Returns:
             BlockchainData: Latest blockchain metrics
         """
-        if network.lower() != "ethereum":
-            # For other networks, return mock data
-            return BlockchainData(
-                network=network,
-                block_height=18500000,
-                transaction_count=150,
-                gas_price=25.5,
-                hash_rate=350.2,
-                timestamp=datetime.utcnow()
-            )
+        network = (network or self.network).lower()
+        if network != self.network:
+            # Other networks are served by their own scanner (see MultiChainScanner)
+            return self.fallback_data(network) if use_fallback else None
         
-        # Try to fetch real data from public RPC endpoints
-        block_number = await self._fetch_block_number()
+        # One round trip: the latest block (with its number), gas price and recent fee history
+        calls = [
+            ("eth_getBlockByNumber", ["latest", False]),
+            ("eth_gasPrice", []),
+        ]
+        if self.gas_oracle is not None:
+            calls.append(self.gas_oracle.step_call())
         
-        if block_number:
-            # Fetch block data and gas price
-            block_data = await self._fetch_block_data(block_number)
-            gas_price = await self._fetch_gas_price()
-            
-            transaction_count = 0
-            if block_data and 'transactions' in block_data:
-                transaction_count = len(block_data['transactions'])
-            
-            return BlockchainData(
-                network=network,
-                block_height=block_number,
-                transaction_count=transaction_count,
-                gas_price=gas_price,
-                hash_rate=None,  # Hash rate requires additional API calls
-                timestamp=datetime.utcnow()
-            )
+        async def fetch(endpoint: str) -> List[Any]:
+            results = await self._rpc_batch_at(calls, endpoint)
+            block_data = results[0]
+            if not isinstance(block_data, dict) or self._hex_to_int(block_data.get("number")) is None:
+                # Count as an endpoint failure so the pool tries another one
+                raise RpcError("no latest block in response")
+            return results
+        
+        try:
+            results = await self.pool.request(fetch)
+        except Exception as e:
+            print(f"Blockchain RPC error: {e}")
+            # Fallback to mock data if RPC calls fail
+            return self.fallback_data(network) if use_fallback else None
+        block_data, gas_result = results[0], results[1]
+        
+        metrics = {}
+        if self.gas_oracle is not None:
+            await self._update_gas_oracle(self._hex_to_int(block_data.get("number")), results[2])
+        if self.follower is not None:
+            # Only fetches when blocks were missed (backfill) or on a reorg
+            await self.follower.ingest(block_data)
+            metrics.update(self.follower.metrics())
+        if self.transfers is not None:
+            # eth_getLogs only for blocks whose bloom may hold a watched Transfer
+            await self.transfers.scan()
+            metrics["large_transfers"] = self.transfers.recent()
+        if self.gas_oracle is not None:
+            metrics["gas_estimate"] = self.gas_oracle.estimate()
         
-        # Fallback to mock data if RPC calls fail
+        gas_price_wei = self._hex_to_int(gas_result)
         return BlockchainData(
             network=network,
-            block_height=18500000,
-            transaction_count=150,
-            gas_price=25.5,
-            hash_rate=350.2,
-            timestamp=datetime.utcnow()
+            block_height=self._hex_to_int(block_data.get("number")),
+            transaction_count=len(block_data.get("transactions", [])),
+            # Convert from Wei to Gwei (1 Gwei = 10^9 Wei)
+            gas_price=gas_price_wei / 1e9 if gas_price_wei is not None else None,
+            hash_rate=None,  # Hash rate requires additional API calls
+            timestamp=datetime.utcnow(),
+            **metrics
         )
+    
+    async def _update_gas_oracle(self, head: int, fee_history: Any) -> None:
+        """Merge the batched fee history, fetching missed blocks only after a gap"""
+        gap = self.gas_oracle.gap_call(head)
+        self.gas_oracle.update(fee_history)
+        if gap is not None:
+            # First refresh or fell behind: one extra call fills the window
+            self.gas_oracle.update(await self._rpc_call(*gap))
+    
+    def stats(self) -> dict:
+        """Return endpoint pool routing counters, per-endpoint health and follower counters"""
+        stats = self.pool.stats()
+        if self.follower is not None:
+            stats["follower"] = dict(self.follower.stats, window_blocks=len(self.follower.ring))
+        if self.transfers is not None:
+            stats["transfers"] = dict(self.transfers.stats)
+        if self.gas_oracle is not None:
+            stats["gas_oracle"] = dict(self.gas_oracle.stats)
+        return stats
@@ -0,0 +1,328 @@
+"""Chain head follower with a compact recent-header ring buffer and rolling metrics"""
+import asyncio
+import bisect
+import math
+from array import array
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+RpcBatch = Callable[[List[Tuple[str, List]]], Awaitable[Optional[List[Optional[Any]]]]]
+BlockListener = Callable[["BlockHeader"], None]
+RollbackListener = Callable[[int], None]
+
+
+class BlockHeader(NamedTuple):
+    """The header fields the follower keeps"""
+    number: int
+    hash: bytes
+    parent_hash: bytes
+    timestamp: int
+    gas_used: int
+    gas_limit: int
+    base_fee_gwei: float  # NaN before London (no baseFeePerGas)
+    tx_count: int
+    logs_bloom: bytes = b""  # 256 bytes; not kept in the ring
+
+    @classmethod
+    def from_rpc(cls, block: dict) -> "BlockHeader":
+        """Parse an eth_getBlockByNumber result (transactions as hashes)"""
+        base_fee = block.get("baseFeePerGas")
+        return cls(
+            number=int(block["number"], 16),
+            hash=bytes.fromhex(block["hash"][2:]),
+            parent_hash=bytes.fromhex(block["parentHash"][2:]),
+            timestamp=int(block["timestamp"], 16),
+            gas_used=int(block["gasUsed"], 16),
+            gas_limit=int(block["gasLimit"], 16),
+            base_fee_gwei=int(base_fee, 16) / 1e9 if base_fee else math.nan,
+            tx_count=len(block.get("transactions", [])),
+            logs_bloom=bytes.fromhex(block.get("logsBloom", "0x")[2:]),
+        )
+
+
+class HeaderRing:
+    """
+    Last ``capacity`` consecutive block headers in fixed-size typed arrays
+
+    Headers are stored by ``number % capacity`` so lookups by block number are
+    O(1). Window sums (transactions, gas, block-time moments) and a sorted list
+    of base fees are updated as headers enter and leave, so every rolling
+    metric is available without rescanning the window.
+    """
+
+    def __init__(self, capacity: int = 128):
+        self.capacity = capacity
+        self.numbers = array("q", [0]) * capacity
+        self.timestamps = array("q", [0]) * capacity
+        self.gas_used = array("q", [0]) * capacity
+        self.gas_limit = array("q", [0]) * capacity
+        self.base_fees = array("d", [0.0]) * capacity
+        self.tx_counts = array("l", [0]) * capacity
+        self.hashes = bytearray(32 * capacity)
+        self.head: Optional[int] = None
+        self.count = 0
+        self._sum_tx = 0
+        self._sum_gas_used = 0
+        self._sum_gas_limit = 0
+        self._sum_dt2 = 0.0
+        self._sorted_base_fees: List[float] = []
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def oldest(self) -> Optional[int]:
+        return None if self.head is None else self.head - self.count + 1
+
+    def contains(self, number: int) -> bool:
+        return self.head is not None and self.oldest <= number <= self.head
+
+    def hash_at(self, number: int) -> Optional[bytes]:
+        if not self.contains(number):
+            return None
+        slot = number % self.capacity
+        return bytes(self.hashes[slot * 32:(slot + 1) * 32])
+
+    def _add_stats(self, slot: int, sign: int) -> None:
+        self._sum_tx += sign * self.tx_counts[slot]
+        self._sum_gas_used += sign * self.gas_used[slot]
+        self._sum_gas_limit += sign * self.gas_limit[slot]
+        base_fee = self.base_fees[slot]
+        if not math.isnan(base_fee):
+            if sign > 0:
+                bisect.insort(self._sorted_base_fees, base_fee)
+            else:
+                index = bisect.bisect_left(self._sorted_base_fees, base_fee)
+                if index < len(self._sorted_base_fees) and self._sorted_base_fees[index] == base_fee:
+                    del self._sorted_base_fees[index]
+
+    def _gap(self, number: int) -> float:
+        """Seconds between block ``number`` and its parent (both in the ring)"""
+        return float(self.timestamps[number % self.capacity] - self.timestamps[(number - 1) % self.capacity])
+
+    def append(self, header: BlockHeader) -> None:
+        """Add the next header (its number must be head + 1, or the ring empty)"""
+        if self.head is not None and header.number != self.head + 1:
+            raise ValueError(f"Header {header.number} does not extend head {self.head}")
+        if self.count == self.capacity:
+            # Evict the oldest header
+            oldest = self.oldest
+            if self.count > 1:
+                self._sum_dt2 -= self._gap(oldest + 1) ** 2
+            self._add_stats(oldest % self.capacity, -1)
+            self.count -= 1
+        slot = header.number % self.capacity
+        self.numbers[slot] = header.number
+        self.timestamps[slot] = header.timestamp
+        self.gas_used[slot] = header.gas_used
+        self.gas_limit[slot] = header.gas_limit
+        self.base_fees[slot] = header.base_fee_gwei
+        self.tx_counts[slot] = header.tx_count
+        self.hashes[slot * 32:(slot + 1) * 32] = header.hash
+        self.head = header.number
+        self.count += 1
+        self._add_stats(slot, 1)
+        if self.count > 1:
+            self._sum_dt2 += self._gap(header.number) ** 2
+
+    def truncate(self, keep_through: int) -> int:
+        """Drop headers above ``keep_through``; returns how many were dropped"""
+        dropped = 0
+        while self.head is not None and self.head > keep_through:
+            if self.count > 1:
+                self._sum_dt2 -= self._gap(self.head) ** 2
+            self._add_stats(self.head % self.capacity, -1)
+            self.count -= 1
+            dropped += 1
+            self.head = self.head - 1 if self.count else None
+        return dropped
+
+    def clear(self) -> int:
+        return self.truncate(-1)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Rolling metrics over the window (None where undefined)"""
+        out: Dict[str, Any] = {
+            "window_blocks": self.count,
+            "tps": None,
+            "gas_used_ratio": None,
+            "base_fee_gwei": None,
+            "base_fee_percentiles": None,
+            "block_time_avg": None,
+            "block_time_stddev": None,
+        }
+        if not self.count:
+            return out
+        head_slot = self.head % self.capacity
+        oldest_slot = self.oldest % self.capacity
+        if self._sum_gas_limit:
+            out["gas_used_ratio"] = self._sum_gas_used / self._sum_gas_limit
+        if not math.isnan(self.base_fees[head_slot]):
+            out["base_fee_gwei"] = self.base_fees[head_slot]
+        fees = self._sorted_base_fees
+        if fees:
+            last = len(fees) - 1
+            out["base_fee_percentiles"] = {f"p{p}": fees[min(last, round(p / 100 * last))] for p in (10, 50, 90)}
+        if self.count > 1:
+            span = self.timestamps[head_slot] - self.timestamps[oldest_slot]
+            intervals = self.count - 1
+            if span > 0:
+                # Transactions included after the oldest block, over the time they took
+                out["tps"] = (self._sum_tx - self.tx_counts[oldest_slot]) / span
+            mean = span / intervals
+            out["block_time_avg"] = mean
+            out["block_time_stddev"] = math.sqrt(max(self._sum_dt2 / intervals - mean * mean, 0.0))
+        return out
+
+
+class ChainFollower:
+    """
+    Follows the chain head from the blocks the scanner already fetches
+
+    Each ``ingest()`` receives the latest block from the scanner's regular
+    refresh, so steady-state following costs no extra RPC calls. When blocks
+    were missed they are backfilled (bounded, in batched requests with limited
+    concurrency). A header whose parent hash does not match the stored head is
+    a reorg: canonical headers are walked back until they reconnect, and the
+    replaced headers are dropped from the ring.
+    """
+
+    def __init__(
+        self,
+        rpc_batch: RpcBatch,
+        capacity: int = 128,
+        max_backfill: int = 32,
+        batch_size: int = 8,
+        concurrency: int = 2,
+        max_reorg_depth: int = 64,
+        on_block: Optional[BlockListener] = None,
+        on_rollback: Optional[RollbackListener] = None,
+    ):
+        """
+        Initialize Chain Follower
+
+        Args:
+            rpc_batch: Batched JSON-RPC call (e.g. BlockchainScannerService._rpc_batch)
+            capacity: Headers kept in the ring buffer (rolling window size)
+            max_backfill: Most missed blocks fetched after a gap; older ones are skipped
+            batch_size: Blocks per batched backfill request
+            concurrency: Backfill requests in flight at once
+            max_reorg_depth: Deepest reorg walked back before resetting the ring
+            on_block: Called with each header as it joins the canonical chain
+            on_rollback: Called with the last still-canonical block number when
+                a reorg orphans the headers above it
+        """
+        self.rpc_batch = rpc_batch
+        self.ring = HeaderRing(capacity)
+        self.max_backfill = max_backfill
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_reorg_depth = max_reorg_depth
+        self.on_block = on_block
+        self.on_rollback = on_rollback
+        self.stats = {"blocks": 0, "backfilled": 0, "skipped": 0, "reorgs": 0, "max_reorg_depth": 0, "resets": 0}
+
+    async def _fetch_headers(self, numbers: List[int]) -> List[Optional[BlockHeader]]:
+        """Fetch headers by number in batches with bounded concurrency"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch_chunk(chunk: List[int]) -> List[Optional[BlockHeader]]:
+            async with semaphore:
+                results = await self.rpc_batch([("eth_getBlockByNumber", [hex(n), False]) for n in chunk])
+            headers = []
+            for block in results or [None] * len(chunk):
+                try:
+                    headers.append(BlockHeader.from_rpc(block) if block else None)
+                except (KeyError, ValueError, TypeError):
+                    headers.append(None)
+            return headers
+
+        chunks = [numbers[i:i + self.batch_size] for i in range(0, len(numbers), self.batch_size)]
+        results = await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks))
+        return [header for chunk in results for header in chunk]
+
+    async def ingest(self, block: dict) -> None:
+        """
+        Feed the latest block seen by the scanner
+
+        Args:
+            block: eth_getBlockByNumber("latest") result
+        """
+        try:
+            header = BlockHeader.from_rpc(block)
+        except (KeyError, ValueError, TypeError):
+            return
+        ring = self.ring
+        if ring.head is None:
+            self._append(header)
+            return
+        if header.number <= ring.head:
+            if ring.hash_at(header.number) != header.hash:
+                await self._reorg(header)
+            return
+        if header.number > ring.head + 1:
+            await self._backfill(ring.head + 1, header.number - 1)
+        if ring.head is not None and header.number == ring.head + 1 and header.parent_hash == ring.hash_at(ring.head):
+            self._append(header)
+        else:
+            await self._reorg(header)
+
+    def _append(self, header: BlockHeader) -> None:
+        self.ring.append(header)
+        self.stats["blocks"] += 1
+        if self.on_block is not None:
+            self.on_block(header)
+
+    async def _backfill(self, first: int, last: int) -> None:
+        """Fetch and link the missed blocks ``first..last`` (bounded)"""
+        if last - first + 1 > self.max_backfill:
+            # Too far behind: restart the window instead of fetching everything
+            self.stats["skipped"] += last - self.max_backfill + 1 - first
+            self.ring.clear()
+            self.stats["resets"] += 1
+            first = last - self.max_backfill + 1
+        headers = await self._fetch_headers(list(range(first, last + 1)))
+        for header in headers:
+            if header is None:
+                # A hole we cannot fill: restart the window after it
+                self.ring.clear()
+                continue
+            ring = self.ring
+            if ring.head is None or (header.number == ring.head + 1 and header.parent_hash == ring.hash_at(ring.head)):
+                self._append(header)
+                self.stats["backfilled"] += 1
+            else:
+                await self._reorg(header)
+
+    async def _reorg(self, header: BlockHeader) -> None:
+        """Replace the ring's headers from the fork point up to ``header``"""
+        ring = self.ring
+        chain = [header]
+        current = header
+        while current.number - 1 >= (ring.oldest or 0) and ring.contains(current.number - 1):
+            if ring.hash_at(current.number - 1) == current.parent_hash:
+                break
+            if len(chain) >= self.max_reorg_depth:
+                break
+            parents = await self._fetch_headers([current.number - 1])
+            if not parents or parents[0] is None:
+                break
+            current = parents[0]
+            chain.append(current)
+        fork_parent = current.number - 1
+        if ring.contains(fork_parent) and ring.hash_at(fork_parent) == current.parent_hash:
+            depth = ring.truncate(fork_parent)
+            if depth:
+                self.stats["reorgs"] += 1
+                self.stats["max_reorg_depth"] = max(self.stats["max_reorg_depth"], depth)
+        else:
+            # Could not reconnect within the window: start over from this chain
+            depth = ring.clear()
+            self.stats["resets"] += 1
+        if depth and self.on_rollback is not None:
+            self.on_rollback(fork_parent)
+        for block in reversed(chain):
+            self._append(block)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Rolling metrics plus reorg count, for BlockchainData"""
+        return {**self.ring.metrics(), "reorg_count": self.stats["reorgs"]}
@@ -0,0 +1,167 @@
+"""Gas oracle over an incrementally maintained eth_feeHistory window"""
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+from nexus_engine.models.aggregated_data import GasEstimate, GasTier
+
+# Priority-fee (reward) percentiles requested per block: slow, standard, fast
+REWARD_PERCENTILES = (10, 50, 90)
+
+# Base fee can rise at most 12.5% per block (EIP-1559)
+MAX_BASE_FEE_STEP = 1.125
+
+
+class GasOracle:
+    """
+    Slow/standard/fast fee estimates from recent blocks
+
+    The oracle keeps the last ``window`` blocks of fee history (base fee,
+    gas-used ratio, reward percentiles) in numpy ring arrays indexed by block
+    number. Each refresh adds only blocks it has not seen: ``step_call()`` is a
+    fixed, small ``eth_feeHistory`` request meant to ride in the scanner's
+    existing batch, and ``gap_call()`` asks for the missing range after the
+    oracle falls behind. Estimates are computed over the whole window with
+    vectorized reductions.
+    """
+
+    def __init__(self, window: int = 20, step: int = 4, trend_horizon: int = 5):
+        """
+        Initialize Gas Oracle
+
+        Args:
+            window: Blocks kept for the estimates
+            step: Blocks requested by the per-refresh fee history call
+            trend_horizon: Blocks ahead for the base-fee projection
+        """
+        self.window = window
+        self.step = min(step, window)
+        self.trend_horizon = trend_horizon
+        self.numbers = np.full(window, -1, dtype=np.int64)
+        self.base_fees = np.full(window, np.nan)  # Gwei
+        self.gas_used_ratios = np.full(window, np.nan)
+        self.rewards = np.full((window, len(REWARD_PERCENTILES)), np.nan)  # Gwei
+        self.latest: Optional[int] = None
+        self.next_base_fee: Optional[float] = None
+        self.stats = {"updates": 0, "blocks": 0, "gap_calls": 0}
+
+    def step_call(self) -> Tuple[str, list]:
+        """The per-refresh eth_feeHistory call (last ``step`` blocks)"""
+        return ("eth_feeHistory", [hex(self.step), "latest", list(REWARD_PERCENTILES)])
+
+    def gap_call(self, head: int) -> Optional[Tuple[str, list]]:
+        """
+        eth_feeHistory call for blocks missed before the last ``step`` up to ``head``
+
+        Returns:
+            The call, or None when the step call already covers everything new
+        """
+        first_new = head - self.window + 1 if self.latest is None else max(self.latest + 1, head - self.window + 1)
+        first_step = head - self.step + 1
+        if first_new >= first_step:
+            return None
+        self.stats["gap_calls"] += 1
+        count = first_step - first_new
+        return ("eth_feeHistory", [hex(count), hex(first_step - 1), list(REWARD_PERCENTILES)])
+
+    def update(self, history: Any) -> int:
+        """
+        Merge an eth_feeHistory result into the window
+
+        Args:
+            history: eth_feeHistory result (oldestBlock, baseFeePerGas,
+                gasUsedRatio, reward)
+
+        Returns:
+            int: Number of blocks that were new to the window
+        """
+        if not isinstance(history, dict) or "oldestBlock" not in history:
+            return 0
+        try:
+            oldest = int(history["oldestBlock"], 16)
+            ratios = np.asarray(history.get("gasUsedRatio") or [], dtype=np.float64)
+            count = len(ratios)
+            if not count:
+                return 0
+            base_fees = np.array([int(v, 16) for v in history["baseFeePerGas"]], dtype=np.float64) / 1e9
+            rewards = history.get("reward")
+            if rewards:
+                rewards = np.array([[int(v, 16) for v in row] for row in rewards], dtype=np.float64) / 1e9
+            else:
+                rewards = np.full((count, len(REWARD_PERCENTILES)), np.nan)
+        except (KeyError, ValueError, TypeError):
+            return 0
+
+        numbers = np.arange(oldest, oldest + count, dtype=np.int64)
+        newest = int(numbers[-1])
+        if self.latest is not None and newest < self.latest - self.window:
+            return 0
+        # Keep only blocks that still fit the window ending at the newest block seen
+        head = max(newest, self.latest or newest)
+        keep = numbers > head - self.window
+        slots = numbers[keep] % self.window
+        added = int(np.count_nonzero(self.numbers[slots] != numbers[keep]))
+        self.numbers[slots] = numbers[keep]
+        self.base_fees[slots] = base_fees[:count][keep]
+        self.gas_used_ratios[slots] = ratios[keep]
+        self.rewards[slots] = rewards[keep]
+        if self.latest is None or newest >= self.latest:
+            self.latest = newest
+            # The extra trailing base fee is the one for the block after ``newest``
+            self.next_base_fee = float(base_fees[count]) if len(base_fees) > count else float(base_fees[-1])
+        self.stats["updates"] += 1
+        self.stats["blocks"] += added
+        return added
+
+    def _valid(self) -> np.ndarray:
+        if self.latest is None:
+            return np.zeros(self.window, dtype=bool)
+        return self.numbers > self.latest - self.window
+
+    def estimate(self) -> Optional[GasEstimate]:
+        """
+        Current estimate, or None before any fee history arrived
+
+        Priority fees are the median over the window of each block's reward
+        percentile; the base-fee trend is a least-squares slope over the window.
+        """
+        valid = self._valid()
+        if self.next_base_fee is None or not valid.any():
+            return None
+        numbers = self.numbers[valid]
+        base_fees = self.base_fees[valid]
+        with np.errstate(all="ignore"):
+            priority = np.nan_to_num(np.nanmedian(self.rewards[valid], axis=0), nan=0.0)
+            gas_used_ratio = np.nanmean(self.gas_used_ratios[valid])
+
+        slope = 0.0
+        if len(numbers) >= 2:
+            x = (numbers - numbers.mean()).astype(np.float64)
+            denominator = float(x @ x)
+            if denominator:
+                slope = float(x @ (base_fees - base_fees.mean()) / denominator)
+        next_base_fee = self.next_base_fee
+        projected = max(next_base_fee + slope * self.trend_horizon, 0.0)
+
+        # Max fee covers the base fee the transaction may land at
+        base_bounds = (
+            next_base_fee,
+            max(projected, next_base_fee),
+            next_base_fee * MAX_BASE_FEE_STEP ** self.trend_horizon,
+        )
+        tiers = [
+            GasTier(priority_fee_gwei=float(tip), max_fee_gwei=float(bound + tip))
+            for tip, bound in zip(priority, base_bounds)
+        ]
+        return GasEstimate(
+            base_fee_gwei=float(base_fees[np.argmax(numbers)]),
+            next_base_fee_gwei=next_base_fee,
+            base_fee_trend=slope,
+            projected_base_fee_gwei=projected,
+            gas_used_ratio=None if np.isnan(gas_used_ratio) else float(gas_used_ratio),
+            slow=tiers[0],
+            standard=tiers[1],
+            fast=tiers[2],
+            window_blocks=int(valid.sum()),
+            latest_block=self.latest,
+        )
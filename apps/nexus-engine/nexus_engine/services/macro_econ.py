@@ -5,34 +5,32 @@ from typing import Optional
 from datetime import datetime
 from bs4 import BeautifulSoup
 from nexus_engine.models.aggregated_data import MacroEconData
+from nexus_engine.transport import BROWSER_HEADERS, HttpTransport
 
 
 class MacroEconService:
     """Service for managing macroeconomic data from Investing.com and Google Finance"""
     
-    def __init__(self, region: str = "US"):
+    def __init__(self, region: str = "US", transport: Optional[HttpTransport] = None):
         """
         Initialize Macro Economic Service
         
         Args:
             region: Geographic region code (default: "US")
+            transport: Shared HTTP transport (creates a private one if None)
         """
         self.region = region
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._owns_transport = transport is None
+        self.transport = transport or HttpTransport()
     
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create HTTP session with headers"""
-        if self._session is None or self._session.closed:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            self._session = aiohttp.ClientSession(headers=headers)
-        return self._session
+        """Get the transport's shared HTTP session"""
+        return await self.transport.session()
     
     async def close(self) -> None:
-        """Close HTTP session"""
-        if self._session and not self._session.closed:
-            await self._session.close()
+        """Close HTTP session (only if the transport is private to this service)"""
+        if self._owns_transport:
+            await self.transport.close()
     
     async def _fetch_investing(self, region: str = "US") -> Optional[dict]:
         """
@@ -51,7 +49,7 @@ class MacroEconService:
             # Note: This is a simplified approach - Investing.com may require more complex scraping
             url = f"https://www.investing.com/economic-calendar/"
             
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            async with session.get(url, headers=BROWSER_HEADERS, timeout=self.transport.timeout(url, 10)) as response:
                 if response.status == 200:
                     html = await response.text()
                     soup = BeautifulSoup(html, 'lxml')
@@ -98,7 +96,7 @@ class MacroEconService:
                 for key, series_id in indicators.items():
                     try:
                         url = f"{base_url}?series_id={series_id}&api_key=free&file_type=json&limit=1&sort_order=desc"
-                        async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+                        async with session.get(url, headers=BROWSER_HEADERS, timeout=self.transport.timeout(url, 5)) as response:
                             if response.status == 200:
                                 result = await response.json()
                                 if 'observations' in result and len(result['observations']) > 0:
@@ -121,12 +119,24 @@ class MacroEconService:
             print(f"FRED API fetch error: {e}")
             return None
     
-    async def fetch_latest(self, region: str = "US") -> MacroEconData:
+    def fallback_data(self, region: str = "US") -> MacroEconData:
+        """Mock macroeconomic data used when every source fails"""
+        return MacroEconData(
+            gdp_growth=2.1,
+            inflation_rate=3.2,
+            unemployment_rate=3.7,
+            interest_rate=5.25,
+            region=region,
+            timestamp=datetime.utcnow()
+        )
+    
+    async def fetch_latest(self, region: str = "US", use_fallback: bool = True) -> Optional[MacroEconData]:
         """
         Fetch latest macroeconomic indicators from Investing.com and FRED API
         
         Args:
             region: Geographic region code
+            use_fallback: Return mock data if all sources fail (otherwise None)
             
         Returns:
             MacroEconData: Latest macroeconomic data
@@ -142,14 +152,7 @@ class MacroEconService:
         
         # If both fail, return mock data
         if not data:
-            return MacroEconData(
-                gdp_growth=2.1,
-                inflation_rate=3.2,
-                unemployment_rate=3.7,
-                interest_rate=5.25,
-                region=region,
-                timestamp=datetime.utcnow()
-            )
+            return self.fallback_data(region) if use_fallback else None
         
         return MacroEconData(
             gdp_growth=data.get('gdp_growth'),
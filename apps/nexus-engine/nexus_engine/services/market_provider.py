@@ -0,0 +1,184 @@
+"""Market Provider - runs blocking yfinance calls off the event loop"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+
+def to_yahoo_ticker(symbol: str) -> str:
+    """
+    Convert a Terminal-V symbol to a Yahoo Finance ticker
+
+    Args:
+        symbol: Trading symbol (e.g., 'BTCUSD', 'EURUSD', 'SPY')
+
+    Returns:
+        str: Yahoo Finance ticker (e.g., 'BTC-USD', 'EURUSD=X', 'SPY')
+    """
+    upper = symbol.upper()
+    if 'BTC' in upper:
+        return 'BTC-USD'
+    if 'EUR' in upper:
+        return 'EURUSD=X'
+    return symbol.replace('/', '')
+
+
+class YFinanceProvider:
+    """
+    Bounded thread-pool wrapper around yfinance
+
+    yfinance is synchronous and can block for hundreds of milliseconds, so every
+    call runs in a dedicated executor. A semaphore caps how many downloads are in
+    flight (including ones that outlived their deadline and are still running in
+    a worker thread), and each call is bounded by a deadline on the awaiting side.
+    Multiple tickers are fetched with a single ``yf.download`` call.
+    """
+
+    def __init__(self, max_workers: int = 4, max_concurrency: Optional[int] = None, deadline: float = 8.0):
+        """
+        Initialize yfinance provider
+
+        Args:
+            max_workers: Number of executor threads
+            max_concurrency: Maximum downloads in flight (default: max_workers)
+            deadline: Default per-call deadline in seconds
+        """
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency or max_workers
+        self.deadline = deadline
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._waiting = 0
+        self._running = 0
+        self._stats = {"calls": 0, "completed": 0, "timeouts": 0, "errors": 0}
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._last_wait = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="yfinance")
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def fetch_quotes(self, tickers: List[str], deadline: Optional[float] = None) -> Dict[str, dict]:
+        """
+        Fetch latest quotes for several Yahoo tickers in one download
+
+        Args:
+            tickers: Yahoo Finance tickers (see ``to_yahoo_ticker``)
+            deadline: Seconds to wait for the result, including time queued
+                for a free worker (default: provider deadline)
+
+        Returns:
+            Dict[str, dict]: ticker -> {'price', 'volume', 'change_24h'}; tickers
+            without data (or all of them on timeout/error) are omitted
+        """
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return {}
+        self._stats["calls"] += 1
+        semaphore = self._get_semaphore()
+        loop = asyncio.get_running_loop()
+
+        deadline = deadline or self.deadline
+        enqueued = time.perf_counter()
+        self._waiting += 1
+        try:
+            # The deadline covers queueing as well as the download itself
+            await asyncio.wait_for(semaphore.acquire(), timeout=deadline)
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            print(f"yfinance pool saturated, dropping request for {', '.join(tickers)}")
+            return {}
+        finally:
+            self._waiting -= 1
+        wait = time.perf_counter() - enqueued
+        self._last_wait = wait
+        self._wait_total += wait
+        self._wait_max = max(self._wait_max, wait)
+
+        self._running += 1
+        future = loop.run_in_executor(self._get_executor(), self._download, tickers)
+
+        def release(_):
+            # Release only when the worker thread is actually free again
+            self._running -= 1
+            semaphore.release()
+
+        future.add_done_callback(release)
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), timeout=max(deadline - wait, 0.0))
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            print(f"yfinance deadline exceeded for {', '.join(tickers)}")
+            return {}
+        except Exception as e:
+            self._stats["errors"] += 1
+            print(f"yfinance error for {', '.join(tickers)}: {e}")
+            return {}
+        self._stats["completed"] += 1
+        return result
+
+    @staticmethod
+    def _download(tickers: List[str]) -> Dict[str, dict]:
+        """Blocking download, executed in a worker thread"""
+        import yfinance as yf
+
+        data = yf.download(
+            tickers,
+            period='1d',
+            interval='1m',
+            group_by='ticker',
+            progress=False,
+            threads=False,
+        )
+        quotes: Dict[str, dict] = {}
+        if data is None or data.empty:
+            return quotes
+
+        multi = getattr(data.columns, 'nlevels', 1) > 1
+        for ticker in tickers:
+            try:
+                frame = data[ticker] if multi else data
+            except KeyError:
+                continue
+            closes = frame['Close'].dropna()
+            if closes.empty:
+                continue
+            current_price = float(closes.iloc[-1])
+            prev_close = float(closes.iloc[0])
+            change_24h = ((current_price - prev_close) / prev_close) * 100 if prev_close else 0.0
+            volume = 0.0
+            if 'Volume' in frame.columns:
+                volumes = frame['Volume'].dropna()
+                volume = float(volumes.iloc[-1]) if not volumes.empty else 0.0
+            quotes[ticker] = {
+                'price': current_price,
+                'volume': volume,
+                'change_24h': change_24h,
+            }
+        return quotes
+
+    def stats(self) -> dict:
+        """Return pool saturation counters (wait times in milliseconds)"""
+        calls = self._stats["calls"]
+        return {
+            **self._stats,
+            "queue_depth": self._waiting,
+            "running": self._running,
+            "max_concurrency": self.max_concurrency,
+            "wait_ms_last": self._last_wait * 1000,
+            "wait_ms_avg": (self._wait_total / calls * 1000) if calls else 0.0,
+            "wait_ms_max": self._wait_max * 1000,
+        }
+
+    def shutdown(self) -> None:
+        """Shut down the executor without waiting for running downloads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -2,24 +2,44 @@
 import asyncio
 import aiohttp
 import json
-from typing import Optional
+import time
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from nexus_engine.models.aggregated_data import MarketStreamData
+from nexus_engine.services.market_provider import YFinanceProvider, to_yahoo_ticker
+from nexus_engine.tick_buffer import SymbolHistory
+from nexus_engine.transport import HttpTransport
 
 
 class MarketStreamService:
     """Service for managing market stream data from CoinGecko, TradingView and Google Finance"""
     
-    def __init__(self, symbols: Optional[list] = None):
+    def __init__(
+        self,
+        symbols: Optional[list] = None,
+        market_provider: Optional[YFinanceProvider] = None,
+        transport: Optional[HttpTransport] = None,
+        history_ticks: int = 4096,
+    ):
         """
         Initialize Market Stream Service
         
         Args:
             symbols: List of trading symbols to track (default: ['BTCUSD', 'SPX', 'EURUSD'])
+            market_provider: Shared yfinance provider (creates a private one if None)
+            transport: Shared HTTP transport (creates a private one if None)
+            history_ticks: Raw ticks kept per symbol (bars and 24h stats are kept regardless)
         """
         self.symbols = symbols or ['BTCUSD', 'SPX', 'EURUSD']
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._owns_provider = market_provider is None
+        self.market_provider = market_provider or YFinanceProvider()
+        self._owns_transport = transport is None
+        self.transport = transport or HttpTransport()
         self._connected = False
+        # Fixed-size tick and OHLCV bar history per symbol, fed by every new quote
+        self.history_ticks = history_ticks
+        self.history: Dict[str, SymbolHistory] = {}
+        self._last_quote: Dict[str, Tuple[float, float]] = {}  # symbol -> (price, volume figure)
         # CoinGecko ID mapping for cryptocurrencies
         self.coingecko_ids = {
             'BTCUSD': 'bitcoin',
@@ -27,17 +47,17 @@ class MarketStreamService:
             'ETHUSD': 'ethereum',
             'ETH': 'ethereum',
         }
+        # Quote currencies accepted by CoinGecko's vs_currencies parameter
+        self.coingecko_vs_currencies = ('USD', 'EUR', 'GBP', 'JPY')
     
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create HTTP session"""
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
+        """Get the transport's shared HTTP session"""
+        return await self.transport.session()
     
     async def close(self) -> None:
-        """Close HTTP session"""
-        if self._session and not self._session.closed:
-            await self._session.close()
+        """Close HTTP session (only if the transport is private to this service)"""
+        if self._owns_transport:
+            await self.transport.close()
     
     async def _fetch_tradingview(self, symbol: str) -> Optional[dict]:
         """
@@ -54,7 +74,7 @@ class MarketStreamService:
             # TradingView public API endpoint
             url = f"https://symbol-search.tradingview.com/symbol_search/?text={symbol}&exchange=&lang=en&search_type=undefined&domain=production&sort_by_country=US"
             
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+            async with session.get(url, timeout=self.transport.timeout(url, 5)) as response:
                 if response.status == 200:
                     data = await response.json()
                     if data and len(data) > 0:
@@ -62,7 +82,7 @@ class MarketStreamService:
                         symbol_data = data[0]
                         # Try to get real-time quote
                         quote_url = f"https://scanner.tradingview.com/{symbol_data.get('exchange', '')}/{symbol_data.get('symbol', symbol)}"
-                        async with session.get(quote_url, timeout=aiohttp.ClientTimeout(total=5)) as quote_response:
+                        async with session.get(quote_url, timeout=self.transport.timeout(quote_url, 5)) as quote_response:
                             if quote_response.status == 200:
                                 quote_data = await quote_response.json()
                                 return quote_data
@@ -71,94 +91,84 @@ class MarketStreamService:
             print(f"TradingView fetch error for {symbol}: {e}")
             return None
     
-    async def _fetch_coingecko(self, symbol: str) -> Optional[dict]:
+    def _coingecko_pair(self, symbol: str) -> Optional[Tuple[str, str]]:
         """
-        Fetch cryptocurrency data from CoinGecko API (free, no API key required)
+        Map a symbol to a CoinGecko (coin id, vs currency) pair
         
         Args:
-            symbol: Trading symbol (e.g., 'BTCUSD', 'BTC')
+            symbol: Trading symbol (e.g., 'BTCUSD', 'ETHEUR', 'BTC')
             
         Returns:
-            dict: Market data or None if failed
+            tuple: (coin_id, vs_currency) or None if not a cryptocurrency
         """
-        try:
-            # Check if symbol is a cryptocurrency
-            coin_id = self.coingecko_ids.get(symbol.upper())
-            if not coin_id:
-                # Try to extract coin ID from symbol
-                if 'BTC' in symbol.upper():
-                    coin_id = 'bitcoin'
-                elif 'ETH' in symbol.upper():
-                    coin_id = 'ethereum'
-                else:
-                    return None  # Not a cryptocurrency, skip CoinGecko
-            
-            session = await self._get_session()
-            url = "https://api.coingecko.com/api/v3/simple/price"
-            params = {
-                "ids": coin_id,
-                "vs_currencies": "usd",
-                "include_24hr_change": "true",
-                "include_24hr_vol": "true"
-            }
-            
-            async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=5)) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if coin_id in data:
-                        coin_data = data[coin_id]
-                        return {
-                            'price': coin_data.get('usd', 0.0),
-                            'volume': coin_data.get('usd_24h_vol', 0.0),
-                            'change_24h': coin_data.get('usd_24h_change', 0.0),
-                            'symbol': symbol
-                        }
-            return None
-        except Exception as e:
-            print(f"CoinGecko fetch error for {symbol}: {e}")
-            return None
+        upper = symbol.upper().replace('/', '')
+        coin_id = self.coingecko_ids.get(upper)
+        if not coin_id:
+            # Try to extract coin ID from symbol
+            if 'BTC' in upper:
+                coin_id = 'bitcoin'
+            elif 'ETH' in upper:
+                coin_id = 'ethereum'
+            else:
+                return None  # Not a cryptocurrency, skip CoinGecko
+        vs_currency = 'usd'
+        for currency in self.coingecko_vs_currencies:
+            if upper.endswith(currency) and len(upper) > len(currency):
+                vs_currency = currency.lower()
+                break
+        return coin_id, vs_currency
     
-    async def _fetch_google_finance(self, symbol: str) -> Optional[dict]:
+    async def _fetch_coingecko_many(self, symbols: List[str]) -> Dict[str, dict]:
         """
-        Fetch data from Google Finance using yfinance (Yahoo Finance API)
+        Fetch several cryptocurrencies from CoinGecko in a single request
+        
+        CoinGecko's simple/price accepts comma-separated ``ids`` and
+        ``vs_currencies``, so the whole symbol set costs one upstream call.
         
         Args:
-            symbol: Trading symbol
+            symbols: Trading symbols (non-crypto symbols are ignored)
             
         Returns:
-            dict: Market data or None if failed
+            Dict[str, dict]: symbol -> market data for every symbol found
         """
+        pairs = {}
+        for symbol in symbols:
+            pair = self._coingecko_pair(symbol)
+            if pair:
+                pairs[symbol] = pair
+        if not pairs:
+            return {}
+        
         try:
-            import yfinance as yf
-            
-            # Convert symbol format if needed
-            ticker_symbol = symbol.replace('/', '')
-            if 'BTC' in symbol:
-                ticker_symbol = 'BTC-USD'
-            elif 'EUR' in symbol:
-                ticker_symbol = 'EURUSD=X'
-            
-            ticker = yf.Ticker(ticker_symbol)
-            info = ticker.info
+            session = await self._get_session()
+            url = "https://api.coingecko.com/api/v3/simple/price"
+            params = {
+                "ids": ",".join(sorted({coin_id for coin_id, _ in pairs.values()})),
+                "vs_currencies": ",".join(sorted({vs for _, vs in pairs.values()})),
+                "include_24hr_change": "true",
+                "include_24hr_vol": "true"
+            }
             
-            # Get current price and change
-            hist = ticker.history(period='1d', interval='1m')
-            if not hist.empty:
-                current_price = float(hist['Close'].iloc[-1])
-                prev_close = float(hist['Close'].iloc[0])
-                change_24h = ((current_price - prev_close) / prev_close) * 100
-                volume = float(hist['Volume'].iloc[-1]) if 'Volume' in hist.columns else 0.0
-                
-                return {
-                    'price': current_price,
-                    'volume': volume,
-                    'change_24h': change_24h,
-                    'symbol': symbol
-                }
-            return None
+            async with session.get(url, params=params, timeout=self.transport.timeout(url, 5)) as response:
+                if response.status != 200:
+                    return {}
+                data = await response.json()
         except Exception as e:
-            print(f"Google Finance fetch error for {symbol}: {e}")
-            return None
+            print(f"CoinGecko fetch error for {', '.join(pairs)}: {e}")
+            return {}
+        
+        results = {}
+        for symbol, (coin_id, vs) in pairs.items():
+            coin_data = data.get(coin_id)
+            if not coin_data or vs not in coin_data:
+                continue
+            results[symbol] = {
+                'price': coin_data.get(vs, 0.0),
+                'volume': coin_data.get(f'{vs}_24h_vol', 0.0),
+                'change_24h': coin_data.get(f'{vs}_24h_change', 0.0),
+                'symbol': symbol
+            }
+        return results
     
     async def connect(self) -> bool:
         """
@@ -174,60 +184,193 @@ class MarketStreamService:
         """Disconnect from data sources"""
         self._connected = False
         await self.close()
+        if self._owns_provider:
+            self.market_provider.shutdown()
     
-    async def fetch_latest(self, symbol: str = None) -> MarketStreamData:
+    async def fetch_quotes(self, symbols: List[str], include_tradingview: bool = True) -> Dict[str, dict]:
         """
-        Fetch latest market stream data from TradingView and Google Finance
+        Fetch raw quotes for many symbols with one upstream request per provider
+        
+        Priority order per symbol: CoinGecko (for crypto) -> Google Finance ->
+        TradingView. Each provider is called once for all symbols still missing.
         
         Args:
-            symbol: Symbol to fetch (default: first symbol from list)
+            symbols: Trading symbols
+            include_tradingview: Fall back to per-symbol TradingView lookups
             
         Returns:
-            MarketStreamData: Latest market data
+            Dict[str, dict]: symbol -> {'price', 'volume', 'change_24h', 'symbol'};
+            symbols no provider could serve are omitted
         """
-        target_symbol = symbol or self.symbols[0]
+        symbols = list(dict.fromkeys(symbols))
+        results: Dict[str, dict] = {}
         
-        # Priority order: CoinGecko (for crypto) -> Google Finance -> TradingView
-        data = None
-        
-        # Try CoinGecko first for cryptocurrencies (free, no API key, reliable)
-        if any(crypto in target_symbol.upper() for crypto in ['BTC', 'ETH', 'CRYPTO']):
-            data = await self._fetch_coingecko(target_symbol)
-        
-        # Fallback to Google Finance (yfinance) for stocks and forex
-        if not data:
-            data = await self._fetch_google_finance(target_symbol)
-        
-        # Fallback to TradingView if both fail
-        if not data:
-            tv_data = await self._fetch_tradingview(target_symbol)
-            if tv_data:
-                # Parse TradingView response
-                data = {
-                    'price': tv_data.get('lp', 0.0),  # Last price
-                    'volume': tv_data.get('volume', 0.0),
-                    'change_24h': tv_data.get('ch', 0.0),  # Change percentage
-                    'symbol': target_symbol
-                }
-        
-        # If both fail, return mock data
-        if not data:
-            return MarketStreamData(
-                symbol=target_symbol,
-                price=45000.0,
-                volume=1234567.89,
-                change_24h=2.5,
-                timestamp=datetime.utcnow()
-            )
+        # CoinGecko for cryptocurrencies (free, no API key, reliable) - one request
+        crypto = [s for s in symbols if any(c in s.upper() for c in ['BTC', 'ETH', 'CRYPTO'])]
+        if crypto:
+            results.update(await self._fetch_coingecko_many(crypto))
         
+        # Google Finance (yfinance) for stocks, forex and crypto misses - one download
+        missing = [s for s in symbols if s not in results]
+        if missing:
+            tickers = {s: to_yahoo_ticker(s) for s in missing}
+            quotes = await self.market_provider.fetch_quotes(list(tickers.values()))
+            for s, ticker in tickers.items():
+                if ticker in quotes:
+                    results[s] = {**quotes[ticker], 'symbol': s}
+        
+        # TradingView has no bulk endpoint; query the remainder concurrently
+        missing = [s for s in symbols if s not in results]
+        if missing and include_tradingview:
+            tv_results = await asyncio.gather(*(self._fetch_tradingview(s) for s in missing))
+            for s, tv_data in zip(missing, tv_results):
+                if tv_data:
+                    # Parse TradingView response
+                    results[s] = {
+                        'price': tv_data.get('lp', 0.0),  # Last price
+                        'volume': tv_data.get('volume', 0.0),
+                        'change_24h': tv_data.get('ch', 0.0),  # Change percentage
+                        'symbol': s
+                    }
+        
+        return results
+    
+    def fallback_data(self, symbol: str) -> MarketStreamData:
+        """Mock market data used when every provider fails"""
         return MarketStreamData(
-            symbol=data.get('symbol', target_symbol),
-            price=float(data.get('price', 0.0)),
-            volume=float(data.get('volume', 0.0)),
-            change_24h=float(data.get('change_24h', 0.0)),
+            symbol=symbol,
+            price=45000.0,
+            volume=1234567.89,
+            change_24h=2.5,
             timestamp=datetime.utcnow()
         )
     
+    async def fetch_many(
+        self,
+        symbols: Optional[List[str]] = None,
+        use_fallback: bool = True,
+    ) -> Dict[str, MarketStreamData]:
+        """
+        Fetch latest market data for many symbols at once
+        
+        Args:
+            symbols: Symbols to fetch (default: all tracked symbols)
+            use_fallback: Fill symbols no provider could serve with mock data
+                (otherwise they are omitted)
+            
+        Returns:
+            Dict[str, MarketStreamData]: symbol -> latest market data
+        """
+        symbols = symbols or self.symbols
+        quotes = await self.fetch_quotes(symbols)
+        now = datetime.utcnow()
+        now_ts = time.time()
+        results = {}
+        for symbol in symbols:
+            data = quotes.get(symbol)
+            if not data:
+                # If all providers fail, return mock data
+                if use_fallback:
+                    results[symbol] = self.fallback_data(symbol)
+                continue
+            price = float(data.get('price', 0.0))
+            volume = float(data.get('volume', 0.0))
+            history = self.record(symbol, now_ts, price, volume)
+            # Once the local history spans 24h it replaces the provider's figure
+            change_24h = history.change_24h()
+            results[symbol] = MarketStreamData(
+                symbol=data.get('symbol', symbol),
+                price=price,
+                volume=volume,
+                change_24h=change_24h if change_24h is not None else float(data.get('change_24h', 0.0)),
+                volume_24h=history.volume_24h() if history.covers_window() else None,
+                timestamp=now
+            )
+        return results
+    
+    def record(self, symbol: str, ts: float, price: float, volume_total: float) -> SymbolHistory:
+        """
+        Add a polled quote to the symbol's history
+        
+        Providers report a running volume figure rather than per-trade volume,
+        so the tick volume is the increase since the previous quote (an
+        approximation for rolling totals that can also shrink). Providers
+        also hand out the same cached quote to several polls; a quote whose
+        price and volume figure both equal the previous one is not a new
+        tick and is not recorded, so the latest tick's timestamp only
+        advances when the quote does.
+        
+        Args:
+            symbol: Trading symbol
+            ts: Epoch seconds of the quote
+            price: Quoted price
+            volume_total: Provider's volume figure
+            
+        Returns:
+            SymbolHistory: The symbol's history
+        """
+        history = self.history.get(symbol)
+        if history is None:
+            history = self.history[symbol] = SymbolHistory(tick_capacity=self.history_ticks)
+        previous = self._last_quote.get(symbol)
+        if previous == (price, volume_total):
+            return history
+        self._last_quote[symbol] = (price, volume_total)
+        previous_volume = previous[1] if previous is not None else None
+        tick_volume = volume_total - previous_volume if previous_volume is not None and volume_total > previous_volume else 0.0
+        history.add(ts, price, tick_volume)
+        return history
+    
+    def latest_tick(self, symbol: str) -> Optional[dict]:
+        """
+        Latest recorded tick of a symbol, with its per-tick volume
+        
+        Returns:
+            dict: {'symbol', 'price', 'volume', 'timestamp'} (epoch seconds),
+            or None if the symbol has no history
+        """
+        history = self.history.get(symbol)
+        if history is None or not len(history.ticks):
+            return None
+        tick = history.ticks.last(1)
+        return {
+            'symbol': symbol,
+            'price': float(tick['price'][0]),
+            'volume': float(tick['volume'][0]),
+            'timestamp': float(tick['timestamp'][0]),
+        }
+    
+    def bars(self, symbol: str, interval: str = "1m", n: Optional[int] = None) -> Optional[Dict[str, list]]:
+        """
+        Recent OHLCV bars of a symbol from its local history
+        
+        Args:
+            symbol: Trading symbol
+            interval: Bar interval ("1s", "1m", "5m" or "1h")
+            n: Bars to return, oldest first, including the bar in progress (default: all kept)
+            
+        Returns:
+            dict: Column name -> list of values, or None if the symbol has no history
+        """
+        history = self.history.get(symbol)
+        if history is None:
+            return None
+        return {key: values.tolist() for key, values in history.bars[interval].last(n).items()}
+    
+    async def fetch_latest(self, symbol: str = None, use_fallback: bool = True) -> Optional[MarketStreamData]:
+        """
+        Fetch latest market stream data from CoinGecko, Google Finance and TradingView
+        
+        Args:
+            symbol: Symbol to fetch (default: first symbol from list)
+            use_fallback: Return mock data if all providers fail (otherwise None)
+            
+        Returns:
+            MarketStreamData: Latest market data
+        """
+        target_symbol = symbol or self.symbols[0]
+        return (await self.fetch_many([target_symbol], use_fallback=use_fallback)).get(target_symbol)
+    
     async def stream_data(self):
         """
         Stream market data continuously
@@ -236,6 +379,7 @@ class MarketStreamService:
             MarketStreamData: Market data updates
         """
         while self._connected:
-            for symbol in self.symbols:
-                yield await self.fetch_latest(symbol)
+            batch = await self.fetch_many(self.symbols)
+            for data in batch.values():
+                yield data
             await asyncio.sleep(0.2)  # 200ms interval
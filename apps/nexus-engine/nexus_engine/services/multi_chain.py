@@ -0,0 +1,162 @@
+"""Multi-chain scanning - one independent BlockchainScannerService per EVM network"""
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from nexus_engine.models.aggregated_data import BlockchainData
+from nexus_engine.services.blockchain_scanner import BlockchainScannerService
+from nexus_engine.transport import HttpTransport
+
+
+@dataclass
+class ChainConfig:
+    """Endpoints and cadence of one EVM network"""
+    name: str
+    chain_id: int
+    endpoints: List[str]              # Public RPC endpoints, tried in order before any are measured
+    refresh_interval: float = 2.0     # Seconds between refreshes of this chain
+    rpc_url: Optional[str] = None     # Preferred private endpoint
+    rpc_key: Optional[str] = field(default=None, repr=False)
+    watch_transfers: bool = False     # The watched token contracts are Ethereum mainnet addresses
+
+
+DEFAULT_CHAINS: Dict[str, ChainConfig] = {
+    "ethereum": ChainConfig(
+        name="ethereum",
+        chain_id=1,
+        endpoints=["https://eth.llamarpc.com", "https://rpc.ankr.com/eth", "https://ethereum.publicnode.com"],
+        refresh_interval=2.0,  # ~12s blocks
+        watch_transfers=True,
+    ),
+    "arbitrum": ChainConfig(
+        name="arbitrum",
+        chain_id=42161,
+        endpoints=["https://arb1.arbitrum.io/rpc", "https://arbitrum-one.publicnode.com", "https://rpc.ankr.com/arbitrum"],
+        refresh_interval=1.0,  # ~0.25s blocks; the follower backfills between refreshes
+    ),
+    "optimism": ChainConfig(
+        name="optimism",
+        chain_id=10,
+        endpoints=["https://mainnet.optimism.io", "https://optimism.publicnode.com", "https://rpc.ankr.com/optimism"],
+        refresh_interval=1.0,  # 2s blocks
+    ),
+    "base": ChainConfig(
+        name="base",
+        chain_id=8453,
+        endpoints=["https://mainnet.base.org", "https://base.publicnode.com", "https://rpc.ankr.com/base"],
+        refresh_interval=1.0,  # 2s blocks
+    ),
+    "polygon": ChainConfig(
+        name="polygon",
+        chain_id=137,
+        endpoints=["https://polygon-rpc.com", "https://polygon-bor.publicnode.com", "https://rpc.ankr.com/polygon"],
+        refresh_interval=1.0,  # ~2s blocks
+    ),
+}
+
+# Primary network when none is configured
+DEFAULT_NETWORK = "ethereum"
+
+
+def resolve_chains(networks: Iterable[str], overrides: Optional[Dict[str, ChainConfig]] = None) -> List[ChainConfig]:
+    """
+    Look up chain configs by name
+
+    Blank names are skipped; if no name is left (e.g. an empty
+    BLOCKCHAIN_NETWORKS), DEFAULT_NETWORK is used.
+
+    Args:
+        networks: Network names, in order (the first is the primary network)
+        overrides: Configs replacing or extending DEFAULT_CHAINS
+
+    Returns:
+        list: One ChainConfig per known network, never empty
+
+    Raises:
+        ValueError: If a network has no config
+    """
+    known = {**DEFAULT_CHAINS, **(overrides or {})}
+    names = [n.strip().lower() for n in networks if n.strip()] or [DEFAULT_NETWORK]
+    configs = []
+    for name in dict.fromkeys(names):
+        if name not in known:
+            raise ValueError(f"Unknown network {name!r} (known: {', '.join(sorted(known))})")
+        configs.append(known[name])
+    return configs
+
+
+class MultiChainScanner:
+    """
+    Scanners for several EVM networks, one per chain
+
+    Each chain has its own scanner with its own endpoint pool, head follower
+    and gas oracle, so a slow or failing chain never delays another one. The
+    caller decides how chains are scheduled; the aggregator runs one refresh
+    task per chain.
+    """
+
+    def __init__(self, chains: Iterable[ChainConfig], transport: Optional[HttpTransport] = None, **scanner_options):
+        """
+        Initialize Multi-Chain Scanner
+
+        Args:
+            chains: Networks to scan (the first is the primary network)
+            transport: HTTP transport shared by all chains (creates a private one if None)
+            **scanner_options: Extra BlockchainScannerService options applied to every chain
+        """
+        self.chains: Dict[str, ChainConfig] = {chain.name: chain for chain in chains}
+        if not self.chains:
+            raise ValueError("MultiChainScanner needs at least one chain")
+        self._owns_transport = transport is None
+        self.transport = transport or HttpTransport()
+        self.scanners: Dict[str, BlockchainScannerService] = {
+            name: BlockchainScannerService(
+                rpc_url=chain.rpc_url,
+                rpc_key=chain.rpc_key,
+                network=name,
+                public_endpoints=chain.endpoints,
+                watch_transfers=chain.watch_transfers,
+                transport=self.transport,
+                **scanner_options,
+            )
+            for name, chain in self.chains.items()
+        }
+
+    @property
+    def primary(self) -> str:
+        return next(iter(self.chains))
+
+    @property
+    def networks(self) -> List[str]:
+        return list(self.chains)
+
+    def scanner(self, network: str) -> Optional[BlockchainScannerService]:
+        """Scanner of one network (None if it is not configured)"""
+        return self.scanners.get(network.lower())
+
+    async def fetch_latest(self, network: Optional[str] = None, use_fallback: bool = True) -> Optional[BlockchainData]:
+        """
+        Fetch latest data of one network
+
+        Args:
+            network: Network name (default: the primary network)
+            use_fallback: Return mock data if the network is unknown or its RPC calls fail
+        """
+        network = (network or self.primary).lower()
+        scanner = self.scanners.get(network)
+        if scanner is None:
+            return self.scanners[self.primary].fallback_data(network) if use_fallback else None
+        return await scanner.fetch_latest(use_fallback=use_fallback)
+
+    def fallback_data(self, network: Optional[str] = None) -> BlockchainData:
+        """Mock data for one network"""
+        network = (network or self.primary).lower()
+        return self.scanners.get(network, self.scanners[self.primary]).fallback_data(network)
+
+    async def close(self) -> None:
+        """Close the HTTP transport (only if it is private to this scanner)"""
+        if self._owns_transport:
+            await self.transport.close()
+
+    def stats(self) -> Dict[str, dict]:
+        """Endpoint pool, follower and oracle counters per network"""
+        return {name: scanner.stats() for name, scanner in self.scanners.items()}
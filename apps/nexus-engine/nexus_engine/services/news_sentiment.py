@@ -6,34 +6,32 @@ from typing import Optional, List
 from datetime import datetime
 from bs4 import BeautifulSoup
 from nexus_engine.models.aggregated_data import NewsSentimentData
+from nexus_engine.transport import BROWSER_HEADERS, HttpTransport
 
 
 class NewsSentimentService:
     """Service for managing news sentiment analysis from NewsAPI, Investing.com and Reddit"""
     
-    def __init__(self, newsapi_key: Optional[str] = None):
+    def __init__(self, newsapi_key: Optional[str] = None, transport: Optional[HttpTransport] = None):
         """
         Initialize News Sentiment Service
         
         Args:
             newsapi_key: NewsAPI key (optional - can use without key for limited access)
+            transport: Shared HTTP transport (creates a private one if None)
         """
         self.newsapi_key = newsapi_key or os.getenv('NEWSAPI_KEY')
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._owns_transport = transport is None
+        self.transport = transport or HttpTransport()
     
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create HTTP session with headers"""
-        if self._session is None or self._session.closed:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            self._session = aiohttp.ClientSession(headers=headers)
-        return self._session
+        """Get the transport's shared HTTP session"""
+        return await self.transport.session()
     
     async def close(self) -> None:
-        """Close HTTP session"""
-        if self._session and not self._session.closed:
-            await self._session.close()
+        """Close HTTP session (only if the transport is private to this service)"""
+        if self._owns_transport:
+            await self.transport.close()
     
     async def _fetch_newsapi(self) -> Optional[List[str]]:
         """
@@ -57,7 +55,7 @@ class NewsSentimentService:
                 "apiKey": self.newsapi_key
             }
             
-            async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            async with session.get(url, params=params, headers=BROWSER_HEADERS, timeout=self.transport.timeout(url, 10)) as response:
                 if response.status == 200:
                     data = await response.json()
                     if data.get('status') == 'ok' and 'articles' in data:
@@ -89,7 +87,7 @@ class NewsSentimentService:
                 url = f"https://www.reddit.com/r/{subreddit}/hot.json"
                 headers = {"User-Agent": "Terminal-V/1.0"}
                 
-                async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=5)) as response:
+                async with session.get(url, headers=headers, timeout=self.transport.timeout(url, 5)) as response:
                     if response.status == 200:
                         data = await response.json()
                         if 'data' in data and 'children' in data['data']:
@@ -114,7 +112,7 @@ class NewsSentimentService:
             session = await self._get_session()
             url = "https://www.investing.com/news/"
             
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            async with session.get(url, headers=BROWSER_HEADERS, timeout=self.transport.timeout(url, 10)) as response:
                 if response.status == 200:
                     html = await response.text()
                     soup = BeautifulSoup(html, 'lxml')
@@ -184,12 +182,27 @@ class NewsSentimentService:
             'keywords': keywords_found[:10]  # Top 10 keywords
         }
     
-    async def analyze_sentiment(self, articles: Optional[List[str]] = None) -> NewsSentimentData:
+    def fallback_data(self) -> NewsSentimentData:
+        """Neutral sentiment used when every news source fails"""
+        return NewsSentimentData(
+            sentiment_score=0.0,
+            sentiment_label="neutral",
+            article_count=0,
+            keywords=[],
+            timestamp=datetime.utcnow()
+        )
+    
+    async def analyze_sentiment(
+        self,
+        articles: Optional[List[str]] = None,
+        use_fallback: bool = True,
+    ) -> Optional[NewsSentimentData]:
         """
         Analyze news sentiment from Investing.com
         
         Args:
             articles: List of article texts to analyze (optional - will fetch if not provided)
+            use_fallback: Return neutral mock data if all fetches fail (otherwise None)
             
         Returns:
             NewsSentimentData: Sentiment analysis results
@@ -205,13 +218,7 @@ class NewsSentimentService:
         
         # If all fetches failed, return mock data
         if not articles:
-            return NewsSentimentData(
-                sentiment_score=0.0,
-                sentiment_label="neutral",
-                article_count=0,
-                keywords=[],
-                timestamp=datetime.utcnow()
-            )
+            return self.fallback_data() if use_fallback else None
         
         # Perform simple sentiment analysis
         sentiment_result = self._simple_sentiment_analysis(articles)
@@ -224,11 +231,14 @@ class NewsSentimentService:
             timestamp=datetime.utcnow()
         )
     
-    async def fetch_latest(self) -> NewsSentimentData:
+    async def fetch_latest(self, use_fallback: bool = True) -> Optional[NewsSentimentData]:
         """
         Fetch latest sentiment analysis from Investing.com
         
+        Args:
+            use_fallback: Return neutral mock data if all fetches fail (otherwise None)
+        
         Returns:
             NewsSentimentData: Latest sentiment data
         """
-        return await self.analyze_sentiment()
+        return await self.analyze_sentiment(use_fallback=use_fallback)
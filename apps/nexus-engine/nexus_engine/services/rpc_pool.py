@@ -0,0 +1,247 @@
+"""Latency-scored RPC endpoint pool with hedged requests and circuit breaking"""
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+
+from nexus_engine.tick_timer import percentiles
+
+T = TypeVar("T")
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half-open"
+
+
+class RpcPoolError(Exception):
+    """Raised when no endpoint could serve a request"""
+
+
+class EndpointHealth:
+    """Rolling latency, error rate and circuit state of one endpoint"""
+
+    def __init__(self, url: str, alpha: float, window: int):
+        self.url = url
+        self.alpha = alpha
+        self.ewma_latency: Optional[float] = None  # seconds
+        self.error_rate = 0.0
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.cooldown = 0.0
+        self.probing = False
+        self.requests = 0
+        self.failures = 0
+
+    def score(self) -> float:
+        """Lower is better; untried endpoints score 0 so they get measured"""
+        if self.ewma_latency is None:
+            # Never succeeded: worth measuring once, but not if it only failed
+            return float("inf") if self.failures else 0.0
+        # Penalize flaky endpoints even when they are fast
+        return self.ewma_latency * (1.0 + 4.0 * self.error_rate)
+
+    def p95(self) -> Optional[float]:
+        if len(self.latencies) < 5:
+            return None
+        return percentiles(self.latencies, (95,))["p95"]
+
+    def stats(self) -> dict:
+        p95 = self.p95()
+        return {
+            "state": self.state,
+            "ewma_ms": self.ewma_latency * 1000 if self.ewma_latency is not None else None,
+            "p95_ms": p95 * 1000 if p95 is not None else None,
+            "error_rate": round(self.error_rate, 4),
+            "requests": self.requests,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+        }
+
+
+class RpcEndpointPool:
+    """
+    Routes requests to the fastest healthy endpoint
+
+    - Each endpoint keeps an EWMA of latency and error rate; requests go to
+      the best-scoring endpoint whose circuit is closed.
+    - If the primary has not answered after its own p95 latency (clamped to
+      [hedge_min_delay, hedge_max_delay]), the same request is sent to the
+      next endpoint and the first success wins; a failure fails over to the
+      next endpoint immediately.
+    - After ``failure_threshold`` consecutive failures an endpoint's circuit
+      opens for ``cooldown`` seconds (doubling up to ``max_cooldown`` while it
+      keeps failing); then one probe request is let through (half-open) and a
+      success closes the circuit again.
+    """
+
+    def __init__(
+        self,
+        endpoints: List[str],
+        alpha: float = 0.2,
+        window: int = 64,
+        failure_threshold: int = 3,
+        cooldown: float = 15.0,
+        max_cooldown: float = 300.0,
+        hedge_min_delay: float = 0.05,
+        hedge_max_delay: float = 2.0,
+        default_hedge_delay: float = 0.5,
+        max_parallel: int = 2,
+    ):
+        """
+        Initialize RPC Endpoint Pool
+
+        Args:
+            endpoints: Endpoint URLs (order breaks ties before any are measured)
+            alpha: EWMA smoothing factor for latency and error rate
+            window: Latency samples kept per endpoint for p95
+            failure_threshold: Consecutive failures that open the circuit
+            cooldown: Seconds an open circuit stays open before a probe
+            max_cooldown: Upper bound for the doubling cooldown
+            hedge_min_delay: Lower bound for the hedge delay in seconds
+            hedge_max_delay: Upper bound for the hedge delay in seconds
+            default_hedge_delay: Hedge delay until the primary has enough samples
+            max_parallel: Most attempts in flight for one request
+        """
+        if not endpoints:
+            raise ValueError("RpcEndpointPool needs at least one endpoint")
+        self.endpoints: Dict[str, EndpointHealth] = {
+            url: EndpointHealth(url, alpha, window) for url in dict.fromkeys(endpoints)
+        }
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_max_delay = hedge_max_delay
+        self.default_hedge_delay = default_hedge_delay
+        self.max_parallel = max(1, max_parallel)
+        self._stats = {"requests": 0, "hedges": 0, "hedge_wins": 0, "failovers": 0, "exhausted": 0}
+
+    def _ranked(self) -> List[EndpointHealth]:
+        """Endpoints to try, best first (open circuits excluded until their probe is due)"""
+        now = time.monotonic()
+        usable = []
+        for health in self.endpoints.values():
+            if health.state == CIRCUIT_OPEN and now >= health.open_until:
+                health.state = CIRCUIT_HALF_OPEN
+            if health.state == CIRCUIT_OPEN or (health.state == CIRCUIT_HALF_OPEN and health.probing):
+                continue
+            usable.append(health)
+        if not usable:
+            # Everything is ejected: try the endpoint closest to reopening
+            return sorted(self.endpoints.values(), key=lambda h: h.open_until)[:1]
+        order = list(self.endpoints)
+        # Closed circuits first, then half-open probes; by score within each
+        return sorted(usable, key=lambda h: (h.state != CIRCUIT_CLOSED, h.score(), order.index(h.url)))
+
+    def hedge_delay(self, health: EndpointHealth) -> float:
+        """Seconds to wait on ``health`` before hedging to the next endpoint"""
+        p95 = health.p95()
+        if p95 is None:
+            return self.default_hedge_delay
+        return min(max(p95, self.hedge_min_delay), self.hedge_max_delay)
+
+    def _record(self, health: EndpointHealth, latency: Optional[float], ok: bool) -> None:
+        health.requests += 1
+        health.error_rate += health.alpha * ((0.0 if ok else 1.0) - health.error_rate)
+        if ok:
+            health.latencies.append(latency)
+            if health.ewma_latency is None:
+                health.ewma_latency = latency
+            else:
+                health.ewma_latency += health.alpha * (latency - health.ewma_latency)
+            health.consecutive_failures = 0
+            health.state = CIRCUIT_CLOSED
+            health.cooldown = 0.0
+            return
+        health.failures += 1
+        health.consecutive_failures += 1
+        if health.state == CIRCUIT_HALF_OPEN or health.consecutive_failures >= self.failure_threshold:
+            health.cooldown = min(health.cooldown * 2 or self.base_cooldown, self.max_cooldown)
+            health.state = CIRCUIT_OPEN
+            health.open_until = time.monotonic() + health.cooldown
+
+    def _record_slow(self, health: EndpointHealth, elapsed: float) -> None:
+        """Fold a lower bound on latency into the EWMA of an abandoned attempt"""
+        if health.ewma_latency is None or elapsed > health.ewma_latency:
+            health.ewma_latency = elapsed if health.ewma_latency is None else (
+                health.ewma_latency + health.alpha * (elapsed - health.ewma_latency)
+            )
+
+    async def _attempt(self, health: EndpointHealth, send: Callable[[str], Awaitable[T]]) -> T:
+        """Run one attempt against an endpoint and record its outcome"""
+        if health.state == CIRCUIT_HALF_OPEN:
+            health.probing = True
+        started = time.monotonic()
+        try:
+            result = await send(health.url)
+        except asyncio.CancelledError:
+            # Lost a hedge race: not a failure, but it was at least this slow
+            self._record_slow(health, time.monotonic() - started)
+            raise
+        except Exception:
+            self._record(health, None, ok=False)
+            raise
+        else:
+            self._record(health, time.monotonic() - started, ok=True)
+            return result
+        finally:
+            health.probing = False
+
+    async def request(self, send: Callable[[str], Awaitable[T]]) -> T:
+        """
+        Run ``send(endpoint_url)`` against the pool
+
+        Args:
+            send: Coroutine function performing the request against one
+                endpoint; it must raise on failure (including bad responses)
+
+        Returns:
+            The first successful result
+
+        Raises:
+            RpcPoolError: If every attempted endpoint failed
+        """
+        self._stats["requests"] += 1
+        loop = asyncio.get_running_loop()
+        queue = self._ranked()
+        primary = queue[0]
+        pending: Dict[asyncio.Task, EndpointHealth] = {}
+        errors: List[str] = []
+
+        def launch() -> float:
+            health = queue.pop(0)
+            pending[loop.create_task(self._attempt(health, send))] = health
+            return loop.time() + self.hedge_delay(health)
+
+        hedge_at = launch()
+        try:
+            while pending:
+                can_hedge = bool(queue) and len(pending) < self.max_parallel
+                timeout = max(0.0, hedge_at - loop.time()) if can_hedge else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Primary is slower than its usual p95: race a second endpoint
+                    self._stats["hedges"] += 1
+                    hedge_at = launch()
+                    continue
+                for task in done:
+                    health = pending.pop(task)
+                    if task.exception() is None:
+                        if health is not primary:
+                            self._stats["hedge_wins"] += 1
+                        return task.result()
+                    errors.append(f"{health.url}: {task.exception()}")
+                if queue and len(pending) < self.max_parallel:
+                    self._stats["failovers"] += 1
+                    hedge_at = launch()
+        finally:
+            for task in pending:
+                task.cancel()
+        self._stats["exhausted"] += 1
+        raise RpcPoolError("; ".join(errors) or "No RPC endpoints available")
+
+    def stats(self) -> dict:
+        """Return pool counters and per-endpoint health"""
+        return {**self._stats, "endpoints": {url: health.stats() for url, health in self.endpoints.items()}}
@@ -0,0 +1,178 @@
+"""Refresh Scheduler - per-source background refresh decoupled from the publish tick"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+@dataclass
+class Snapshot:
+    """Latest known value of one source"""
+    value: Any = None
+    updated_at: Optional[float] = None  # time.monotonic() of the last successful refresh
+    error: Optional[str] = None         # Error of the most recent attempt (None if it succeeded)
+    version: int = 0                    # Incremented on every successful refresh
+
+    def age(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds since the last successful refresh (None if never refreshed)"""
+        if self.updated_at is None:
+            return None
+        return (now if now is not None else time.monotonic()) - self.updated_at
+
+
+class SnapshotStore:
+    """Latest value per source; reads are O(1) dictionary lookups"""
+
+    def __init__(self):
+        self._snapshots: Dict[str, Snapshot] = {}
+
+    def get(self, name: str) -> Snapshot:
+        """Return the snapshot for a source (empty if it never reported)"""
+        snapshot = self._snapshots.get(name)
+        if snapshot is None:
+            snapshot = self._snapshots[name] = Snapshot()
+        return snapshot
+
+    def put(self, name: str, value: Any) -> None:
+        """Record a successful refresh"""
+        snapshot = self.get(name)
+        snapshot.value = value
+        snapshot.updated_at = time.monotonic()
+        snapshot.error = None
+        snapshot.version += 1
+
+    def fail(self, name: str, error: str) -> None:
+        """Record a failed refresh, keeping the last-known-good value"""
+        self.get(name).error = error
+
+
+@dataclass
+class SourceSchedule:
+    """Refresh cadence of one source"""
+    name: str
+    fetch: Callable[[], Awaitable[Any]]
+    interval: float                 # Seconds between refresh starts
+    deadline: Optional[float] = None
+    runs: int = 0
+    errors: int = 0
+    skipped: int = 0                # Refreshes skipped because the previous one overran
+    lag: float = 0.0                # How late the most recent refresh started
+    max_lag: float = 0.0
+    duration: float = 0.0           # Duration of the most recent refresh
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+
+class RefreshScheduler:
+    """
+    Runs each source in its own background task at its own cadence
+
+    Every source refreshes on a fixed-rate schedule and writes into a shared
+    SnapshotStore. A refresh that overruns its interval does not queue up extra
+    runs; the schedule skips ahead and the skipped count and start lag are
+    reported so a source that cannot keep up is visible.
+    """
+
+    def __init__(self, store: Optional[SnapshotStore] = None):
+        """
+        Initialize Refresh Scheduler
+
+        Args:
+            store: Snapshot store to write results into (creates one if None)
+        """
+        self.store = store or SnapshotStore()
+        self.schedules: Dict[str, SourceSchedule] = {}
+        self.running = False
+
+    def add(
+        self,
+        name: str,
+        fetch: Callable[[], Awaitable[Any]],
+        interval: float,
+        deadline: Optional[float] = None,
+    ) -> None:
+        """
+        Register a source
+
+        Args:
+            name: Source (section) name
+            fetch: Coroutine factory returning the new value, or None on failure
+            interval: Seconds between refreshes
+            deadline: Maximum seconds a single refresh may take (default: interval)
+        """
+        self.schedules[name] = SourceSchedule(name=name, fetch=fetch, interval=interval, deadline=deadline)
+        if self.running:
+            self._start(self.schedules[name])
+
+    def _start(self, schedule: SourceSchedule) -> None:
+        schedule.task = asyncio.create_task(self._run(schedule), name=f"refresh:{schedule.name}")
+
+    def start(self) -> None:
+        """Start one background task per source"""
+        if self.running:
+            return
+        self.running = True
+        for schedule in self.schedules.values():
+            self._start(schedule)
+
+    async def stop(self) -> None:
+        """Cancel all refresh tasks"""
+        self.running = False
+        tasks = [s.task for s in self.schedules.values() if s.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for schedule in self.schedules.values():
+            schedule.task = None
+
+    async def _run(self, schedule: SourceSchedule) -> None:
+        """Fixed-rate refresh loop for one source"""
+        next_due = time.monotonic()
+        while self.running:
+            started = time.monotonic()
+            schedule.lag = max(started - next_due, 0.0)
+            schedule.max_lag = max(schedule.max_lag, schedule.lag)
+            try:
+                value = await asyncio.wait_for(schedule.fetch(), timeout=schedule.deadline or schedule.interval)
+            except asyncio.TimeoutError:
+                schedule.errors += 1
+                self.store.fail(schedule.name, "deadline exceeded")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                schedule.errors += 1
+                self.store.fail(schedule.name, f"{type(e).__name__}: {e}")
+            else:
+                if value is None:
+                    schedule.errors += 1
+                    self.store.fail(schedule.name, "upstream unavailable")
+                else:
+                    self.store.put(schedule.name, value)
+            schedule.runs += 1
+
+            now = time.monotonic()
+            schedule.duration = now - started
+            next_due += schedule.interval
+            if next_due < now:
+                # Overran: skip the missed slots rather than bursting to catch up
+                missed = int((now - next_due) // schedule.interval) + 1
+                schedule.skipped += missed
+                next_due += missed * schedule.interval
+            await asyncio.sleep(next_due - now)
+
+    def stats(self) -> Dict[str, dict]:
+        """Return per-source cadence, lag and error counters (times in milliseconds)"""
+        now = time.monotonic()
+        stats = {}
+        for name, schedule in self.schedules.items():
+            age = self.store.get(name).age(now)
+            stats[name] = {
+                "interval_ms": schedule.interval * 1000,
+                "runs": schedule.runs,
+                "errors": schedule.errors,
+                "skipped": schedule.skipped,
+                "lag_ms": schedule.lag * 1000,
+                "max_lag_ms": schedule.max_lag * 1000,
+                "last_duration_ms": schedule.duration * 1000,
+                "age_ms": age * 1000 if age is not None else None,
+            }
+        return stats
@@ -0,0 +1,207 @@
+"""Large ERC-20 transfer scanner with local logsBloom prefiltering"""
+from collections import deque
+from typing import Deque, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from nexus_engine.keccak import keccak256
+from nexus_engine.models.aggregated_data import LargeTransfer
+from nexus_engine.services.chain_follower import BlockHeader, RpcBatch
+
+# keccak256("Transfer(address,address,uint256)")
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+
+
+class WatchedToken(NamedTuple):
+    """An ERC-20 contract to watch and the amount (in whole tokens) that counts as large"""
+    symbol: str
+    address: str
+    decimals: int
+    threshold: float
+
+
+DEFAULT_WATCHED_TOKENS = (
+    WatchedToken("USDC", "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48", 6, 1_000_000),
+    WatchedToken("USDT", "0xdac17f958d2ee523a2206206994597c13d831ec7", 6, 1_000_000),
+)
+
+BloomBits = Tuple[Tuple[int, int], ...]
+
+
+def bloom_bits(item: bytes) -> BloomBits:
+    """
+    The three (byte index, mask) pairs ``item`` sets in a 2048-bit logs bloom
+
+    Args:
+        item: Raw bytes of a log address (20) or topic (32)
+    """
+    digest = keccak256(item)
+    bits = []
+    for i in (0, 2, 4):
+        bit = ((digest[i] << 8) | digest[i + 1]) & 2047
+        # The bloom is big-endian: bit 0 is the lowest bit of the last byte
+        bits.append((255 - bit // 8, 1 << (bit % 8)))
+    return tuple(bits)
+
+
+def bloom_contains(bloom: bytes, bits: BloomBits) -> bool:
+    """True if every bit of ``bits`` is set in ``bloom`` (false positives possible)"""
+    return all(bloom[index] & mask for index, mask in bits)
+
+
+def merge_ranges(numbers: Iterable[int], max_gap: int, max_span: int) -> List[Tuple[int, int]]:
+    """
+    Group sorted block numbers into inclusive ranges
+
+    Args:
+        numbers: Candidate block numbers
+        max_gap: Non-candidate blocks tolerated inside one range
+        max_span: Most blocks covered by one range
+
+    Returns:
+        list: (first, last) pairs
+    """
+    ranges: List[Tuple[int, int]] = []
+    for number in sorted(set(numbers)):
+        if ranges:
+            first, last = ranges[-1]
+            if number - last - 1 <= max_gap and number - first < max_span:
+                ranges[-1] = (first, number)
+                continue
+        ranges.append((number, number))
+    return ranges
+
+
+class LargeTransferScanner:
+    """
+    Finds large Transfer events of watched tokens without scanning every block
+
+    Each header from the chain follower is tested against the precomputed
+    bloom bits of the Transfer topic and the watched contract addresses; the
+    test is a handful of byte lookups and needs no network I/O. Only blocks
+    that may contain a watched Transfer are queued, and ``scan()`` fetches
+    their logs with one ``eth_getLogs`` per merged block range, all ranges in
+    a single batched request.
+    """
+
+    def __init__(
+        self,
+        rpc_batch: RpcBatch,
+        tokens: Iterable[WatchedToken] = DEFAULT_WATCHED_TOKENS,
+        history: int = 50,
+        max_gap: int = 2,
+        max_span: int = 16,
+        max_pending: int = 256,
+    ):
+        """
+        Initialize Large Transfer Scanner
+
+        Args:
+            rpc_batch: Batched JSON-RPC call (e.g. BlockchainScannerService._rpc_batch)
+            tokens: Contracts to watch with their large-transfer thresholds
+            history: Most recent large transfers kept
+            max_gap: Non-candidate blocks allowed inside one eth_getLogs range
+            max_span: Most blocks per eth_getLogs range
+            max_pending: Candidate blocks queued at most (oldest dropped first)
+        """
+        self.rpc_batch = rpc_batch
+        self.tokens: Dict[str, WatchedToken] = {token.address.lower(): token for token in tokens}
+        self.max_gap = max_gap
+        self.max_span = max_span
+        self._topic_bits = bloom_bits(bytes.fromhex(TRANSFER_TOPIC[2:]))
+        self._address_bits = [bloom_bits(bytes.fromhex(address[2:])) for address in self.tokens]
+        self._pending: Deque[int] = deque(maxlen=max_pending)
+        self.transfers: Deque[LargeTransfer] = deque(maxlen=history)
+        self.stats = {"blocks": 0, "candidates": 0, "skipped": 0, "requests": 0, "ranges": 0, "logs": 0, "large": 0}
+
+    def matches(self, bloom: bytes) -> bool:
+        """True if the bloom may contain a Transfer log from a watched contract"""
+        if len(bloom) != 256 or not bloom_contains(bloom, self._topic_bits):
+            return False
+        return any(bloom_contains(bloom, bits) for bits in self._address_bits)
+
+    def observe(self, header: BlockHeader) -> None:
+        """Queue ``header`` for a log scan if its bloom may match (ChainFollower on_block)"""
+        self.stats["blocks"] += 1
+        if self.matches(header.logs_bloom):
+            self.stats["candidates"] += 1
+            self._pending.append(header.number)
+        else:
+            self.stats["skipped"] += 1
+
+    def rollback(self, keep_through: int) -> None:
+        """Forget candidates and transfers from orphaned blocks (ChainFollower on_rollback)"""
+        self._pending = deque((n for n in self._pending if n <= keep_through), maxlen=self._pending.maxlen)
+        kept = [t for t in self.transfers if t.block_number <= keep_through]
+        self.transfers.clear()
+        self.transfers.extend(kept)
+
+    async def scan(self) -> List[LargeTransfer]:
+        """
+        Fetch logs for the queued candidate blocks
+
+        Returns:
+            list: Large transfers found in this scan (also kept in ``transfers``)
+        """
+        if not self._pending:
+            return []
+        ranges = merge_ranges(self._pending, self.max_gap, self.max_span)
+        addresses = list(self.tokens)
+        calls = [
+            ("eth_getLogs", [{
+                "fromBlock": hex(first),
+                "toBlock": hex(last),
+                "address": addresses,
+                "topics": [TRANSFER_TOPIC],
+            }])
+            for first, last in ranges
+        ]
+        self.stats["requests"] += 1
+        self.stats["ranges"] += len(ranges)
+        results = await self.rpc_batch(calls)
+        if results is None:
+            # Keep the candidates for the next scan
+            return []
+
+        found: List[LargeTransfer] = []
+        retry: List[int] = []
+        for (first, last), logs in zip(ranges, results):
+            if logs is None:
+                retry.extend(n for n in self._pending if first <= n <= last)
+                continue
+            self.stats["logs"] += len(logs)
+            for log in logs:
+                transfer = self._parse(log)
+                if transfer is not None:
+                    found.append(transfer)
+        self._pending = deque(retry, maxlen=self._pending.maxlen)
+
+        found.sort(key=lambda t: (t.block_number, t.log_index))
+        self.stats["large"] += len(found)
+        self.transfers.extend(found)
+        return found
+
+    def _parse(self, log: dict) -> Optional[LargeTransfer]:
+        """Decode a Transfer log, returning it only if above the token's threshold"""
+        try:
+            token = self.tokens.get(log["address"].lower())
+            topics = log["topics"]
+            if token is None or len(topics) != 3 or topics[0] != TRANSFER_TOPIC or log.get("removed"):
+                return None
+            amount = int(log["data"], 16) / 10 ** token.decimals
+            if amount < token.threshold:
+                return None
+            return LargeTransfer(
+                token=token.symbol,
+                contract=token.address,
+                from_address="0x" + topics[1][-40:],
+                to_address="0x" + topics[2][-40:],
+                amount=amount,
+                block_number=int(log["blockNumber"], 16),
+                tx_hash=log["transactionHash"],
+                log_index=int(log["logIndex"], 16),
+            )
+        except (KeyError, ValueError, TypeError):
+            return None
+
+    def recent(self) -> List[LargeTransfer]:
+        """Most recent large transfers, newest first"""
+        return list(reversed(self.transfers))
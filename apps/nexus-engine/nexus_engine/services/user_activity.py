@@ -18,6 +18,16 @@ class UserActivityService:
         self.db_url = db_url
         self.db_credentials = db_credentials
     
+    def fallback_data(self) -> UserActivityData:
+        """Empty activity used until the first query completes"""
+        return UserActivityData(
+            active_users=0,
+            transactions_24h=0,
+            total_volume_24h=0.0,
+            top_symbols=[],
+            timestamp=datetime.utcnow()
+        )
+    
     async def fetch_latest(self) -> UserActivityData:
         """
         Fetch latest user activity metrics (stub)
@@ -0,0 +1,244 @@
+"""Per-symbol tick ring buffers with incremental OHLCV bars and rolling 24h stats"""
+import math
+from typing import Dict, Optional
+
+import numpy as np
+
+# Bar interval name -> seconds
+BAR_INTERVALS: Dict[str, int] = {"1s": 1, "1m": 60, "5m": 300, "1h": 3600}
+
+# Completed bars kept per interval: 5 minutes of 1s, 24h (+1) of 1m, 24h of 5m, a week of 1h
+DEFAULT_BAR_CAPACITY: Dict[str, int] = {"1s": 300, "1m": 1442, "5m": 288, "1h": 168}
+
+ROLLING_WINDOW = 24 * 3600.0
+
+
+class TickRing:
+    """Last ``capacity`` ticks (timestamp, price, volume) in preallocated arrays"""
+
+    __slots__ = ("capacity", "timestamps", "prices", "volumes", "count")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.prices = np.zeros(capacity, dtype=np.float64)
+        self.volumes = np.zeros(capacity, dtype=np.float64)
+        self.count = 0  # Ticks ever appended; slot = count % capacity
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def append(self, ts: float, price: float, volume: float) -> None:
+        slot = self.count % self.capacity
+        self.timestamps[slot] = ts
+        self.prices[slot] = price
+        self.volumes[slot] = volume
+        self.count += 1
+
+    def last(self, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Oldest-first copies of the last ``n`` ticks (default: all kept)"""
+        return _tail({"timestamp": self.timestamps, "price": self.prices, "volume": self.volumes},
+                     self.count, self.capacity, n)
+
+
+class BarSeries:
+    """
+    OHLCV bars of one interval, built as ticks arrive
+
+    The bar in progress lives in scalar fields; when a tick falls into a new
+    interval it is written into the ring of completed bars. Intervals without
+    ticks produce no bars.
+    """
+
+    __slots__ = ("interval", "capacity", "starts", "opens", "highs", "lows", "closes", "volumes",
+                 "count", "start", "open", "high", "low", "close", "volume")
+
+    def __init__(self, interval: int, capacity: int):
+        self.interval = interval
+        self.capacity = capacity
+        self.starts = np.zeros(capacity, dtype=np.float64)
+        self.opens = np.zeros(capacity, dtype=np.float64)
+        self.highs = np.zeros(capacity, dtype=np.float64)
+        self.lows = np.zeros(capacity, dtype=np.float64)
+        self.closes = np.zeros(capacity, dtype=np.float64)
+        self.volumes = np.zeros(capacity, dtype=np.float64)
+        self.count = 0  # Completed bars ever written
+        self.start = math.nan  # Bar in progress
+        self.open = self.high = self.low = self.close = self.volume = 0.0
+
+    def update(self, ts: float, price: float, volume: float) -> bool:
+        """
+        Fold one tick into the bars
+
+        Returns:
+            bool: True if the tick closed the previous bar
+        """
+        start = ts - ts % self.interval
+        if start == self.start:
+            if price > self.high:
+                self.high = price
+            elif price < self.low:
+                self.low = price
+            self.close = price
+            self.volume += volume
+            return False
+        closed = not math.isnan(self.start)  # NaN before the first tick
+        if closed:
+            slot = self.count % self.capacity
+            self.starts[slot] = self.start
+            self.opens[slot] = self.open
+            self.highs[slot] = self.high
+            self.lows[slot] = self.low
+            self.closes[slot] = self.close
+            self.volumes[slot] = self.volume
+            self.count += 1
+        self.start = start
+        self.open = self.high = self.low = self.close = price
+        self.volume = volume
+        return closed
+
+    def completed(self, index: int) -> int:
+        """Ring slot of completed bar number ``index`` (0 = first bar ever)"""
+        return index % self.capacity
+
+    def last(self, n: Optional[int] = None, include_current: bool = True) -> Dict[str, np.ndarray]:
+        """
+        Oldest-first copies of the last ``n`` bars
+
+        Args:
+            n: Bars to return (default: all kept)
+            include_current: Append the bar in progress
+        """
+        has_current = include_current and not math.isnan(self.start)
+        wanted = None if n is None else max(n - has_current, 0)
+        bars = _tail({
+            "start": self.starts, "open": self.opens, "high": self.highs,
+            "low": self.lows, "close": self.closes, "volume": self.volumes,
+        }, self.count, self.capacity, wanted)
+        if has_current:
+            current = {"start": self.start, "open": self.open, "high": self.high,
+                       "low": self.low, "close": self.close, "volume": self.volume}
+            bars = {key: np.append(values, current[key]) for key, values in bars.items()}
+        return bars
+
+
+def _tail(arrays: Dict[str, np.ndarray], count: int, capacity: int, n: Optional[int]) -> Dict[str, np.ndarray]:
+    """Oldest-first last ``n`` entries of ring arrays holding ``count`` appends"""
+    size = min(count, capacity)
+    n = size if n is None else min(n, size)
+    if n == 0:
+        return {key: values[:0].copy() for key, values in arrays.items()}
+    end = count % capacity
+    begin = (end - n) % capacity
+    if begin < end:
+        return {key: values[begin:end].copy() for key, values in arrays.items()}
+    return {key: np.concatenate((values[begin:], values[:end])) for key, values in arrays.items()}
+
+
+class SymbolHistory:
+    """
+    Bounded tick and bar history of one symbol
+
+    Memory is fixed at construction: the tick ring plus one bar ring per
+    interval. Rolling 24h volume is a running sum over 1m bars, adjusted
+    as bars enter and leave the window, and the 24h change is measured
+    against the open of the oldest 1m bar still inside it, so both cost O(1)
+    amortized per tick.
+    """
+
+    def __init__(
+        self,
+        tick_capacity: int = 4096,
+        bar_capacity: Optional[Dict[str, int]] = None,
+        window: float = ROLLING_WINDOW,
+    ):
+        """
+        Initialize Symbol History
+
+        Args:
+            tick_capacity: Raw ticks kept
+            bar_capacity: Completed bars kept per interval (overrides DEFAULT_BAR_CAPACITY)
+            window: Rolling window in seconds for change and volume
+        """
+        capacities = {**DEFAULT_BAR_CAPACITY, **(bar_capacity or {})}
+        self.window = window
+        # The rolling window walks the 1m bars, so they must cover it
+        capacities["1m"] = max(capacities["1m"], int(window // 60) + 2)
+        self.ticks = TickRing(tick_capacity)
+        self.bars: Dict[str, BarSeries] = {
+            name: BarSeries(seconds, capacities[name]) for name, seconds in BAR_INTERVALS.items()
+        }
+        self._minute = self.bars["1m"]
+        self._window_first = 0       # Index of the oldest completed 1m bar inside the window
+        self._window_volume = 0.0    # Volume of completed 1m bars inside the window
+        self.first_ts: Optional[float] = None
+        self.last_ts: Optional[float] = None
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the preallocated arrays"""
+        ticks = self.ticks.timestamps.nbytes * 3
+        return ticks + sum(series.starts.nbytes * 6 for series in self.bars.values())
+
+    def add(self, ts: float, price: float, volume: float = 0.0) -> None:
+        """
+        Append one tick and update every bar interval
+
+        Args:
+            ts: Epoch seconds (ticks must arrive in time order; older ones are dropped)
+            price: Trade or quote price
+            volume: Volume traded since the previous tick
+        """
+        if self.last_ts is not None and ts < self.last_ts:
+            return
+        if self.first_ts is None:
+            self.first_ts = ts
+        self.last_ts = ts
+        self.ticks.append(ts, price, volume)
+        for name, series in self.bars.items():
+            closed = series.update(ts, price, volume)
+            if closed and series is self._minute:
+                # The bar just closed enters the window sum
+                slot = series.completed(series.count - 1)
+                self._window_volume += series.volumes[slot]
+        self._expire(ts)
+
+    def _expire(self, now: float) -> None:
+        """Drop 1m bars that left the rolling window from the running sum"""
+        series = self._minute
+        cutoff = now - self.window
+        while self._window_first < series.count:
+            slot = series.completed(self._window_first)
+            if series.starts[slot] >= cutoff:
+                break
+            self._window_volume -= series.volumes[slot]
+            self._window_first += 1
+
+    def volume_24h(self) -> float:
+        """Volume over the rolling window (completed 1m bars plus the bar in progress)"""
+        return max(self._window_volume + self._minute.volume, 0.0)
+
+    def covers_window(self) -> bool:
+        """True once the history spans the whole rolling window"""
+        return self.first_ts is not None and self.last_ts - self.first_ts >= self.window - 60
+
+    def change_24h(self) -> Optional[float]:
+        """
+        Percent change over the rolling window
+
+        Returns None until the history spans the window, so callers can keep
+        a provider's figure until then.
+        """
+        if not self.covers_window():
+            return None
+        series = self._minute
+        if self._window_first < series.count:
+            reference = series.opens[series.completed(self._window_first)]
+        else:
+            reference = series.open
+        if not reference:
+            return None
+        return (series.close - reference) / reference * 100
+
+    def last_price(self) -> Optional[float]:
+        return self._minute.close if self.last_ts is not None else None
@@ -0,0 +1,112 @@
+"""Fixed-rate tick scheduling and per-tick timing statistics"""
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable
+
+
+OVERRUN_SKIP = "skip"
+OVERRUN_CATCH_UP = "catch-up"
+
+
+def percentiles(samples: Iterable[float], points: Iterable[float] = (50, 95, 99)) -> Dict[str, float]:
+    """Nearest-rank percentiles of a sample set ({"p50": ..., "p95": ...})"""
+    ordered = sorted(samples)
+    if not ordered:
+        return {f"p{p:g}": 0.0 for p in points}
+    last = len(ordered) - 1
+    return {f"p{p:g}": ordered[min(last, int(round(p / 100 * last)))] for p in points}
+
+
+class PhaseTimer:
+    """Rolling duration samples for one phase of a tick"""
+
+    def __init__(self, window: int = 1000):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.total += seconds
+        self.count += 1
+        self.max = max(self.max, seconds)
+
+    def stats(self) -> dict:
+        """Return timings in milliseconds"""
+        out = {k: v * 1000 for k, v in percentiles(self.samples).items()}
+        out["avg"] = (self.total / self.count * 1000) if self.count else 0.0
+        out["max"] = self.max * 1000
+        return out
+
+
+class FixedRateTicker:
+    """
+    Drift-free fixed-rate tick source based on the monotonic clock
+
+    Tick ``n`` is due at ``start + n * interval`` regardless of how long each
+    tick's work took, so the period does not drift. When work overruns the
+    next deadline the overrun policy decides what happens:
+
+    - ``skip``: drop the missed ticks and resume on the next future deadline
+    - ``catch-up``: fire the missed ticks back-to-back until on schedule again
+      (bounded by ``max_catch_up`` so a long stall does not cause a burst)
+    """
+
+    def __init__(self, interval: float, overrun_policy: str = OVERRUN_SKIP, max_catch_up: int = 5, window: int = 1000):
+        """
+        Initialize Fixed Rate Ticker
+
+        Args:
+            interval: Tick period in seconds
+            overrun_policy: "skip" or "catch-up"
+            max_catch_up: In catch-up mode, the most overdue ticks fired back-to-back
+            window: Number of recent jitter samples kept for percentiles
+        """
+        if overrun_policy not in (OVERRUN_SKIP, OVERRUN_CATCH_UP):
+            raise ValueError(f"Unknown overrun policy: {overrun_policy}")
+        self.interval = interval
+        self.overrun_policy = overrun_policy
+        self.max_catch_up = max_catch_up
+        self.jitter = PhaseTimer(window)
+        self.ticks = 0
+        self.overruns = 0
+        self.missed = 0
+        self._next: float = 0.0
+        self._started = False
+
+    async def wait(self) -> None:
+        """Sleep until the next tick is due and record its start jitter"""
+        now = time.monotonic()
+        if not self._started:
+            self._started = True
+            self._next = now
+        else:
+            self._next += self.interval
+            if now > self._next:
+                # The previous tick's work ran past this deadline
+                self.overruns += 1
+                behind = int((now - self._next) // self.interval)
+                if self.overrun_policy == OVERRUN_SKIP:
+                    self.missed += behind
+                    self._next += behind * self.interval
+                elif behind > self.max_catch_up:
+                    self.missed += behind - self.max_catch_up
+                    self._next += (behind - self.max_catch_up) * self.interval
+            else:
+                await asyncio.sleep(self._next - now)
+                now = time.monotonic()
+        self.jitter.record(max(now - self._next, 0.0))
+        self.ticks += 1
+
+    def stats(self) -> dict:
+        """Return tick counters and start-jitter percentiles (milliseconds)"""
+        return {
+            "interval_ms": self.interval * 1000,
+            "policy": self.overrun_policy,
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "missed": self.missed,
+            "jitter_ms": self.jitter.stats(),
+        }
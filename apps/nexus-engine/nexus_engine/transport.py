@@ -0,0 +1,191 @@
+"""Shared HTTP transport - one pooled aiohttp connector for all services"""
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Dict, Mapping, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+# Browser User-Agent for the HTML sources (Investing.com) that reject library clients
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+class HostStats:
+    """Request and connection counters for one host"""
+
+    __slots__ = ("requests", "errors", "new_connections", "reused_connections",
+                 "dns_hits", "dns_misses", "total_latency", "max_latency")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.dns_hits = 0
+        self.dns_misses = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def as_dict(self) -> dict:
+        connections = self.new_connections + self.reused_connections
+        completed = self.requests - self.errors
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "reuse_ratio": round(self.reused_connections / connections, 4) if connections else None,
+            "dns_cache_hits": self.dns_hits,
+            "dns_cache_misses": self.dns_misses,
+            "avg_ms": self.total_latency / completed * 1000 if completed > 0 else None,
+            "max_ms": self.max_latency * 1000,
+        }
+
+
+class HttpTransport:
+    """
+    One aiohttp session and connection pool shared by every service
+
+    - A single TCPConnector keeps idle connections alive between refreshes,
+      so sources polled every few seconds skip DNS, TCP and TLS setup.
+    - ``limit_per_host`` bounds connections per upstream. aiohttp does not
+      pipeline HTTP/1.1 requests, so this is also the most requests in flight
+      to one host; bursts queue for a pooled connection instead of opening
+      new ones (and tripping rate limits).
+    - DNS answers are cached for ``dns_ttl`` seconds.
+    - ``timeout(url)`` resolves per-host timeouts.
+    - Trace hooks count requests, latency, new vs reused connections and DNS
+      cache hits per host; see ``stats()``.
+
+    Services take it as a constructor argument; the session is created on
+    first use inside the running event loop.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 8,
+        dns_ttl: int = 300,
+        keepalive_timeout: float = 30.0,
+        default_timeout: float = 10.0,
+        connect_timeout: float = 5.0,
+        host_timeouts: Optional[Mapping[str, float]] = None,
+    ):
+        """
+        Initialize HTTP Transport
+
+        Args:
+            limit: Total connections across all hosts
+            limit_per_host: Connections (and so in-flight requests) per host
+            dns_ttl: Seconds DNS results are cached
+            keepalive_timeout: Seconds an idle connection is kept for reuse
+            default_timeout: Total request timeout for hosts without an override
+            connect_timeout: Timeout for acquiring and opening a connection
+            host_timeouts: Per-host total timeouts in seconds; they take precedence
+                over the defaults the services pass to ``timeout()``
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.default_timeout = default_timeout
+        self.connect_timeout = connect_timeout
+        self.host_timeouts = dict(host_timeouts or {})
+        self._timeouts: Dict[str, aiohttp.ClientTimeout] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._hosts: Dict[str, HostStats] = defaultdict(HostStats)
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        """Trace hooks feeding the per-host counters"""
+        trace = aiohttp.TraceConfig()
+        hosts = self._hosts
+
+        async def on_request_start(session, ctx: SimpleNamespace, params) -> None:
+            ctx.host = params.url.host or ""
+            ctx.started = time.monotonic()
+            hosts[ctx.host].requests += 1
+
+        async def on_request_end(session, ctx: SimpleNamespace, params) -> None:
+            elapsed = time.monotonic() - ctx.started
+            stats = hosts[ctx.host]
+            stats.total_latency += elapsed
+            stats.max_latency = max(stats.max_latency, elapsed)
+
+        async def on_request_exception(session, ctx: SimpleNamespace, params) -> None:
+            hosts[ctx.host].errors += 1
+
+        async def on_connection_create_end(session, ctx: SimpleNamespace, params) -> None:
+            hosts[ctx.host].new_connections += 1
+
+        async def on_connection_reuseconn(session, ctx: SimpleNamespace, params) -> None:
+            hosts[ctx.host].reused_connections += 1
+
+        async def on_dns_cache_hit(session, ctx: SimpleNamespace, params) -> None:
+            hosts[params.host].dns_hits += 1
+
+        async def on_dns_cache_miss(session, ctx: SimpleNamespace, params) -> None:
+            hosts[params.host].dns_misses += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_end.append(on_request_end)
+        trace.on_request_exception.append(on_request_exception)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace
+
+    async def session(self) -> aiohttp.ClientSession:
+        """Get or create the shared session (must be called inside the event loop)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_ttl,
+                use_dns_cache=True,
+                keepalive_timeout=self.keepalive_timeout,
+                enable_cleanup_closed=True,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.default_timeout, connect=self.connect_timeout),
+                trace_configs=[self._trace_config()],
+            )
+        return self._session
+
+    def timeout(self, url: str, default: Optional[float] = None) -> aiohttp.ClientTimeout:
+        """
+        Timeout for a request to ``url``
+
+        Args:
+            url: Request URL
+            default: Total timeout when the host has no override (default: default_timeout)
+
+        Returns:
+            aiohttp.ClientTimeout: Cached per (host, default) pair
+        """
+        host = urlsplit(str(url)).hostname or ""
+        total = self.host_timeouts.get(host, default if default is not None else self.default_timeout)
+        key = f"{host}:{total}"
+        timeout = self._timeouts.get(key)
+        if timeout is None:
+            timeout = self._timeouts[key] = aiohttp.ClientTimeout(total=total, connect=min(self.connect_timeout, total))
+        return timeout
+
+    async def close(self) -> None:
+        """Close the session and every pooled connection"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    def stats(self) -> dict:
+        """Return pool settings, open connections and per-host counters"""
+        connector = self._session.connector if self._session and not self._session.closed else None
+        return {
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "open": bool(connector),
+            "hosts": {host: stats.as_dict() for host, stats in sorted(self._hosts.items())},
+        }
@@ -0,0 +1,54 @@
+"""DataAggregatorService section snapshots with scripted sources"""
+import asyncio
+
+from nexus_engine.services.aggregator import DataAggregatorService
+
+
+def scripted(service: DataAggregatorService):
+    """Serve each section's fallback data, recording (section, region, network) per fetch"""
+    calls = []
+
+    def fetchers(region, network):
+        fallbacks = service._fallbacks(region, network)
+
+        def fetch(name):
+            async def run():
+                calls.append((name, region, network))
+                value = fallbacks[name]
+                return value() if callable(value) else value
+            return run
+        return {name: fetch(name) for name in fallbacks}
+
+    service._fetchers = fetchers
+    return calls
+
+
+def test_other_region_uses_its_own_snapshot():
+    service = DataAggregatorService(macro_region="US")
+    calls = scripted(service)
+
+    async def scenario():
+        await service.aggregate()
+        default = service.snapshots.get("macro_econ").value
+        data = await service.aggregate(region="EU")
+        assert ("macro_econ", "EU", service.network) in calls
+        assert data.macro_econ.region == "EU"
+        # The configured region's snapshot is untouched
+        assert service.snapshots.get("macro_econ").value is default
+        assert service.snapshots.get("macro_econ@EU").value is not None
+    asyncio.run(scenario())
+
+
+def test_scheduled_reads_fetch_only_scoped_sections():
+    service = DataAggregatorService(macro_region="US")
+    calls = scripted(service)
+
+    async def scenario():
+        await service.aggregate()
+        calls.clear()
+        service.scheduler.running = True
+        await service.aggregate()
+        assert calls == []
+        await service.aggregate(region="EU")
+        assert calls == [("macro_econ", "EU", service.network)]
+    asyncio.run(scenario())
@@ -0,0 +1,71 @@
+"""AlertEngine against a brute-force scan of every rule"""
+import numpy as np
+import pytest
+
+from nexus_engine.alerts import AlertEngine
+
+
+def test_matches_brute_force():
+    rng = np.random.default_rng(6)
+    engine = AlertEngine(capacity=8)
+    symbols = ["BTCUSD", "SPX"]
+    rules = {}  # alert id -> (symbol, level, direction)
+    prices = {symbol: 100.0 for symbol in symbols}
+    engine.evaluate_batch(prices)
+    for symbol in symbols:
+        levels = rng.uniform(80, 120, size=500)
+        directions = rng.choice(["above", "below"], size=500).tolist()
+        for alert_id, level, direction in zip(engine.add_many("u", symbol, levels, directions).tolist(), levels, directions):
+            rules[alert_id] = (symbol, float(level), direction)
+    removed = rng.choice(list(rules), size=50, replace=False).tolist()
+    for alert_id in removed:
+        assert engine.remove(alert_id)
+        del rules[alert_id]
+    for _ in range(200):
+        symbol = symbols[int(rng.integers(len(symbols)))]
+        previous, price = prices[symbol], float(np.clip(prices[symbol] * np.exp(rng.normal(0, 0.02)), 70, 130))
+        prices[symbol] = price
+        expected = {
+            alert_id for alert_id, (s, level, direction) in rules.items()
+            if s == symbol and (
+                (direction == "above" and previous < level <= price)
+                or (direction == "below" and price <= level < previous)
+            )
+        }
+        fired = set(engine.evaluate(symbol, price).tolist())
+        assert fired == expected
+        for alert_id in fired:
+            del rules[alert_id]
+    events = engine.drain()
+    assert len(events) == engine.stats["fired"]
+    assert all(event["user_id"] == "u" and event["key"] is None for event in events)
+
+
+def test_registered_alert_fires_once_with_its_key():
+    engine = AlertEngine()
+    engine.evaluate("BTCUSD", 100.0)
+    record = engine.register("k", {"user_id": "u1", "symbol": "BTCUSD", "level": 105.0})
+    assert record["direction"] == "above"
+    # Replays of a live key are no-ops
+    assert engine.register("k", record) == record
+    assert len(engine.evaluate("BTCUSD", 106.0)) == 1
+    assert engine.take_retired() == ["k"]
+    assert len(engine.evaluate("BTCUSD", 100.0)) == 0
+    assert len(engine.evaluate("BTCUSD", 106.0)) == 0
+    (event,) = engine.drain()
+    assert (event["key"], event["price"], event["previous_price"]) == ("k", 106.0, 100.0)
+
+
+def test_percent_alert_and_unregister():
+    engine = AlertEngine()
+    with pytest.raises(ValueError):
+        engine.register("p", {"user_id": "u1", "symbol": "SPX", "kind": "percent", "percent": -2.0})
+    engine.evaluate("SPX", 50.0)
+    record = engine.register("p", {"user_id": "u1", "symbol": "SPX", "kind": "percent", "percent": -2.0})
+    assert record["reference"] == 50.0
+    engine.register("q", {"user_id": "u2", "symbol": "SPX", "level": 48.0, "direction": "below"})
+    assert engine.unregister("q")
+    assert not engine.unregister("q")
+    assert engine.evaluate("SPX", 48.0).tolist() == [0]
+    with pytest.raises(ValueError):
+        engine.register("r", {"user_id": "u1", "symbol": "SPX", "kind": "trailing"})
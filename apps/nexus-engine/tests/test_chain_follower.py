@@ -0,0 +1,136 @@
+"""ChainFollower: head following, backfill and reorgs against a scripted chain"""
+import asyncio
+from typing import Optional
+
+from nexus_engine.services.chain_follower import BlockHeader, ChainFollower, HeaderRing
+
+
+def block_hash(number: int, fork: str) -> str:
+    return "0x" + f"{fork}{number:x}".encode().hex().rjust(64, "0")
+
+
+def make_block(number: int, fork: str = "a", parent_fork: Optional[str] = None, tx_count: int = 10) -> dict:
+    """eth_getBlockByNumber result; ``parent_fork`` defaults to the block's own fork"""
+    return {
+        "number": hex(number),
+        "hash": block_hash(number, fork),
+        "parentHash": block_hash(number - 1, parent_fork or fork),
+        "timestamp": hex(1_700_000_000 + 12 * number),
+        "gasUsed": hex(15_000_000),
+        "gasLimit": hex(30_000_000),
+        "baseFeePerGas": hex(20 * 10**9 + number),
+        "transactions": ["0x00"] * tx_count,
+    }
+
+
+class Chain:
+    """Canonical blocks by number, served through a batched RPC callable"""
+
+    def __init__(self, blocks):
+        self.blocks = {int(block["number"], 16): block for block in blocks}
+        self.requested = []
+
+    async def rpc_batch(self, calls):
+        numbers = [int(params[0], 16) for _, params in calls]
+        self.requested.extend(numbers)
+        return [self.blocks.get(number) for number in numbers]
+
+
+def follower_for(chain: Chain, **kwargs):
+    rollbacks = []
+    follower = ChainFollower(chain.rpc_batch, on_rollback=rollbacks.append, **kwargs)
+    return follower, rollbacks
+
+
+def ingest(follower: ChainFollower, *blocks: dict) -> None:
+    async def run():
+        for block in blocks:
+            await follower.ingest(block)
+    asyncio.run(run())
+
+
+def test_follows_head_without_rpc_calls():
+    blocks = [make_block(n) for n in range(1, 6)]
+    chain = Chain(blocks)
+    follower, rollbacks = follower_for(chain)
+    ingest(follower, *blocks)
+    assert follower.ring.head == 5
+    assert len(follower.ring) == 5
+    assert chain.requested == []
+    assert follower.stats["reorgs"] == 0 and rollbacks == []
+
+
+def test_backfills_missed_blocks():
+    chain = Chain([make_block(n) for n in range(1, 8)])
+    follower, _ = follower_for(chain, batch_size=2)
+    ingest(follower, chain.blocks[1], chain.blocks[7])
+    assert sorted(chain.requested) == [2, 3, 4, 5, 6]
+    assert follower.ring.head == 7 and len(follower.ring) == 7
+    assert follower.stats["backfilled"] == 5
+
+
+def test_reorg_replaces_orphaned_headers():
+    old = [make_block(n) for n in range(1, 6)]
+    # Fork "b" branches off after block 3 and overtakes the old head
+    new = old[:3] + [make_block(4, "b", parent_fork="a"), make_block(5, "b"), make_block(6, "b")]
+    chain = Chain(new)
+    follower, rollbacks = follower_for(chain)
+    ingest(follower, *old)
+    ingest(follower, chain.blocks[6])
+    ring = follower.ring
+    assert ring.head == 6 and len(ring) == 6
+    assert [ring.hash_at(n) for n in range(1, 7)] == [BlockHeader.from_rpc(chain.blocks[n]).hash for n in range(1, 7)]
+    assert rollbacks == [3]
+    assert follower.stats["reorgs"] == 1 and follower.stats["max_reorg_depth"] == 2
+    assert follower.metrics()["reorg_count"] == 1
+
+
+def test_same_height_replacement():
+    old = [make_block(n) for n in range(1, 4)]
+    follower, rollbacks = follower_for(Chain(old))
+    ingest(follower, *old, make_block(3, "b", parent_fork="a"))
+    assert follower.ring.head == 3
+    assert follower.ring.hash_at(3) == BlockHeader.from_rpc(make_block(3, "b")).hash
+    assert rollbacks == [2] and follower.stats["max_reorg_depth"] == 1
+
+
+def test_reorg_below_window_resets_ring():
+    old = [make_block(n) for n in range(1, 11)]
+    # Fork "b" branches off at block 1, deeper than the 4-header window
+    new = [make_block(1)] + [make_block(2, "b", parent_fork="a")] + [make_block(n, "b") for n in range(3, 11)]
+    chain = Chain(new)
+    follower, _ = follower_for(chain, capacity=4)
+    ingest(follower, *old)
+    ingest(follower, chain.blocks[10])
+    ring = follower.ring
+    assert ring.head == 10
+    assert all(ring.hash_at(n) == BlockHeader.from_rpc(chain.blocks[n]).hash for n in range(ring.oldest, 11))
+    assert follower.stats["resets"] == 1
+
+
+def test_gap_beyond_max_backfill_restarts_window():
+    chain = Chain([make_block(n) for n in range(1, 101)])
+    follower, _ = follower_for(chain, max_backfill=8)
+    ingest(follower, chain.blocks[1], chain.blocks[100])
+    # Only the last 8 missed blocks are fetched; 2..91 are skipped
+    assert sorted(chain.requested) == list(range(92, 100))
+    assert follower.ring.oldest == 92 and follower.ring.head == 100
+    assert follower.stats["skipped"] == 90 and follower.stats["resets"] == 1
+
+
+def test_ring_window_sums_match_rescan():
+    ring = HeaderRing(capacity=8)
+    headers = [BlockHeader.from_rpc(make_block(n, tx_count=n)) for n in range(1, 21)]
+    for header in headers:
+        ring.append(header)
+    # Eviction leaves 13..20 in the window, the truncation 13..17
+    assert ring.truncate(17) == 3
+    window = headers[12:17]
+    metrics = ring.metrics()
+    assert metrics["window_blocks"] == len(window)
+    assert metrics["gas_used_ratio"] == 0.5
+    assert metrics["base_fee_gwei"] == window[-1].base_fee_gwei
+    assert metrics["block_time_avg"] == 12
+    assert metrics["block_time_stddev"] == 0
+    # Transactions after the oldest block over the window's span
+    assert metrics["tps"] == sum(h.tx_count for h in window[1:]) / (12 * (len(window) - 1))
@@ -0,0 +1,72 @@
+"""Round trips of broadcaster frames through every encoding"""
+import json
+from datetime import datetime
+
+import pytest
+
+from nexus_engine.codec import ENCODINGS, CodecError, decode_frame, encode_frame, frame_info
+from nexus_engine.models.aggregated_data import (
+    AggregatedData,
+    BlockchainData,
+    MacroEconData,
+    MarketStreamData,
+    NewsSentimentData,
+    SectionStatus,
+    UserActivityData,
+)
+
+# Binary encodings carry timestamps as epoch milliseconds
+TS = datetime(2024, 1, 2, 3, 4, 5, 123000)
+
+
+def make_snapshot() -> AggregatedData:
+    return AggregatedData(
+        market_stream=MarketStreamData(symbol="BTCUSD", price=65000.5, volume=1.2e9, change_24h=-1.25, timestamp=TS),
+        macro_econ=MacroEconData(gdp_growth=2.1, inflation_rate=3.2, unemployment_rate=3.9, interest_rate=5.25, region="US", timestamp=TS),
+        news_sentiment=NewsSentimentData(
+            sentiment_score=0.12, sentiment_label="neutral", article_count=42, keywords=["bitcoin", "fed"], timestamp=TS,
+        ),
+        blockchain=BlockchainData(network="ethereum", block_height=21000000, transaction_count=150, gas_price=12.5, timestamp=TS),
+        user_activity=UserActivityData(
+            active_users=1200, transactions_24h=5400, total_volume_24h=1.5e6, top_symbols=["BTCUSD", "SPX"], timestamp=TS,
+        ),
+        sections={"market_stream": SectionStatus(status="fresh", age_ms=120.0)},
+        aggregated_at=TS,
+    )
+
+
+def expected(data: dict, encoding: str) -> dict:
+    """What subscribers decode: JSON frames keep str(datetime), binary ones ISO 8601"""
+    if encoding == "json":
+        return json.loads(json.dumps(data, default=str))
+    return json.loads(json.dumps(data, default=datetime.isoformat))
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_snapshot_round_trip(encoding):
+    snapshot = make_snapshot().model_dump()
+    assert decode_frame(encode_frame(snapshot, encoding)) == expected(snapshot, encoding)
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_keyframe_round_trip(encoding):
+    keyframe = {"type": "keyframe", "seq": 1, "data": make_snapshot().model_dump()}
+    assert decode_frame(encode_frame(keyframe, encoding)) == expected(keyframe, encoding)
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_delta_round_trip(encoding):
+    envelope = {"type": "delta", "seq": 3, "base": 2, "patch": {"market_stream": {"price": 1.5, "volume_24h": None}}}
+    assert decode_frame(encode_frame(envelope, encoding)) == envelope
+
+
+def test_frame_info():
+    snapshot = make_snapshot().model_dump()
+    assert frame_info(encode_frame(snapshot)) is None
+    for encoding in ("msgpack", "struct"):
+        assert frame_info(encode_frame(snapshot, encoding)) == {"encoding": encoding, "schema_version": snapshot["version"]}
+
+
+def test_truncated_frame():
+    with pytest.raises(CodecError):
+        frame_info(encode_frame(make_snapshot().model_dump(), "struct")[:4])
@@ -0,0 +1,67 @@
+"""RollingCorrelation against numpy over the same window"""
+import math
+
+import numpy as np
+import pytest
+
+from nexus_engine.correlation import SECONDS_PER_YEAR, RollingCorrelation, decode_matrix
+
+SYMBOLS = ["BTCUSD", "SPX", "EURUSD", "ETHUSD"]
+
+
+def feed(tracker: RollingCorrelation, prices: np.ndarray, interval: float = 1.0) -> None:
+    for t, row in enumerate(prices):
+        tracker.update(dict(zip(SYMBOLS, row.tolist())), 1_700_000_000.0 + interval * t)
+
+
+def correlated_prices(rng, ticks: int) -> np.ndarray:
+    common = rng.normal(0, 0.01, size=(ticks, 1))
+    returns = common * np.array([1.0, 0.5, -0.3, 1.2]) + rng.normal(0, 0.005, size=(ticks, len(SYMBOLS)))
+    return 100.0 * np.exp(np.cumsum(returns, axis=0))
+
+
+@pytest.mark.parametrize("ticks", [30, 1000])
+def test_matches_numpy_over_window(ticks):
+    rng = np.random.default_rng(3)
+    prices = correlated_prices(rng, ticks)
+    tracker = RollingCorrelation(SYMBOLS, window=100, resync_interval=10**6)
+    feed(tracker, prices)
+    returns = np.diff(np.log(prices), axis=0)[-100:]
+    assert tracker.samples == len(returns)
+    np.testing.assert_allclose(tracker.covariance(), np.cov(returns, rowvar=False), rtol=1e-7, atol=1e-12)
+    np.testing.assert_allclose(tracker.correlation(), np.corrcoef(returns, rowvar=False), rtol=1e-6)
+    np.testing.assert_allclose(tracker.volatility(), returns.std(axis=0, ddof=1) * math.sqrt(SECONDS_PER_YEAR), rtol=1e-6)
+
+
+def test_volatility_uses_measured_spacing():
+    rng = np.random.default_rng(4)
+    prices = correlated_prices(rng, 200)
+    fast, slow = RollingCorrelation(SYMBOLS, window=100), RollingCorrelation(SYMBOLS, window=100)
+    feed(fast, prices, interval=1.0)
+    feed(slow, prices, interval=4.0)
+    assert slow.mean_interval == 4.0
+    np.testing.assert_allclose(fast.volatility(), slow.volatility() * 2, rtol=1e-9)
+
+
+def test_sampling_interval_and_missing_prices():
+    tracker = RollingCorrelation(SYMBOLS, window=10, sample_interval=1.0)
+    assert not tracker.update({"BTCUSD": 100.0, "SPX": 50.0}, 0.0)
+    assert not tracker.update({"BTCUSD": 101.0}, 0.5)
+    assert tracker.update({"BTCUSD": 102.0, "SPX": 0.0, "UNKNOWN": 1.0}, 1.0)
+    # Missing or non-positive prices contribute a zero return
+    assert tracker.returns[0].tolist() == [math.log(102.0 / 100.0), 0.0, 0.0, 0.0]
+    correlation = tracker.correlation()
+    assert np.isnan(correlation[1, 1])
+
+
+def test_encode_round_trip():
+    rng = np.random.default_rng(5)
+    tracker = RollingCorrelation(SYMBOLS, window=50)
+    feed(tracker, correlated_prices(rng, 80))
+    decoded = decode_matrix(tracker.encode(4321))
+    assert decoded["symbols"] == SYMBOLS
+    assert (decoded["window"], decoded["samples"], decoded["timestamp_ms"]) == (50, 50, 4321)
+    np.testing.assert_allclose(decoded["volatility"], tracker.volatility(), rtol=1e-6)
+    np.testing.assert_allclose(decoded["correlation"], tracker.correlation(), rtol=1e-6, atol=1e-7)
+    with pytest.raises(ValueError):
+        decode_matrix(b"nope")
@@ -0,0 +1,74 @@
+"""IndicatorEngine: scalar and vectorized paths against brute-force recomputation"""
+import math
+
+import numpy as np
+import pytest
+
+from nexus_engine.indicators import IndicatorEngine
+
+
+def random_walk(rng, ticks: int, symbols: int) -> np.ndarray:
+    return 100.0 * np.exp(np.cumsum(rng.normal(0, 0.01, size=(ticks, symbols)), axis=0))
+
+
+def test_batch_matches_scalar_updates():
+    rng = np.random.default_rng(1)
+    names = [f"S{i}" for i in range(70)]  # More than the preallocated rows
+    prices = random_walk(rng, 120, len(names))
+    volumes = rng.uniform(1, 10, size=prices.shape)
+    scalar, batch = IndicatorEngine(), IndicatorEngine()
+    rows = batch.rows(names)
+    for t in range(len(prices)):
+        ts = 1_700_000_000.0 + 60 * t
+        for i, name in enumerate(names):
+            scalar.update(name, prices[t, i], volumes[t, i], ts)
+        batch.update_batch(rows, prices[t], volumes[t], ts)
+    expected, actual = scalar.snapshot(), batch.snapshot()
+    for name in names:
+        for field, value in expected[name].model_dump().items():
+            if isinstance(value, float):
+                assert actual[name].model_dump()[field] == pytest.approx(value, rel=1e-9), field
+            else:
+                assert actual[name].model_dump()[field] == value, field
+
+
+def test_window_indicators_match_brute_force():
+    rng = np.random.default_rng(2)
+    prices = random_walk(rng, 500, 1)[:, 0]
+    volumes = rng.uniform(1, 10, size=len(prices))
+    engine = IndicatorEngine(sma_period=20, session_seconds=None)
+    for price, volume in zip(prices, volumes):
+        engine.update("BTCUSD", float(price), float(volume))
+    values = engine.values("BTCUSD")
+    window = prices[-20:]
+    assert values.samples == len(prices)
+    assert values.price == prices[-1]
+    assert values.sma == pytest.approx(window.mean(), rel=1e-9)
+    band = values.bollinger_upper - values.sma
+    assert values.sma - values.bollinger_lower == pytest.approx(band, rel=1e-9)
+    # Population standard deviation of the window
+    assert band == pytest.approx(2 * window.std(), rel=1e-6)
+    assert values.vwap == pytest.approx((prices * volumes).sum() / volumes.sum(), rel=1e-9)
+    assert 0 <= values.rsi <= 100
+    assert values.macd_histogram == pytest.approx(values.macd - values.macd_signal)
+
+
+def test_indicators_warm_up():
+    engine = IndicatorEngine(sma_period=5)
+    for price in (1.0, 2.0, 3.0, 4.0):
+        engine.update("SPX", price)
+    values = engine.values("SPX")
+    assert values.sma is None and values.bollinger_upper is None
+    engine.update("SPX", 5.0)
+    assert engine.values("SPX").sma == 3.0
+    assert engine.values("unknown") is None
+
+
+def test_vwap_resets_each_session():
+    engine = IndicatorEngine(session_seconds=86400.0)
+    engine.update("EURUSD", 1.0, 10.0, ts=86400.0 * 3 + 10)
+    engine.update("EURUSD", 2.0, 10.0, ts=86400.0 * 3 + 20)
+    assert engine.values("EURUSD").vwap == 1.5
+    engine.update("EURUSD", 4.0, 10.0, ts=86400.0 * 4 + 1)
+    assert engine.values("EURUSD").vwap == 4.0
+    assert not math.isnan(engine.values("EURUSD").price)
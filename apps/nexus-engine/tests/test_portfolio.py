@@ -0,0 +1,112 @@
+"""PortfolioEngine revaluation and packed record writes"""
+import numpy as np
+import pytest
+
+from nexus_engine.portfolio import (
+    PORTFOLIO_HEADER,
+    PORTFOLIO_RECORD,
+    PortfolioEngine,
+    decode_portfolio,
+    record_offset,
+)
+
+SYMBOLS = ["BTCUSD", "SPX", "EURUSD"]
+
+
+def random_engine(users: int = 2000, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    engine = PortfolioEngine(SYMBOLS, capacity=16)
+    portfolios = {}
+    for i in range(users):
+        held = rng.choice(SYMBOLS, size=int(rng.integers(1, 4)), replace=False)
+        portfolios[f"u{i}"] = {str(s): (float(rng.normal(0, 10)), float(rng.uniform(1, 100))) for s in held}
+    engine.set_portfolios(portfolios)
+    return engine, portfolios, rng
+
+
+def brute_force(portfolios: dict, prices: dict) -> dict:
+    return {
+        user: (
+            sum(quantity * prices.get(symbol, 0.0) for symbol, (quantity, _) in positions.items()),
+            sum(quantity * average for quantity, average in positions.values()),
+        )
+        for user, positions in portfolios.items()
+    }
+
+
+def test_revaluation_matches_brute_force():
+    engine, portfolios, rng = random_engine()
+    prices = {}
+    for _ in range(50):
+        # Mostly single-symbol moves (incremental path), sometimes all of them
+        moved = SYMBOLS if rng.random() < 0.2 else [SYMBOLS[int(rng.integers(len(SYMBOLS)))]]
+        for symbol in moved:
+            prices[symbol] = float(rng.uniform(1, 100))
+        engine.update_prices({symbol: prices[symbol] for symbol in moved})
+    expected = brute_force(portfolios, prices)
+    for user, (market_value, cost_basis) in expected.items():
+        pnl = engine.pnl(user)
+        assert pnl["market_value"] == pytest.approx(market_value, abs=1e-6)
+        assert pnl["cost_basis"] == pytest.approx(cost_basis, abs=1e-6)
+
+
+def test_position_changes_after_pricing():
+    engine = PortfolioEngine(SYMBOLS)
+    engine.set_position("u1", "BTCUSD", 2.0, 100.0)
+    engine.update_prices({"BTCUSD": 110.0, "SPX": 50.0})
+    engine.set_portfolios({"u1": {"SPX": (4.0, 40.0)}, "u2": {"BTCUSD": (1.0, 90.0)}})
+    u1, u2 = engine.pnl("u1"), engine.pnl("u2")
+    assert (u1["market_value"], u1["cost_basis"]) == (200.0, 160.0)
+    assert u1["positions"] == {"SPX": 4.0}
+    assert u2["unrealized_pnl"] == 20.0
+    assert engine.pnl("unknown") is None
+
+
+def test_unpriced_symbol_counts_cost_only():
+    # Why core-api and the broadcaster only accept tracked symbols
+    engine = PortfolioEngine(["BTCUSD"])
+    engine.set_portfolios({"u1": {"BTCUSD": (1.0, 100.0), "DOGE": (1000.0, 0.1)}})
+    engine.update_prices({"BTCUSD": 100.0})
+    assert engine.pnl("u1")["unrealized_pnl"] == -100.0
+
+
+def test_decode_portfolio_reads_one_record():
+    engine, _, _ = random_engine(users=10)
+    engine.update_prices({"BTCUSD": 50.0})
+    payload = engine.encode(1234)
+    offset = record_offset(7)
+    record = decode_portfolio(payload[:PORTFOLIO_HEADER.size], payload[offset:offset + PORTFOLIO_RECORD.size])
+    pnl = engine.pnl("u7")
+    assert record["timestamp_ms"] == 1234
+    assert (record["market_value"], record["cost_basis"]) == (pnl["market_value"], pnl["cost_basis"])
+    with pytest.raises(ValueError):
+        decode_portfolio(b"\0" * PORTFOLIO_HEADER.size, payload[offset:offset + PORTFOLIO_RECORD.size])
+
+
+@pytest.mark.parametrize("changed", [0, 1, 10, 100, 1000, 5000])
+def test_encode_updates_rebuilds_encode(changed):
+    engine, _, rng = random_engine(users=5000)
+    engine.update_prices({symbol: 10.0 for symbol in SYMBOLS})
+    value = bytearray(engine.encode(0))
+    engine.encode_updates(0)
+    rows = rng.choice(5000, changed, replace=False)
+    engine.set_portfolios({f"u{row}": {"BTCUSD": (1.0, 5.0)} for row in rows})
+    engine.set_portfolios({"new": {"SPX": (3.0, 9.0)}})
+    ranges = engine.encode_updates(7)
+    assert ranges[0][0] == 0
+    for offset, chunk in ranges:
+        value[offset:offset + len(chunk)] = chunk
+    assert bytes(value) == engine.encode(7)
+    # Nothing changed since: only the header is written
+    assert [offset for offset, _ in engine.encode_updates(8)] == [0]
+
+
+def test_encode_updates_writes_less_than_full_for_sparse_changes():
+    engine, _, _ = random_engine(users=5000)
+    engine.encode_updates(0)
+    engine.set_portfolios({"u10": {"BTCUSD": (1.0, 5.0)}, "u4000": {"SPX": (1.0, 5.0)}})
+    ranges = engine.encode_updates(1)
+    assert len(ranges) == 3
+    assert sum(len(chunk) for _, chunk in ranges) == PORTFOLIO_HEADER.size + 2 * PORTFOLIO_RECORD.size
+    engine.dirty[:] = True
+    assert len(engine.encode_updates(2)) == 1
@@ -0,0 +1,104 @@
+"""RedisRegistry round trips and the broadcaster's alert and position sync"""
+import asyncio
+
+from broadcaster import Broadcaster
+from nexus_engine.memory_redis import InMemoryRedis
+from nexus_engine.registry import OP_DELETE, OP_PUT, RedisRegistry
+from nexus_engine.services.aggregator import DataAggregatorService
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def make_broadcaster() -> Broadcaster:
+    aggregator = DataAggregatorService(market_symbols=["BTCUSD", "SPX"])
+    broadcaster = Broadcaster(redis_client=InMemoryRedis(), aggregator=aggregator)
+    run(broadcaster.connect())
+    return broadcaster
+
+
+def test_registry_round_trip():
+    async def scenario():
+        registry = RedisRegistry(InMemoryRedis(), "test:registry", batch=2)
+        await registry.put("a", {"x": 1})
+        await registry.put("b", {"x": 2})
+        assert await registry.get("a") == {"x": 1}
+        assert await registry.load() == {"a": {"x": 1}, "b": {"x": 2}}
+        # The load already includes both puts
+        assert await registry.drain() == []
+        await registry.put("c", {"x": 3})
+        assert await registry.delete("a")
+        assert not await registry.delete("missing")
+        await registry.put("d", {"x": 4})
+        assert await registry.drain() == [
+            {"op": OP_PUT, "key": "c", "record": {"x": 3}},
+            {"op": OP_DELETE, "key": "a"},
+        ]
+        assert [change["key"] for change in await registry.drain()] == ["missing", "d"]
+        await registry.store({"c": {"x": 30}}, removed=["b"])
+        assert await registry.load() == {"c": {"x": 30}, "d": {"x": 4}}
+        assert await registry.drain() == []
+    run(scenario())
+
+
+def test_fired_alert_is_not_registered_again():
+    broadcaster = make_broadcaster()
+    alerts = broadcaster.aggregator.alerts
+
+    async def scenario():
+        await broadcaster.alert_registry.put("k1", {"user_id": "u1", "symbol": "BTCUSD", "level": 100.0, "direction": "above"})
+        assert await broadcaster.sync_alerts() == 1
+        alerts.evaluate_batch({"BTCUSD": 90.0})
+        alerts.evaluate_batch({"BTCUSD": 110.0})
+        assert await broadcaster.publish_alerts() > 0
+        assert await broadcaster.alert_registry.get("k1") is None
+        # The put loaded on the first sync must not be replayed
+        assert await broadcaster.sync_alerts() == 0
+        alerts.evaluate_batch({"BTCUSD": 90.0})
+        alerts.evaluate_batch({"BTCUSD": 110.0})
+        assert await broadcaster.publish_alerts() == 0
+    run(scenario())
+
+
+def test_alert_changes_apply_per_tick():
+    broadcaster = make_broadcaster()
+    alerts = broadcaster.aggregator.alerts
+    alerts.evaluate_batch({"BTCUSD": 100.0})
+
+    async def scenario():
+        registry = broadcaster.alert_registry
+        await broadcaster.sync_alerts()
+        await registry.put("up", {"user_id": "u1", "symbol": "BTCUSD", "kind": "percent", "percent": 5.0})
+        await registry.put("bad", {"user_id": "u1", "symbol": "BTCUSD"})
+        await registry.put("gone", {"user_id": "u2", "symbol": "BTCUSD", "level": 101.0})
+        await registry.delete("gone")
+        assert await broadcaster.sync_alerts() == 4
+        # The reference was resolved from the last price and stored back
+        assert (await registry.get("up"))["reference"] == 100.0
+        assert await registry.get("bad") is None
+        alerts.evaluate_batch({"BTCUSD": 104.0})
+        assert await broadcaster.publish_alerts() == 0
+        alerts.evaluate_batch({"BTCUSD": 106.0})
+        assert await broadcaster.publish_alerts() > 0
+        assert await registry.get("up") is None
+    run(scenario())
+
+
+def test_positions_sync_rejects_untracked_symbols():
+    broadcaster = make_broadcaster()
+    portfolios = broadcaster.aggregator.portfolios
+
+    async def scenario():
+        registry = broadcaster.positions_registry
+        await registry.put("u1", {"positions": {"BTCUSD": [2.0, 100.0]}})
+        await registry.put("u2", {"positions": {"BTCUSD": [1.0, 100.0], "DOGE": [1000.0, 0.1]}})
+        assert await broadcaster.sync_positions() == 1
+        assert await registry.get("u2") is None
+        portfolios.update_prices({"BTCUSD": 110.0})
+        assert portfolios.pnl("u1")["unrealized_pnl"] == 20.0
+        assert portfolios.pnl("u2") is None
+        await registry.delete("u1")
+        assert await broadcaster.sync_positions() == 1
+        assert portfolios.pnl("u1")["market_value"] == 0.0
+    run(scenario())
@@ -7,6 +7,34 @@ interface UseNexusStreamOptions {
   maxReconnectAttempts?: number
 }
 
+interface SnapshotEnvelope {
+  version: string
+  base: string | null
+  data?: AggregatedData
+  patch?: Record<string, unknown>
+}
+
+/**
+ * Apply a JSON merge patch (RFC 7386): null deletes a key, objects merge recursively
+ */
+function applyMergePatch<T>(target: T, patch: unknown): T {
+  if (patch === null || typeof patch !== 'object' || Array.isArray(patch)) {
+    return patch as T
+  }
+  const result: Record<string, unknown> =
+    target !== null && typeof target === 'object' && !Array.isArray(target)
+      ? { ...(target as Record<string, unknown>) }
+      : {}
+  for (const [key, value] of Object.entries(patch as Record<string, unknown>)) {
+    if (value === null) {
+      delete result[key]
+    } else {
+      result[key] = applyMergePatch(result[key], value)
+    }
+  }
+  return result as T
+}
+
 interface UseNexusStreamReturn {
   data: AggregatedData | null
   isConnected: boolean
@@ -41,6 +69,9 @@ export function useNexusStream(
   const reconnectAttemptsRef = useRef(0)
   const fetchIntervalRef = useRef<ReturnType<typeof setInterval> | null>(null)
   const isMountedRef = useRef(true)
+  // Last snapshot version received; the server only sends what changed since then
+  const versionRef = useRef<string>('')
+  const dataRef = useRef<AggregatedData | null>(null)
 
   // Fetch data from REST API
   const fetchData = useCallback(async () => {
@@ -50,7 +81,8 @@ export function useNexusStream(
       const controller = new AbortController()
       const timeoutId = setTimeout(() => controller.abort(), 5000) // 5 second timeout
       
-      const response = await fetch(`${apiUrl}/api/aggregated?symbol=BTCUSD`, {
+      const since = encodeURIComponent(dataRef.current ? versionRef.current : '')
+      const response = await fetch(`${apiUrl}/api/aggregated?symbol=BTCUSD&since=${since}`, {
         method: 'GET',
         headers: {
           'Accept': 'application/json',
@@ -63,11 +95,25 @@ export function useNexusStream(
       
       clearTimeout(timeoutId)
       
+      if (response.status === 304) {
+        // Nothing changed since our version
+        if (isMountedRef.current) {
+          setIsConnected(true)
+          setError(null)
+          reconnectAttemptsRef.current = 0
+        }
+        return
+      }
+      
       if (!response.ok) {
         throw new Error(`HTTP ${response.status}: ${response.statusText}`)
       }
       
-      const aggregatedData = await response.json() as AggregatedData
+      const envelope = await response.json() as SnapshotEnvelope
+      const aggregatedData = envelope.data
+        ?? applyMergePatch(dataRef.current, envelope.patch ?? {}) as AggregatedData
+      versionRef.current = envelope.version
+      dataRef.current = aggregatedData
       
       if (isMountedRef.current) {
         setData(aggregatedData)
@@ -7,6 +7,7 @@ export interface MarketStreamData {
   price: number
   volume: number
   change_24h: number
+  volume_24h?: number | null
   timestamp: string
 }
 
@@ -27,6 +28,35 @@ export interface NewsSentimentData {
   timestamp: string
 }
 
+export interface LargeTransfer {
+  token: string
+  contract: string
+  from_address: string
+  to_address: string
+  amount: number
+  block_number: number
+  tx_hash: string
+  log_index: number
+}
+
+export interface GasTier {
+  priority_fee_gwei: number
+  max_fee_gwei: number
+}
+
+export interface GasEstimate {
+  base_fee_gwei: number
+  next_base_fee_gwei: number
+  base_fee_trend: number
+  projected_base_fee_gwei: number
+  gas_used_ratio: number | null
+  slow: GasTier
+  standard: GasTier
+  fast: GasTier
+  window_blocks: number
+  latest_block: number
+}
+
 export interface BlockchainData {
   network: string
   block_height: number
@@ -34,6 +64,16 @@ export interface BlockchainData {
   gas_price: number | null
   hash_rate: number | null
   timestamp: string
+  window_blocks?: number | null
+  tps?: number | null
+  gas_used_ratio?: number | null
+  base_fee_gwei?: number | null
+  base_fee_percentiles?: Record<string, number> | null
+  block_time_avg?: number | null
+  block_time_stddev?: number | null
+  reorg_count?: number | null
+  gas_estimate?: GasEstimate | null
+  large_transfers?: LargeTransfer[] | null
 }
 
 export interface UserActivityData {
@@ -44,12 +84,59 @@ export interface UserActivityData {
   timestamp: string
 }
 
+export interface IndicatorValues {
+  symbol: string
+  price: number | null
+  sma: number | null
+  ema: number | null
+  rsi: number | null
+  macd: number | null
+  macd_signal: number | null
+  macd_histogram: number | null
+  bollinger_upper: number | null
+  bollinger_lower: number | null
+  vwap: number | null
+  samples: number
+}
+
+export interface AlertEvent {
+  alert_id: number
+  key: string | null
+  user_id: string
+  symbol: string
+  kind: 'price' | 'percent'
+  direction: 'above' | 'below'
+  level: number
+  reference: number | null
+  price: number
+  previous_price: number
+  triggered_at: string
+}
+
+export interface PortfolioPnL {
+  user_id: string
+  market_value: number
+  cost_basis: number
+  unrealized_pnl: number
+  pnl_percent: number | null
+  timestamp: string
+}
+
+export interface SectionStatus {
+  status: 'fresh' | 'stale' | 'fallback'
+  age_ms: number
+  error: string | null
+}
+
 export interface AggregatedData {
   market_stream: MarketStreamData
   macro_econ: MacroEconData
   news_sentiment: NewsSentimentData
   blockchain: BlockchainData
   user_activity: UserActivityData
+  chains?: BlockchainData[] | null
+  indicators?: Record<string, IndicatorValues> | null
+  sections?: Record<string, SectionStatus>
   aggregated_at: string
   version: string
 }